@@ -1,15 +1,20 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional, Set, Union
 from app.models.question import Question, GeneratedQuestion, AnswerText, GeneratedStory
 from app.models.story import StoryRequest, StoryResponse
-from app.core.vision import VisionAIClient
-from app.core.question_generator import QuestionGenerator
-from app.core.storytelling import StorytellingGenerator
+from app.models.analysis import dumps
+from app.core.clients import clients
+from app.core.vision import resolve_features
+from app.core.question_rules import QuestionRulesError
+from app.core.upload import (
+    UploadTooLargeError, UnsupportedImageError, iter_upload, read_image_stream
+)
 import aiofiles
+import asyncio
 import os
 from app.core.config import settings
 import logging
-import json
 from datetime import datetime
 import httpx
 from pydantic import BaseModel
@@ -19,24 +24,48 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-vision_client = VisionAIClient()
-question_generator = QuestionGenerator()
-storytelling_generator = StorytellingGenerator()
 
-# 디렉토리 생성
-os.makedirs(settings.TEMP_UPLOAD_DIR, exist_ok=True)
-os.makedirs("analysis_results", exist_ok=True)
+# 응답과 별개로 끝까지 실행하는 스토리 생성 작업 (가비지 컬렉션 방지용 참조)
+_story_tasks: Set[asyncio.Task] = set()
 
 # 이미지 URL 요청 모델
 class ImageUrlRequest(BaseModel):
     image_url: str
     auth_token: Optional[str] = None
+    features: Optional[str] = None  # 예) "labels,faces" (없으면 서버 기본 프로필)
 
-async def send_to_backend(data: Dict[str, Any], endpoint: str, auth_token: str = None) -> Dict[str, Any]:
+def json_response(body: str) -> Response:
+    """직렬화한 JSON 문자열을 그대로 응답합니다.
+
+    AnalysisResult가 포함된 응답은 dumps로 한 번만 직렬화해 백엔드 전송과 응답에 함께 사용합니다.
+    """
+    return Response(content=body, media_type="application/json")
+
+def validate_features(features: Optional[str]) -> tuple:
+    """요청된 분석 기능 목록을 검증합니다.
+    
+    Args:
+        features: 쉼표로 구분한 기능 목록 또는 프로필 이름
+        
+    Returns:
+        tuple: 정규화된 기능 목록
+    """
+    try:
+        return resolve_features(features)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error_code": "INVALID_FEATURES",
+                "message": str(e)
+            }
+        )
+
+async def send_to_backend(data: Union[Dict[str, Any], str], endpoint: str, auth_token: str = None) -> Dict[str, Any]:
     """데이터를 백엔드 서버로 전송
     
     Args:
-        data: 전송할 데이터
+        data: 전송할 데이터 (이미 직렬화한 JSON 문자열도 가능)
         endpoint: 백엔드 엔드포인트
         auth_token: 인증 토큰 (optional)
         
@@ -54,7 +83,7 @@ async def send_to_backend(data: Dict[str, Any], endpoint: str, auth_token: str =
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 f"{settings.BACKEND_SERVER_HOST}{endpoint}",
-                json=data,
+                content=(data if isinstance(data, str) else dumps(data)).encode("utf-8"),
                 headers=headers,
                 timeout=5.0  # 5초 타임아웃 설정
             )
@@ -71,6 +100,9 @@ async def send_to_backend(data: Dict[str, Any], endpoint: str, auth_token: str =
 async def save_analysis_result(data: Dict[str, Any], prefix: str = "analysis") -> str:
     """분석 결과를 JSON 파일로 저장
     
+    AnalysisResult는 필드별 배열 형식으로, 공백 없이 저장합니다.
+    (AnalysisResult.load로 다시 읽을 수 있음)
+    
     Args:
         data: 저장할 데이터
         prefix: 파일명 접두사
@@ -83,7 +115,7 @@ async def save_analysis_result(data: Dict[str, Any], prefix: str = "analysis") -
     filepath = os.path.join("analysis_results", filename)
     
     async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
-        await f.write(json.dumps(data, indent=2, ensure_ascii=False))
+        await f.write(dumps(data, compact=True))
     
     logger.info(f"분석 결과가 저장되었습니다: {filepath}")
     return filepath
@@ -109,7 +141,7 @@ async def test_questions() -> Dict[str, Any]:
     }
     
     # 질문 생성
-    generated_questions = question_generator.generate_questions(analysis_result)
+    generated_questions = await clients.question_generator.generate_questions_async(analysis_result)
     
     # Spring 백엔드가 기대하는 응답 구조로 반환
     return {
@@ -126,23 +158,36 @@ async def test_questions() -> Dict[str, Any]:
 @router.post("/analyze-image")
 async def analyze_image(
     image: UploadFile = File(...), 
-    auth_token: str = None
+    auth_token: str = None,
+    features: Optional[str] = None
 ) -> Dict[str, Any]:
     """이미지를 분석하여 관련 질문을 생성합니다."""
     try:
-        # 파일 크기 검증
-        content = await image.read()
-        if len(content) > settings.max_image_size_int:
+        # 분석 기능 검증 (예: features=labels,faces)
+        selected_features = validate_features(features)
+
+        # 이미지 포맷 검증 (본문을 읽기 전에 선언된 타입으로 먼저 확인)
+        if not image.content_type or not image.content_type.startswith('image/'):
             raise HTTPException(
                 status_code=400, 
+                detail={
+                    "error_code": "INVALID_FILE_TYPE",
+                    "message": "지원되지 않는 파일 형식입니다. 이미지 파일만 업로드 가능합니다."
+                }
+            )
+            
+        # 청크 단위로 읽으며 크기 제한, 해시 계산, 시그니처 검사
+        try:
+            upload = await read_image_stream(iter_upload(image), settings.max_image_size_int)
+        except UploadTooLargeError:
+            raise HTTPException(
+                status_code=413, 
                 detail={
                     "error_code": "FILE_TOO_LARGE",
                     "message": f"이미지 크기가 너무 큽니다. 최대 허용 크기: {settings.max_image_size_int/1024/1024}MB"
                 }
             )
-            
-        # 이미지 포맷 검증
-        if not image.content_type or not image.content_type.startswith('image/'):
+        except UnsupportedImageError:
             raise HTTPException(
                 status_code=400, 
                 detail={
@@ -153,7 +198,9 @@ async def analyze_image(
             
         # 이미지 분석
         try:
-            analysis_result = await vision_client.analyze_image(content)
+            analysis_result = await clients.vision.analyze_image(
+                upload.content, selected_features, content_sha256=upload.sha256
+            )
             logger.info(f"이미지 분석 완료: {image.filename}")
         except Exception as e:
             logger.error(f"이미지 분석 오류: {str(e)}")
@@ -166,7 +213,7 @@ async def analyze_image(
             )
         
         # 분석 결과를 기반으로 질문 생성
-        generated_questions = question_generator.generate_questions(analysis_result)
+        generated_questions = await clients.question_generator.generate_questions_async(analysis_result)
         
         # Spring이 기대하는 응답 구조로 데이터 생성
         response_data = {
@@ -187,13 +234,14 @@ async def analyze_image(
         )
         
         # 백엔드로 전송 (인증 토큰이 제공된 경우 포함)
+        body = dumps(response_data)
         backend_response = await send_to_backend(
-            response_data,
+            body,
             "/api/v1/questions/create",
             auth_token=auth_token
         )
         
-        return response_data
+        return json_response(body)
             
     except HTTPException as http_exc:
         # 이미 HTTPException인 경우 그대로 전달
@@ -215,6 +263,9 @@ async def analyze_image(
 async def analyze_image_from_url(request: ImageUrlRequest) -> Dict[str, Any]:
     """S3 URL로부터 이미지를 분석하고 결과를 반환합니다."""
     try:
+        # 분석 기능 검증
+        selected_features = validate_features(request.features)
+
         # URL에서 이미지 다운로드
         image_url = request.image_url
         if not image_url:
@@ -230,17 +281,36 @@ async def analyze_image_from_url(request: ImageUrlRequest) -> Dict[str, Any]:
         
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(image_url, timeout=10.0)
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail={
-                            "error_code": "DOWNLOAD_FAILED",
-                            "message": f"이미지를 다운로드할 수 없습니다. 상태 코드: {response.status_code}"
-                        }
-                    )
-                
-                image_content = response.content
+                async with client.stream("GET", image_url, timeout=10.0) as response:
+                    if response.status_code != 200:
+                        raise HTTPException(
+                            status_code=400, 
+                            detail={
+                                "error_code": "DOWNLOAD_FAILED",
+                                "message": f"이미지를 다운로드할 수 없습니다. 상태 코드: {response.status_code}"
+                            }
+                        )
+                    # 크기 제한을 넘는 이미지는 내려받는 도중 중단
+                    if int(response.headers.get("content-length", 0)) > settings.max_image_size_int:
+                        raise UploadTooLargeError()
+                    upload = await read_image_stream(response.aiter_bytes(), settings.max_image_size_int)
+                image_content = upload.content
+        except UploadTooLargeError:
+            raise HTTPException(
+                status_code=413, 
+                detail={
+                    "error_code": "FILE_TOO_LARGE",
+                    "message": f"이미지 크기가 너무 큽니다. 최대 허용 크기: {settings.max_image_size_int/1024/1024}MB"
+                }
+            )
+        except UnsupportedImageError:
+            raise HTTPException(
+                status_code=400, 
+                detail={
+                    "error_code": "INVALID_FILE_TYPE",
+                    "message": "지원되지 않는 파일 형식입니다. 이미지 파일만 업로드 가능합니다."
+                }
+            )
         except Exception as e:
             logger.error(f"이미지 다운로드 오류: {str(e)}")
             raise HTTPException(
@@ -253,7 +323,7 @@ async def analyze_image_from_url(request: ImageUrlRequest) -> Dict[str, Any]:
             
         # 이미지 분석
         try:
-            analysis_result = await vision_client.analyze_image(image_content)
+            analysis_result = await clients.vision.analyze_image(image_content, selected_features)
             logger.info("이미지 URL 분석 완료")
         except Exception as e:
             logger.error(f"이미지 URL 분석 오류: {str(e)}")
@@ -266,7 +336,7 @@ async def analyze_image_from_url(request: ImageUrlRequest) -> Dict[str, Any]:
             )
         
         # 분석 결과를 기반으로 질문 생성
-        generated_questions = question_generator.generate_questions(analysis_result)
+        generated_questions = await clients.question_generator.generate_questions_async(analysis_result)
         
         # Spring이 기대하는 응답 구조로 데이터 생성
         response_data = {
@@ -288,13 +358,14 @@ async def analyze_image_from_url(request: ImageUrlRequest) -> Dict[str, Any]:
         )
         
         # 백엔드로 전송 (인증 토큰이 있으면 함께 전송)
+        body = dumps(response_data)
         backend_response = await send_to_backend(
-            response_data,
+            body,
             "/api/v1/questions/create",
             auth_token=request.auth_token
         )
         
-        return response_data
+        return json_response(body)
             
     except HTTPException as http_exc:
         # 이미 HTTPException인 경우 그대로 전달
@@ -310,6 +381,177 @@ async def analyze_image_from_url(request: ImageUrlRequest) -> Dict[str, Any]:
             }
         )
 
+@router.post("/analyze-images")
+async def analyze_images(
+    images: Optional[List[UploadFile]] = File(None),
+    image_urls: Optional[List[str]] = Form(None),
+    features: Optional[str] = Form(None),
+    auth_token: str = None
+) -> Dict[str, Any]:
+    """여러 이미지(업로드 파일 또는 URL)를 한 번에 분석하여 이미지별 질문을 생성합니다."""
+    images = images or []
+    image_urls = image_urls or []
+    total = len(images) + len(image_urls)
+    try:
+        selected_features = validate_features(features)
+        if total == 0:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error_code": "NO_IMAGES",
+                    "message": "분석할 이미지가 제공되지 않았습니다."
+                }
+            )
+        if total > settings.ANALYZE_BATCH_MAX_IMAGES:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error_code": "TOO_MANY_IMAGES",
+                    "message": f"한 번에 분석할 수 있는 이미지는 최대 {settings.ANALYZE_BATCH_MAX_IMAGES}장입니다."
+                }
+            )
+
+        # 이미지별 원본 정보와 내용 수집 (실패한 항목은 error에 기록)
+        items = [{"source": image.filename, "content": None, "error": None} for image in images]
+        items += [{"source": url, "content": None, "error": None} for url in image_urls]
+
+        too_large_error = {
+            "error_code": "FILE_TOO_LARGE",
+            "message": f"이미지 크기가 너무 큽니다. 최대 허용 크기: {settings.max_image_size_int/1024/1024}MB"
+        }
+        invalid_type_error = {
+            "error_code": "INVALID_FILE_TYPE",
+            "message": "지원되지 않는 파일 형식입니다. 이미지 파일만 업로드 가능합니다."
+        }
+
+        async def read(item: Dict[str, Any], image: UploadFile) -> None:
+            if not image.content_type or not image.content_type.startswith('image/'):
+                item["error"] = invalid_type_error
+                return
+            try:
+                upload = await read_image_stream(iter_upload(image), settings.max_image_size_int)
+                item["content"] = upload.content
+            except UploadTooLargeError:
+                item["error"] = too_large_error
+            except UnsupportedImageError:
+                item["error"] = invalid_type_error
+
+        async def download(client: httpx.AsyncClient, item: Dict[str, Any]) -> None:
+            try:
+                async with client.stream("GET", item["source"], timeout=10.0) as response:
+                    if response.status_code != 200:
+                        raise Exception(f"상태 코드: {response.status_code}")
+                    # 크기 제한을 넘는 이미지는 내려받는 도중 중단
+                    if int(response.headers.get("content-length", 0)) > settings.max_image_size_int:
+                        raise UploadTooLargeError()
+                    upload = await read_image_stream(response.aiter_bytes(), settings.max_image_size_int)
+                item["content"] = upload.content
+            except UploadTooLargeError:
+                item["error"] = too_large_error
+            except UnsupportedImageError:
+                item["error"] = invalid_type_error
+            except Exception as e:
+                item["error"] = {
+                    "error_code": "DOWNLOAD_FAILED",
+                    "message": f"이미지를 다운로드할 수 없습니다: {str(e)}"
+                }
+
+        # Vision 배치 크기 단위로 이미지를 읽어 분석하고 내용은 바로 버림
+        # (요청의 모든 이미지 바이트를 동시에 메모리에 두지 않음)
+        chunk_size = settings.VISION_BATCH_SIZE
+        async with httpx.AsyncClient() as client:
+            for start in range(0, total, chunk_size):
+                chunk = items[start:start + chunk_size]
+                await asyncio.gather(*(
+                    read(item, images[index]) if index < len(images) else download(client, item)
+                    for index, item in enumerate(chunk, start)
+                ))
+
+                # 유효한 이미지만 묶어서 분석
+                valid_items = [item for item in chunk if item["content"] is not None]
+                analysis_results = await clients.vision.analyze_images(
+                    [item["content"] for item in valid_items], selected_features
+                )
+                for item, analysis_result in zip(valid_items, analysis_results):
+                    item["analysis_result"] = analysis_result
+                    item["content"] = None
+
+        # 성공한 이미지 전체의 레이블을 한 번에 번역해 질문 생성
+        analyzed_items = [item for item in items
+                          if "analysis_result" in item and not isinstance(item["analysis_result"], Exception)]
+        questions_batch = await clients.question_generator.generate_questions_batch_async(
+            [item["analysis_result"] for item in analyzed_items]
+        )
+        for item, generated_questions in zip(analyzed_items, questions_batch):
+            item["questions"] = generated_questions
+
+        results = []
+        for index, item in enumerate(items):
+            result = {"index": index, "source": item["source"]}
+            if "analysis_result" in item:
+                analysis_result = item["analysis_result"]
+                if isinstance(analysis_result, Exception):
+                    item["error"] = {
+                        "error_code": "ANALYSIS_FAILED",
+                        "message": "이미지 분석 중 오류가 발생했습니다."
+                    }
+                else:
+                    generated_questions = item["questions"]
+                    result.update({
+                        "status": "success",
+                        "analysis_result": analysis_result,
+                        "questions": [
+                            {
+                                "category": q["category"],
+                                "level": q["level"],
+                                "question": q["question"]
+                            } for q in generated_questions
+                        ]
+                    })
+            if item["error"] is not None:
+                result.update({"status": "error", "error": item["error"]})
+            results.append(result)
+
+        succeeded = [r for r in results if r["status"] == "success"]
+        response_data = {
+            "total": total,
+            "succeeded": len(succeeded),
+            "failed": total - len(succeeded),
+            "results": results
+        }
+        logger.info(f"일괄 이미지 분석 완료: {len(succeeded)}/{total}장 성공")
+
+        # 분석 결과를 JSON 파일로 저장
+        await save_analysis_result(response_data, "analysis_batch")
+
+        # 성공한 이미지별 결과를 백엔드로 전송
+        await asyncio.gather(*(
+            send_to_backend(
+                {"analysis_result": r["analysis_result"], "questions": r["questions"]},
+                "/api/v1/questions/create",
+                auth_token=auth_token
+            ) for r in succeeded
+        ))
+
+        return json_response(dumps(response_data))
+
+    except HTTPException as http_exc:
+        # 이미 HTTPException인 경우 그대로 전달
+        logger.error(f"HTTP 예외 발생: {http_exc.detail}")
+        raise http_exc
+    except Exception as e:
+        logger.error(f"일괄 이미지 분석 중 오류 발생: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error_code": "UNKNOWN_ERROR",
+                "message": f"일괄 이미지 분석 중 오류가 발생했습니다: {str(e)}"
+            }
+        )
+    finally:
+        for image in images:
+            await image.close()
+
 @router.post("/test-answer")
 async def test_answer(answer: AnswerText) -> Dict[str, Any]:
     """테스트용 답변 처리"""
@@ -336,6 +578,44 @@ async def health_check() -> Dict[str, Any]:
         "timestamp": datetime.now().isoformat()
     }
 
+@router.get("/cache-stats")
+async def cache_stats() -> Dict[str, Any]:
+    """분석 결과 캐시, 유사 이미지 재사용, 레이블 번역 캐시, Gemini 모델 풀, 스토리 결과 캐시와 토큰 사용량 통계를 반환합니다."""
+    vision_client = clients.vision
+    return {
+        "analysis_cache": vision_client.cache.stats() if vision_client.cache is not None else None,
+        "near_duplicates": (
+            vision_client.near_duplicates.stats() if vision_client.near_duplicates is not None else None
+        ),
+        "translation": clients.question_generator.translation_memo.stats(),
+        "gemini_models": clients.storytelling.models.stats(),
+        "story": clients.storytelling.cache_stats(),
+        "story_tokens": clients.storytelling.usage_stats()
+    }
+
+@router.get("/question-rules")
+async def question_rules_status() -> Dict[str, Any]:
+    """현재 적용 중인 질문 규칙 버전과 다시 읽기 통계를 반환합니다."""
+    return clients.question_generator.rules_store.stats()
+
+@router.post("/question-rules/reload")
+async def reload_question_rules() -> Dict[str, Any]:
+    """질문 규칙 파일을 즉시 다시 읽어 적용합니다.
+
+    새 규칙이 올바르지 않으면 기존 규칙을 유지하고 400을 반환합니다.
+    """
+    try:
+        rules = await asyncio.to_thread(clients.question_generator.rules_store.reload)
+    except QuestionRulesError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error_code": "INVALID_QUESTION_RULES",
+                "message": str(e)
+            }
+        )
+    return rules.info()
+
 @router.get("/spring-connection-test")
 async def spring_connection_test(auth_token: str = None) -> Dict[str, Any]:
     """Spring 백엔드 연결 테스트용 엔드포인트
@@ -366,6 +646,34 @@ async def spring_connection_test(auth_token: str = None) -> Dict[str, Any]:
             "auth_token_provided": auth_token is not None
         }
 
+async def save_and_send_story(response: Dict[str, Any]) -> None:
+    """생성된 스토리를 파일로 저장하고 Spring 백엔드로 전송합니다.
+
+    Args:
+        response: generate_story 결과 (성공한 경우에만 파일로 저장)
+    """
+    if response["status"] == "success":
+        result_file = await save_analysis_result(
+            response,
+            f"story_{response['media_id']}"
+        )
+        logger.info(f"스토리 결과 저장 완료: {result_file}")
+        
+    # Spring 백엔드로 결과 전송 (선택적)
+    try:
+        backend_response = await send_to_backend(
+            response,
+            "/api/v1/stories/save",
+            None  # 인증 토큰은 선택적
+        )
+        logger.info("스토리 결과가 백엔드로 전송되었습니다.")
+    except Exception as e:
+        logger.warning(f"백엔드 전송 실패 (무시): {str(e)}")
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 형식의 이벤트 문자열을 만듭니다."""
+    return f"event: {event}\ndata: {dumps(data)}\n\n"
+
 @router.post("/generate-story")
 async def generate_story(request: StoryRequest) -> Dict[str, Any]:
     """질문과 답변을 기반으로 스토리텔링을 생성합니다."""
@@ -373,7 +681,7 @@ async def generate_story(request: StoryRequest) -> Dict[str, Any]:
         logger.info(f"스토리 생성 요청 수신: media_id={request.media_id}")
         
         # 스토리텔링 생성 - API 키 인자 제거
-        response = await storytelling_generator.generate_story(
+        response = await clients.storytelling.generate_story(
             request.media_id,
             request.questions,
             request.answers,
@@ -383,23 +691,7 @@ async def generate_story(request: StoryRequest) -> Dict[str, Any]:
         
         # 응답 로깅 및 저장
         logger.info(f"스토리 생성 완료: media_id={request.media_id}")
-        if response["status"] == "success":
-            result_file = await save_analysis_result(
-                response,
-                f"story_{request.media_id}"
-            )
-            logger.info(f"스토리 결과 저장 완료: {result_file}")
-            
-        # Spring 백엔드로 결과 전송 (선택적)
-        try:
-            backend_response = await send_to_backend(
-                response,
-                "/api/v1/stories/save",
-                None  # 인증 토큰은 선택적
-            )
-            logger.info("스토리 결과가 백엔드로 전송되었습니다.")
-        except Exception as e:
-            logger.warning(f"백엔드 전송 실패 (무시): {str(e)}")
+        await save_and_send_story(response)
         
         return response
         
@@ -411,4 +703,72 @@ async def generate_story(request: StoryRequest) -> Dict[str, Any]:
             "message": str(e),
             "created_at": datetime.now().isoformat()
         }
+
+@router.post("/generate-story/stream")
+async def generate_story_stream(request: StoryRequest) -> StreamingResponse:
+    """스토리를 생성하며 받은 텍스트 조각을 Server-Sent Events로 바로 전달합니다.
+
+    이벤트:
+        chunk: {"text": 조각}
+        done: /generate-story와 같은 형식의 전체 결과
+        error: {"status": "error", "message": ...}
+
+    생성은 응답 스트림과 별개의 작업으로 실행되므로, 클라이언트 연결이 끊겨도 끝까지 생성한 뒤
+    /generate-story와 같이 결과를 저장하고 백엔드로 전송합니다.
+    """
+    logger.info(f"스트리밍 스토리 생성 요청 수신: media_id={request.media_id}")
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        parts = []
+        try:
+            async for text in clients.storytelling.stream_story(
+                request.media_id,
+                request.questions,
+                request.answers,
+                request.image_url,
+                request.options
+            ):
+                parts.append(text)
+                events.put_nowait(("chunk", {"text": text}))
+            result = {
+                "status": "success",
+                "media_id": request.media_id,
+                "story_content": "".join(parts),
+                "created_at": datetime.now().isoformat()
+            }
+            events.put_nowait(("done", result))
+        except Exception as e:
+            logger.error(f"스트리밍 스토리 생성 중 오류 발생: {str(e)}")
+            result = {
+                "status": "error",
+                "media_id": request.media_id,
+                "message": str(e),
+                "created_at": datetime.now().isoformat()
+            }
+            events.put_nowait(("error", result))
+        await save_and_send_story(result)
+
+    task = asyncio.create_task(produce())
+    _story_tasks.add(task)
+    task.add_done_callback(_story_tasks.discard)
+
+    async def stream():
+        while True:
+            event, data = await events.get()
+            yield sse_event(event, data)
+            if event != "chunk":
+                return
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def drain_story_tasks() -> None:
+    """진행 중인 스트리밍 스토리 생성과 저장이 끝날 때까지 기다립니다. (종료 시 사용)"""
+    if _story_tasks:
+        logger.info(f"진행 중인 스토리 생성 {len(_story_tasks)}건을 기다립니다.")
+        await asyncio.gather(*list(_story_tasks), return_exceptions=True)
    
\ No newline at end of file
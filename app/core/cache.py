@@ -0,0 +1,258 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from app.models.analysis import COMPACT_FORMAT, AnalysisResult
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def content_hash(data: bytes) -> str:
+    """바이너리 데이터의 SHA-256 해시를 반환합니다."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class LRUCache:
+    """TTL을 지원하는 스레드 안전 LRU 메모리 캐시"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Args:
+            max_entries (int): 최대 항목 수
+            ttl_seconds (float): 항목 유효 시간(초), 0 이하이면 만료 없음
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """키에 해당하는 값을 반환합니다. 없거나 만료되면 None을 반환합니다."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """값을 저장하고 용량을 넘으면 가장 오래 사용되지 않은 항목을 제거합니다."""
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else 0
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계를 반환합니다."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class SQLiteCacheStore:
+    """JSON 값을 SQLite 파일에 저장하는 영구 캐시 계층
+
+    항목 수를 세어 두고 최대 항목 수를 넘었을 때만 오래된 항목을 제거합니다.
+    제거할 때는 여유분(EVICT_SLACK)만큼 더 지워 쓰기마다 제거 쿼리가 실행되지 않게 합니다.
+    """
+
+    # 제거 시 최대 항목 수보다 추가로 비워 둘 비율
+    EVICT_SLACK = 0.1
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        """
+        Args:
+            path (str): SQLite 데이터베이스 파일 경로
+            max_entries (int): 최대 항목 수
+            ttl_seconds (float): 항목 유효 시간(초), 0 이하이면 만료 없음
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_created_at ON cache (created_at)")
+        self._conn.commit()
+        # 저장된 항목 수 (같은 키를 덮어쓴 경우도 더하므로 실제보다 클 수 있으며, 제거 시 다시 셈)
+        self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        """키에 해당하는 값을 반환합니다. 없거나 만료되면 None을 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds > 0 and row[1] + self.ttl_seconds < time.time()):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """값을 저장하고 용량을 넘으면 오래된 항목부터 제거합니다."""
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, payload, time.time())
+            )
+            self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # 잠금을 잡은 상태에서 호출
+        keep = max(int(self.max_entries * (1 - self.EVICT_SLACK)), 1)
+        self._conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (keep,)
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계를 반환합니다."""
+        entries = len(self)
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses
+        }
+
+
+class AnalysisCache:
+    """이미지 해시를 키로 하는 2단계(메모리 LRU + 선택적 SQLite) 분석 결과 캐시
+
+    반환되는 값은 캐시에 저장된 객체 그대로이므로 호출 측에서 수정하면 안 됩니다.
+    AnalysisResult는 영구 캐시에 필드별 배열 형식으로 저장하고 읽을 때 다시 변환합니다.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float,
+                 db_path: str = "", db_max_entries: int = 0):
+        """
+        Args:
+            max_entries (int): 메모리 캐시 최대 항목 수
+            ttl_seconds (float): 항목 유효 시간(초)
+            db_path (str): 영구 캐시 파일 경로 (빈 문자열이면 사용하지 않음)
+            db_max_entries (int): 영구 캐시 최대 항목 수
+        """
+        self.memory = LRUCache(max_entries, ttl_seconds)
+        self.disk: Optional[SQLiteCacheStore] = None
+        if db_path:
+            try:
+                self.disk = SQLiteCacheStore(db_path, db_max_entries, ttl_seconds)
+                logger.info(f"영구 분석 캐시를 사용합니다: {db_path}")
+            except Exception as e:
+                logger.warning(f"영구 분석 캐시 초기화 실패, 메모리 캐시만 사용합니다: {str(e)}")
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = self.disk.get(key)
+            if isinstance(value, dict) and value.get("format") == COMPACT_FORMAT:
+                value = AnalysisResult.from_compact(value)
+            return value
+        except Exception as e:
+            logger.warning(f"영구 분석 캐시 조회 실패: {str(e)}")
+            return None
+
+    def _disk_set(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for key, value in items:
+            try:
+                self.disk.set(key, value.to_compact() if isinstance(value, AnalysisResult) else value)
+            except Exception as e:
+                logger.warning(f"영구 분석 캐시 저장 실패: {str(e)}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 분석 결과를 반환합니다."""
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+        value = self._disk_get(key)
+        if value is not None:
+            # 디스크 적중 결과를 메모리 계층으로 승격
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """분석 결과를 모든 계층에 저장합니다."""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self._disk_set([(key, value)])
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """get과 같지만 영구 캐시 조회는 이벤트 루프 밖(스레드)에서 실행합니다."""
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+        value = await asyncio.to_thread(self._disk_get, key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    async def set_many_async(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """여러 분석 결과를 저장합니다. 영구 캐시 저장은 한 번의 스레드 작업으로 실행합니다."""
+        for key, value in items:
+            self.memory.set(key, value)
+        if self.disk is not None and items:
+            await asyncio.to_thread(self._disk_set, items)
+
+    def stats(self) -> Dict[str, Any]:
+        """계층별 캐시 통계를 반환합니다."""
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
@@ -0,0 +1,115 @@
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import threading
+import time
+from app.core.config import settings
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ClientRegistry:
+    """외부 AI 클라이언트를 처음 사용할 때 생성하고 시작 시 워밍업하는 레지스트리
+
+    모듈 import 시점에는 아무 클라이언트도 만들지 않으므로, 인증 파일이 없어도
+    애플리케이션은 기동되고 해당 클라이언트를 사용하는 요청만 실패합니다.
+    """
+
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        # 현재 생성에 실패한 클라이언트 (이후 생성에 성공하면 제거)
+        self._errors: Dict[str, str] = {}
+        # 워밍업 중 발생한 오류 기록 (준비 상태에는 반영하지 않음)
+        self.warmup_errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.ready = False
+        self.timings: Dict[str, float] = {}
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                start = time.perf_counter()
+                try:
+                    instance = factory()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._errors.pop(name, None)
+                self._instances[name] = instance
+                logger.info(f"{name} 클라이언트 생성 완료 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+        return instance
+
+    @property
+    def vision(self):
+        """Vision API 클라이언트"""
+        from app.core.vision import VisionAIClient
+        return self._get("vision", VisionAIClient)
+
+    @property
+    def question_generator(self):
+        """질문 생성기 (번역 클라이언트 포함)"""
+        from app.core.question_generator import QuestionGenerator
+        return self._get("question_generator", QuestionGenerator)
+
+    @property
+    def storytelling(self):
+        """스토리텔링 생성기"""
+        from app.core.storytelling import StorytellingGenerator
+        return self._get("storytelling", StorytellingGenerator)
+
+    def peek(self, name: str) -> Optional[Any]:
+        """생성된 클라이언트가 있으면 반환하고, 없으면 생성하지 않고 None을 반환합니다."""
+        return self._instances.get(name)
+
+    async def warm_up(self) -> Dict[str, Any]:
+        """모든 클라이언트를 생성하고 채널/캐시를 미리 준비합니다.
+
+        각 단계는 스레드에서 실행되며, 실패해도 다른 단계와 기동은 계속됩니다.
+        클라이언트를 만들지 못한 경우에만 준비 상태가 실패로 표시되며, 이후 요청에서
+        생성에 성공하면 다시 준비 상태가 됩니다.
+
+        Returns:
+            Dict[str, Any]: 단계별 소요 시간(ms)과 오류
+        """
+        steps = {
+            "vision": lambda: self.vision.warm_up(settings.WARMUP_TIMEOUT),
+            "question_generator": lambda: self.question_generator.warm_up(),
+            "storytelling": lambda: self.storytelling.warm_up()
+        }
+
+        async def run(name: str, step: Callable[[], Any]) -> None:
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(asyncio.to_thread(step), timeout=settings.WARMUP_TIMEOUT)
+            except Exception as e:
+                message = str(e) or type(e).__name__
+                self.warmup_errors[name] = message
+                with self._lock:
+                    # 시간 초과 등으로 아직 생성되지 않은 클라이언트만 준비 상태에 반영
+                    if name not in self._instances:
+                        self._errors[name] = message
+                logger.warning(f"{name} 워밍업 실패: {message}")
+            self.timings[name] = (time.perf_counter() - start) * 1000
+
+        await asyncio.gather(*(run(name, step) for name, step in steps.items()))
+        return {"timings_ms": dict(self.timings), "errors": dict(self.warmup_errors)}
+
+    def status(self) -> Dict[str, Any]:
+        """준비 상태를 반환합니다. 준비 여부는 워밍업 기록이 아닌 현재 클라이언트 상태로 판단합니다."""
+        return {
+            "ready": self.ready and not self._errors,
+            "warmed_up": self.ready,
+            "clients": sorted(self._instances),
+            "errors": dict(self._errors),
+            "warmup_errors": dict(self.warmup_errors),
+            "timings_ms": dict(self.timings)
+        }
+
+
+clients = ClientRegistry()
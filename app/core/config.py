@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # API 설정
@@ -23,10 +23,84 @@ class Settings(BaseSettings):
     
     # Gemini API 설정
     GOOGLE_API_KEY: str = ""
+    GEMINI_MODEL: str = "gemini-1.5-flash"  # 스토리 생성 모델
+    GEMINI_MODEL_POOL_SIZE: int = 8  # 재사용할 모델 객체 최대 수 (모델 이름 + 생성 설정별)
+    # 스토리 프롬프트의 정적 지시문을 Gemini 컨텍스트 캐시에 등록
+    # (버전이 지정된 모델 이름과 모델별 최소 토큰 수 필요, 조건을 만족하지 못하면 전체 프롬프트로 요청)
+    GEMINI_CONTEXT_CACHE_ENABLED: bool = False
+    GEMINI_CONTEXT_CACHE_TTL: int = 3600  # 컨텍스트 캐시 유효 시간(초)
     
+    # AI 서비스 제공자 설정 ("google": 실제 API, "fake": 기록 재생용 로컬 대체 클라이언트)
+    AI_PROVIDER: str = "google"
+    FAKE_PROVIDER_RECORDINGS_DIR: str = ""  # 기록된 응답 디렉토리 (vision/*.json, translate.json, gemini.json)
+    FAKE_PROVIDER_LATENCY_MS: float = 0.0  # 호출당 기본 지연
+    FAKE_PROVIDER_JITTER_MS: float = 0.0  # 지연에 더해지는 최대 지터
+    FAKE_PROVIDER_ERROR_RATE: float = 0.0  # 호출 실패 확률 (0~1)
+    FAKE_PROVIDER_SEED: Optional[int] = None  # 재현 가능한 측정을 위한 난수 시드
+
+    # 기동 설정
+    WARMUP_ON_STARTUP: bool = True  # 기동 시 클라이언트 생성 및 채널 연결
+    WARMUP_TIMEOUT: float = 10.0  # 워밍업 단계별 제한 시간(초)
+
     # 이미지 처리 설정
     TEMP_UPLOAD_DIR: str = "temp_uploads"
     MAX_IMAGE_SIZE: str = "10485760"  # 문자열로 변경
+    UPLOAD_CHUNK_SIZE: int = 65536  # 업로드를 읽는 청크 크기
+    UPLOAD_MULTIPART_OVERHEAD: int = 65536  # multipart 헤더 등 이미지 외 본문 허용량
+    IMAGE_PREPROCESS_ENABLED: bool = True  # Vision/Gemini 전송 전 축소 및 재인코딩
+    IMAGE_MAX_EDGE: int = 1600  # 전처리 후 긴 변의 최대 픽셀 수
+    IMAGE_JPEG_QUALITY: int = 85  # 재인코딩 JPEG 품질
+    STORY_IMAGE_TIMEOUT: float = 10.0  # 스토리 생성용 이미지 다운로드 제한 시간(초)
+    STORY_IMAGE_MAX_CONNECTIONS: int = 20  # 이미지 다운로드 공유 클라이언트의 최대 연결 수
+
+    # 스토리 결과 캐시 설정 (프롬프트 + 이미지 내용 해시 기준, options.regenerate=true이면 무시)
+    STORY_CACHE_ENABLED: bool = True
+    STORY_CACHE_MAX_ENTRIES: int = 1024  # 메모리 LRU 최대 항목 수
+    STORY_CACHE_TTL: int = 86400  # 항목 유효 시간(초)
+    # 이미지 URL -> 내용 해시 기억 시간(초). 이 시간 안에 같은 URL의 이미지 내용이 바뀌면
+    # 다시 내려받지 않아 이전 이미지로 만든 스토리가 반환될 수 있음 (0이면 매번 내려받아 확인)
+    STORY_IMAGE_HASH_TTL: int = 300
+
+    # Vision API 설정
+    VISION_BATCH_ANNOTATE: bool = True  # 모든 기능을 한 번의 annotate_image 요청으로 실행
+    VISION_MAX_WORKERS: int = 8  # Vision 동기 호출을 실행할 스레드 풀 크기
+    # 기본 분석 기능 (프로필 이름 'questions'/'full' 또는 쉼표로 구분한 기능 목록)
+    VISION_DEFAULT_FEATURES: str = "questions"
+    VISION_BATCH_SIZE: int = 16  # batch_annotate_images 요청당 최대 이미지 수 (API 제한)
+    ANALYZE_BATCH_MAX_IMAGES: int = 200  # /analyze-images 요청당 최대 이미지 수
+    ANALYZE_BATCH_MAX_BODY_SIZE: int = 0  # /analyze-images 요청 본문 최대 크기(바이트), 0이면 최대 이미지 수 기준으로 계산
+
+    # 분석 결과 캐시 설정 (이미지 바이트 해시 기준)
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 1024  # 메모리 LRU 최대 항목 수
+    ANALYSIS_CACHE_TTL: int = 86400  # 항목 유효 시간(초)
+    ANALYSIS_CACHE_DB_PATH: str = ""  # SQLite 영구 캐시 경로 (빈 값이면 메모리만 사용)
+    ANALYSIS_CACHE_DB_MAX_ENTRIES: int = 100000
+
+    # 유사 이미지(연사 등) 분석 결과 재사용 설정 (64비트 dHash 기준)
+    NEAR_DUPLICATE_ENABLED: bool = True
+    NEAR_DUPLICATE_MAX_DISTANCE: int = 4  # 재사용을 허용할 최대 해밍 거리
+    NEAR_DUPLICATE_WINDOW: int = 4096  # 비교 대상으로 보관할 최근 이미지 수
+    NEAR_DUPLICATE_TTL: int = 3600  # 항목 유효 시간(초)
+
+    # 레이블 번역 캐시 설정 (정적 매핑 -> 메모리 LRU -> SQLite -> Translation API)
+    TRANSLATION_CACHE_MAX_ENTRIES: int = 4096  # 메모리 LRU 최대 항목 수
+    TRANSLATION_CACHE_DB_PATH: str = "cache/translations.db"  # 빈 값이면 메모리만 사용
+    TRANSLATION_CACHE_FLUSH_EVERY: int = 100  # 사용 빈도를 디스크에 반영할 조회 간격
+    TRANSLATION_BATCH_SIZE: int = 128  # Translation API 한 번에 보낼 최대 문장 수
+    TRANSLATION_TIMEOUT: float = 2.0  # 요청 처리 중 번역 대기 시간(초), 초과 시 영어 레이블 사용
+
+    # 질문 규칙 파일 설정
+    QUESTION_RULES_PATH: str = ""  # 빈 값이면 app/rules/question_rules.json 사용
+    QUESTION_RULES_RELOAD_INTERVAL: float = 5.0  # 파일 변경 확인 간격(초), 0이면 자동으로 다시 읽지 않음
+
+    # 질문 선택 설정
+    QUESTION_MIN_COUNT: int = 5  # 최소 질문 수
+    QUESTION_MAX_COUNT: int = 10  # 최대 질문 수
+    QUESTION_MIN_SCORE: float = 0.5  # 최소 개수 이후 추가로 선택할 질문의 최소 점수
+    QUESTION_MAX_PER_CATEGORY: int = 3  # 카테고리별 최대 질문 수
+    QUESTION_DEDUP_ENABLED: bool = True  # 의미가 겹치는 질문 제거 (문자 n-gram TF-IDF)
+    QUESTION_DEDUP_THRESHOLD: float = 0.5  # 중복으로 판단할 코사인 유사도
 
     class Config:
         case_sensitive = True
@@ -37,4 +111,14 @@ class Settings(BaseSettings):
         """MAX_IMAGE_SIZE를 정수로 변환하여 반환합니다."""
         return int(self.MAX_IMAGE_SIZE)
 
+    @property
+    def analyze_batch_max_body_size(self) -> int:
+        """/analyze-images 요청 본문 최대 크기를 반환합니다.
+
+        ANALYZE_BATCH_MAX_BODY_SIZE가 0이면 최대 이미지 수 × (이미지 최대 크기 + multipart 허용량)입니다.
+        """
+        if self.ANALYZE_BATCH_MAX_BODY_SIZE > 0:
+            return self.ANALYZE_BATCH_MAX_BODY_SIZE
+        return self.ANALYZE_BATCH_MAX_IMAGES * (self.max_image_size_int + self.UPLOAD_MULTIPART_OVERHEAD)
+
 settings = Settings()
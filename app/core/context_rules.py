@@ -0,0 +1,48 @@
+from typing import Dict, FrozenSet, Iterable, Tuple
+import re
+
+
+class ContextMatcher:
+    """분류 규칙을 한 번 컴파일해 레이블 하나를 한 번의 탐색으로 분류하는 매처
+
+    부분 문자열 키워드는 전방 탐색(lookahead) 정규식 하나로 합쳐 모든 위치의 일치를
+    찾습니다. 같은 위치에서는 가장 긴 키워드만 보고되므로, 각 키워드의 슬롯에
+    그 키워드의 접두사인 다른 키워드의 슬롯까지 포함시켜 결과가 개별 검사와 같게 합니다.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, str, Iterable[str]]]):
+        """
+        Args:
+            rules: (슬롯 이름, 일치 방식, 키워드 목록) 규칙
+                "exact"는 레이블 전체 일치, "substring"은 부분 문자열 포함
+        """
+        self.exact: Dict[str, FrozenSet[str]] = {}
+        substring: Dict[str, set] = {}
+        for slot, mode, keywords in rules:
+            target = substring if mode == 'substring' else self.exact
+            for keyword in keywords:
+                keyword = keyword.lower()
+                target[keyword] = frozenset(target.get(keyword, frozenset())) | {slot}
+
+        # 접두사 키워드의 슬롯을 포함시킴
+        self.substring: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset().union(*(slots for other, slots in substring.items() if keyword.startswith(other)))
+            for keyword in substring
+        }
+        alternatives = sorted(self.substring, key=len, reverse=True)
+        self._pattern = re.compile(
+            "(?=(" + "|".join(map(re.escape, alternatives)) + "))" if alternatives else "(?!)"
+        )
+        self._cache: Dict[str, FrozenSet[str]] = {}
+
+    def match(self, desc: str) -> FrozenSet[str]:
+        """소문자 레이블에 해당하는 모든 컨텍스트 슬롯을 반환합니다."""
+        slots = self._cache.get(desc)
+        if slots is not None:
+            return slots
+        slots = self.exact.get(desc, frozenset()).union(
+            *(self.substring[m.group(1)] for m in self._pattern.finditer(desc))
+        )
+        if len(self._cache) < 10000:
+            self._cache[desc] = slots
+        return slots
@@ -0,0 +1,123 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from PIL import Image, ImageOps
+import io
+import logging
+import threading
+import time
+import numpy as np
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def dhash(content: bytes, hash_size: int = 8) -> Optional[int]:
+    """이미지의 차이 해시(dHash)를 계산합니다.
+
+    인접 픽셀 밝기 차이의 부호로 hash_size * hash_size 비트 해시를 만듭니다.
+    CPU를 사용하는 동기 함수이므로 이벤트 루프 밖에서 호출해야 합니다.
+
+    Args:
+        content (bytes): 이미지 바이너리
+        hash_size (int): 해시 한 변의 크기 (8이면 64비트)
+
+    Returns:
+        Optional[int]: 해시 값 (디코딩할 수 없으면 None)
+    """
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            # 해시 계산에는 작은 해상도로 충분하므로 JPEG는 축소 디코딩
+            image.draft("L", (hash_size * 8, hash_size * 8))
+            image = ImageOps.exif_transpose(image).convert("L")
+            image = image.resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+            pixels = np.asarray(image, dtype=np.int16)
+    except Exception as e:
+        logger.warning(f"이미지 해시 계산 실패: {str(e)}")
+        return None
+
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 해시 간 해밍 거리를 반환합니다."""
+    return (a ^ b).bit_count()
+
+
+# 바이트 단위 1비트 개수 표 (벡터화된 popcount 용)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class NearDuplicateIndex:
+    """최근 분석한 이미지의 64비트 지각 해시를 보관하고 해밍 거리로 검색하는 인덱스
+
+    고정 크기 링 버퍼에 해시를 저장하고, 조회 시 전체 버퍼와의 거리를
+    NumPy로 한 번에 계산합니다. 가장 오래된 항목부터 덮어씁니다.
+    """
+
+    def __init__(self, capacity: int, max_distance: int, ttl_seconds: float):
+        """
+        Args:
+            capacity (int): 보관할 최대 항목 수
+            max_distance (int): 재사용을 허용할 최대 해밍 거리
+            ttl_seconds (float): 항목 유효 시간(초), 0 이하이면 만료 없음
+        """
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self._hashes = np.zeros(capacity, dtype=np.uint64)
+        self._entries: List[Optional[Tuple[int, frozenset, Dict[str, Any], float]]] = [None] * capacity
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.matches = 0
+
+    def add(self, phash: int, features: Iterable[str], analysis: Dict[str, Any]) -> None:
+        """분석 결과를 해시와 함께 등록합니다."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._hashes[self._next] = phash
+            self._entries[self._next] = (phash, frozenset(features), analysis, time.monotonic())
+            self._next = (self._next + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def find(self, phash: int, features: Iterable[str]) -> Optional[Tuple[Dict[str, Any], int, int]]:
+        """요청한 기능을 모두 포함하는 가장 가까운 유효 항목을 찾습니다.
+
+        Args:
+            phash (int): 조회할 해시
+            features (Iterable[str]): 필요한 분석 기능 목록
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], int, int]]: (분석 결과, 해밍 거리, 일치한 해시) 또는 None
+        """
+        required = frozenset(features)
+        with self._lock:
+            self.lookups += 1
+            if self._size == 0:
+                return None
+            xor = self._hashes[:self._size] ^ np.uint64(phash)
+            distances = _POPCOUNT_TABLE[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+            candidates = np.flatnonzero(distances <= self.max_distance)
+            now = time.monotonic()
+            for slot in candidates[np.argsort(distances[candidates], kind="stable")]:
+                stored_hash, stored_features, analysis, created_at = self._entries[slot]
+                if self.ttl_seconds > 0 and created_at + self.ttl_seconds < now:
+                    continue
+                if not required <= stored_features:
+                    continue
+                self.matches += 1
+                return analysis, int(distances[slot]), stored_hash
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """인덱스 통계를 반환합니다."""
+        return {
+            "entries": self._size,
+            "capacity": self.capacity,
+            "max_distance": self.max_distance,
+            "lookups": self.lookups,
+            "matches": self.matches
+        }
@@ -0,0 +1,73 @@
+from typing import Any, Dict, Tuple
+from PIL import ExifTags, Image, ImageOps
+import io
+import logging
+from app.core.config import settings
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def preprocess_image(content: bytes,
+                     max_edge: int = None,
+                     quality: int = None) -> Tuple[bytes, Dict[str, Any]]:
+    """업로드 전 이미지를 회전 보정, 축소, 메타데이터 제거 후 JPEG로 재인코딩합니다.
+
+    CPU를 사용하는 동기 함수이므로 이벤트 루프 밖(스레드 풀)에서 호출해야 합니다.
+    디코딩할 수 없는 데이터는 그대로 반환합니다. 메타데이터가 없는 이미지는 재인코딩 결과가
+    원본보다 크지 않을 때만 재인코딩 결과를 사용합니다.
+
+    Args:
+        content (bytes): 원본 이미지 바이너리
+        max_edge (int): 긴 변의 최대 픽셀 수 (기본값: settings.IMAGE_MAX_EDGE)
+        quality (int): JPEG 품질 (기본값: settings.IMAGE_JPEG_QUALITY)
+
+    Returns:
+        Tuple[bytes, Dict[str, Any]]: 처리된 이미지 바이너리와 처리 통계
+    """
+    max_edge = max_edge or settings.IMAGE_MAX_EDGE
+    quality = quality or settings.IMAGE_JPEG_QUALITY
+    stats = {
+        "original_bytes": len(content),
+        "processed_bytes": len(content),
+        "bytes_saved": 0,
+        "resized": False
+    }
+
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            stats["original_size"] = image.size
+            if image.format == "JPEG":
+                # JPEG는 디코딩 단계에서 축소해 메모리와 CPU 사용량을 줄임
+                image.draft("RGB", (max_edge, max_edge))
+            # EXIF 방향 정보에 따라 실제 픽셀을 회전
+            exif = image.getexif()
+            rotated = exif.get(ExifTags.Base.Orientation, 1) != 1
+            # 위치(GPS) 등 메타데이터가 있으면 용량 절감이 없어도 재인코딩 결과를 사용
+            has_metadata = bool(exif) or any(key in image.info for key in ("exif", "xmp", "XML:com.adobe.xmp"))
+            image = ImageOps.exif_transpose(image)
+
+            if max(image.size) > max_edge:
+                image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+                stats["resized"] = True
+
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+
+            # exif 등 메타데이터 없이 재인코딩
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality, optimize=True)
+            processed = buffer.getvalue()
+            stats["processed_size"] = image.size
+    except Exception as e:
+        logger.warning(f"이미지 전처리 실패, 원본을 사용합니다: {str(e)}")
+        return content, stats
+
+    # 크기, 방향 변경과 제거할 메타데이터가 없는데 재인코딩 결과가 더 크면 원본 유지
+    if not stats["resized"] and not rotated and not has_metadata and len(processed) >= len(content):
+        return content, stats
+
+    stats["processed_bytes"] = len(processed)
+    stats["bytes_saved"] = len(content) - len(processed)
+    return processed, stats
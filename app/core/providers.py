@@ -0,0 +1,490 @@
+"""외부 AI 서비스(Vision, Translation, Gemini) 클라이언트 제공 계층
+
+AI_PROVIDER 설정이 "fake"이면 실제 Google 클라이언트 대신 기록된 응답을 재생하는
+로컬 대체 클라이언트를 사용합니다. 대체 클라이언트는 설정된 지연, 지터, 오류율을
+주입하므로 인증 정보 없이도 전체 파이프라인의 지연/처리량을 재현 가능하게 측정할 수 있습니다.
+
+기록 디렉토리(FAKE_PROVIDER_RECORDINGS_DIR) 구조:
+    vision/*.json    AnnotateImageResponse JSON (AnnotateImageResponse.to_json() 출력)
+    translate.json   {"영어 원문": "번역 결과", ...}
+    gemini.json      ["스토리 응답 1", "스토리 응답 2", ...]
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from google.cloud import vision
+from app.core.config import settings
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORY = (
+    "사진 속 환한 미소는 그날의 즐거움을 고스란히 전해줍니다. "
+    "함께한 사람들과 나눈 따뜻한 시간은 지금도 마음 한켠에 소중한 기억으로 남아 있습니다."
+)
+FAKE_STREAM_CHUNK_CHARS = 40  # 스트리밍 재생 시 조각당 글자 수
+
+
+def use_fake_providers() -> bool:
+    """로컬 대체 클라이언트를 사용하는지 여부를 반환합니다."""
+    return settings.AI_PROVIDER == "fake"
+
+
+class FakeProviderError(Exception):
+    """대체 클라이언트가 주입한 오류"""
+
+
+class LatencyProfile:
+    """대체 클라이언트 호출에 지연, 지터, 오류를 주입합니다."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+            latency_ms (float): 호출당 기본 지연(ms)
+            jitter_ms (float): 지연에 더해지는 균등 분포 지터의 최대값(ms)
+            error_rate (float): 호출이 실패할 확률 (0~1)
+            seed (Optional[int]): 재현 가능한 측정을 위한 난수 시드
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "LatencyProfile":
+        """설정값으로 지연 프로필을 생성합니다."""
+        return cls(
+            latency_ms=settings.FAKE_PROVIDER_LATENCY_MS,
+            jitter_ms=settings.FAKE_PROVIDER_JITTER_MS,
+            error_rate=settings.FAKE_PROVIDER_ERROR_RATE,
+            seed=settings.FAKE_PROVIDER_SEED
+        )
+
+    def _draw(self) -> tuple:
+        with self._lock:
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+            failed = self._random.random() < self.error_rate
+        return delay, failed
+
+    def wait(self, operation: str) -> None:
+        """동기 호출용: 지연 후 확률적으로 오류를 발생시킵니다."""
+        delay, failed = self._draw()
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise FakeProviderError(f"주입된 오류: {operation}")
+
+    async def wait_async(self, operation: str) -> None:
+        """비동기 호출용: 지연 후 확률적으로 오류를 발생시킵니다."""
+        delay, failed = self._draw()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if failed:
+            raise FakeProviderError(f"주입된 오류: {operation}")
+
+
+def _recordings_path(*parts: str) -> Optional[str]:
+    base = settings.FAKE_PROVIDER_RECORDINGS_DIR
+    return os.path.join(base, *parts) if base else None
+
+
+def _default_vision_response() -> vision.AnnotateImageResponse:
+    return vision.AnnotateImageResponse(
+        label_annotations=[
+            {'description': 'Smile', 'score': 0.92, 'topicality': 0.92},
+            {'description': 'Family', 'score': 0.88, 'topicality': 0.88},
+            {'description': 'Park', 'score': 0.81, 'topicality': 0.81},
+            {'description': 'Tree', 'score': 0.77, 'topicality': 0.77}
+        ],
+        face_annotations=[{
+            'detection_confidence': 0.97,
+            'joy_likelihood': vision.Likelihood.VERY_LIKELY,
+            'bounding_poly': {'vertices': [{'x': 10, 'y': 10}, {'x': 60, 'y': 10},
+                                           {'x': 60, 'y': 70}, {'x': 10, 'y': 70}]}
+        }]
+    )
+
+
+class FakeImageAnnotatorClient:
+    """기록된 AnnotateImageResponse를 재생하는 ImageAnnotatorClient 대체 클라이언트
+
+    이미지 내용의 해시로 기록을 선택하므로 같은 이미지는 항상 같은 응답을 받습니다.
+    """
+
+    def __init__(self, responses: Optional[List[vision.AnnotateImageResponse]] = None,
+                 profile: Optional[LatencyProfile] = None):
+        self.responses = responses or [_default_vision_response()]
+        self.profile = profile or LatencyProfile()
+
+    @classmethod
+    def from_settings(cls) -> "FakeImageAnnotatorClient":
+        """설정된 기록 디렉토리와 지연 프로필로 생성합니다."""
+        responses = []
+        directory = _recordings_path("vision")
+        if directory and os.path.isdir(directory):
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith(".json"):
+                    with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                        responses.append(vision.AnnotateImageResponse.from_json(f.read()))
+        logger.info(f"Vision 대체 클라이언트 사용: 기록된 응답 {len(responses)}개")
+        return cls(responses, LatencyProfile.from_settings())
+
+    def _response_for(self, image) -> vision.AnnotateImageResponse:
+        content = image.content if hasattr(image, "content") else image.get("content", b"")
+        index = int.from_bytes(hashlib.sha256(content).digest()[:4], "big") % len(self.responses)
+        return self.responses[index]
+
+    def annotate_image(self, request, **kwargs) -> vision.AnnotateImageResponse:
+        self.profile.wait("vision.annotate_image")
+        return self._response_for(request['image'])
+
+    def batch_annotate_images(self, requests, **kwargs) -> vision.BatchAnnotateImagesResponse:
+        self.profile.wait("vision.batch_annotate_images")
+        return vision.BatchAnnotateImagesResponse(
+            responses=[self._response_for(request['image']) for request in requests]
+        )
+
+    def _single(self, image, **kwargs) -> vision.AnnotateImageResponse:
+        self.profile.wait("vision.detection")
+        return self._response_for(image)
+
+    label_detection = object_localization = face_detection = landmark_detection = _single
+    text_detection = safe_search_detection = image_properties = _single
+
+
+class FakeTranslateClient:
+    """기록된 번역을 재생하는 translate_v2.Client 대체 클라이언트
+
+    기록에 없는 문장은 원문을 그대로 반환합니다.
+    """
+
+    def __init__(self, translations: Optional[Dict[str, str]] = None,
+                 profile: Optional[LatencyProfile] = None):
+        self.translations = {k.lower(): v for k, v in (translations or {}).items()}
+        self.profile = profile or LatencyProfile()
+
+    @classmethod
+    def from_settings(cls) -> "FakeTranslateClient":
+        """설정된 기록 파일과 지연 프로필로 생성합니다."""
+        translations = {}
+        path = _recordings_path("translate.json")
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                translations = json.load(f)
+        logger.info(f"번역 대체 클라이언트 사용: 기록된 번역 {len(translations)}개")
+        return cls(translations, LatencyProfile.from_settings())
+
+    def translate(self, values, target_language=None, source_language=None, **kwargs):
+        self.profile.wait("translate.translate")
+        single = isinstance(values, str)
+        results = [{
+            'input': value,
+            'translatedText': self.translations.get(value.lower(), value),
+            'detectedSourceLanguage': source_language or 'en'
+        } for value in ([values] if single else values)]
+        return results[0] if single else results
+
+
+def estimate_tokens(text: str) -> int:
+    """대체 클라이언트용 대략적인 토큰 수 (한글/영문 혼합 기준 2글자당 1토큰)"""
+    return (len(text) + 1) // 2
+
+
+class FakeUsageMetadata:
+    """GenerateContentResponse.usage_metadata 대체 객체"""
+
+    def __init__(self, prompt_token_count: int = 0, cached_content_token_count: int = 0,
+                 candidates_token_count: int = 0):
+        self.prompt_token_count = prompt_token_count
+        self.cached_content_token_count = cached_content_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class FakeGenerateContentResponse:
+    """GenerateContentResponse 대체 객체"""
+
+    def __init__(self, text: str, usage_metadata: Optional[FakeUsageMetadata] = None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeStreamResponse:
+    """스트리밍 GenerateContentResponse 대체 객체
+
+    호출 한 번의 지연을 조각 수로 나누어 조각마다 기다리므로,
+    전체 소요 시간은 단건 호출과 같고 첫 조각은 그보다 먼저 도착합니다.
+    """
+
+    def __init__(self, text: str, profile: LatencyProfile, operation: str,
+                 usage_metadata: Optional[FakeUsageMetadata] = None):
+        self.chunks = [text[i:i + FAKE_STREAM_CHUNK_CHARS]
+                       for i in range(0, len(text), FAKE_STREAM_CHUNK_CHARS)] or [""]
+        self.text = text
+        self.profile = profile
+        self.operation = operation
+        self.usage_metadata = usage_metadata
+
+    async def __aiter__(self):
+        delay, failed = self.profile._draw()
+        for index, chunk in enumerate(self.chunks):
+            if delay > 0:
+                await asyncio.sleep(delay / len(self.chunks))
+            if failed and index == 0:
+                raise FakeProviderError(f"주입된 오류: {self.operation}")
+            # 사용량은 실제 API와 같이 마지막 조각에만 담김
+            last = index == len(self.chunks) - 1
+            yield FakeGenerateContentResponse(chunk, self.usage_metadata if last else None)
+
+
+class FakeGenerativeModel:
+    """기록된 스토리를 재생하는 genai.GenerativeModel 대체 클라이언트"""
+
+    def __init__(self, model_name: str = "gemini-1.5-flash",
+                 stories: Optional[List[str]] = None,
+                 profile: Optional[LatencyProfile] = None,
+                 cached_prefix: str = "", **kwargs):
+        """
+        Args:
+            model_name (str): 모델 이름
+            stories (Optional[List[str]]): 재생할 스토리 목록
+            profile (Optional[LatencyProfile]): 지연 프로필
+            cached_prefix (str): 컨텍스트 캐시에 등록된 것으로 간주할 프롬프트 앞부분
+        """
+        self.model_name = model_name
+        self.stories = stories or [DEFAULT_STORY]
+        self.profile = profile or LatencyProfile()
+        self.cached_prefix = cached_prefix
+
+    @classmethod
+    def from_settings(cls, model_name: str = "gemini-1.5-flash", **kwargs) -> "FakeGenerativeModel":
+        """설정된 기록 파일과 지연 프로필로 생성합니다."""
+        stories = None
+        path = _recordings_path("gemini.json")
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                stories = json.load(f)
+        return cls(model_name, stories, LatencyProfile.from_settings(), **kwargs)
+
+    def _prompt_for(self, contents: Any) -> str:
+        # 컨텍스트 캐시 모델은 캐시된 앞부분 + 요청 내용을 하나의 프롬프트로 봄
+        return self.cached_prefix + (contents if isinstance(contents, str) else str(contents[0]))
+
+    def _story_for(self, prompt: str) -> str:
+        index = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:4], "big")
+        return self.stories[index % len(self.stories)]
+
+    def _usage_for(self, prompt: str, story: str) -> FakeUsageMetadata:
+        return FakeUsageMetadata(
+            prompt_token_count=estimate_tokens(prompt),
+            cached_content_token_count=estimate_tokens(self.cached_prefix) if self.cached_prefix else 0,
+            candidates_token_count=estimate_tokens(story)
+        )
+
+    async def generate_content_async(self, contents, stream: bool = False, **kwargs):
+        prompt = self._prompt_for(contents)
+        story = self._story_for(prompt)
+        if stream:
+            return FakeStreamResponse(story, self.profile, "gemini.generate_content", self._usage_for(prompt, story))
+        await self.profile.wait_async("gemini.generate_content")
+        return FakeGenerateContentResponse(story, self._usage_for(prompt, story))
+
+
+def create_translate_client():
+    """설정에 따라 번역 클라이언트를 생성합니다."""
+    if use_fake_providers():
+        return FakeTranslateClient.from_settings()
+    from google.cloud import translate_v2 as translate
+    return translate.Client()
+
+
+def create_generative_model(model_name: str, **kwargs):
+    """설정에 따라 Gemini 모델 객체를 생성합니다."""
+    if use_fake_providers():
+        return FakeGenerativeModel.from_settings(model_name, **kwargs)
+    import google.generativeai as genai
+    return genai.GenerativeModel(model_name, **kwargs)
+
+
+def create_cached_model(model_name: str, prefix: str, ttl_seconds: int, **kwargs) -> tuple:
+    """프롬프트 앞부분을 Gemini 컨텍스트 캐시에 등록하고 이를 사용하는 모델 객체를 생성합니다.
+
+    Args:
+        model_name (str): 컨텍스트 캐시를 지원하는 모델 이름 (예: gemini-1.5-flash-002)
+        prefix (str): 캐시에 등록할 프롬프트 앞부분
+        ttl_seconds (int): 캐시 유효 시간(초)
+
+    Returns:
+        tuple: (모델 객체, CachedContent 또는 대체 모드에서는 None)
+
+    Raises:
+        Exception: 캐시 생성 실패 (모델의 최소 토큰 수 미달, 미지원 모델 등)
+    """
+    if use_fake_providers():
+        return FakeGenerativeModel.from_settings(model_name, cached_prefix=prefix, **kwargs), None
+    import datetime
+    import google.generativeai as genai
+    from google.generativeai import caching
+    cached = caching.CachedContent.create(
+        model=model_name,
+        display_name="storytelling-instructions",
+        contents=[prefix],
+        ttl=datetime.timedelta(seconds=ttl_seconds)
+    )
+    return genai.GenerativeModel.from_cached_content(cached, **kwargs), cached
+
+
+class GenerativeModelPool:
+    """모델 이름과 생성 설정별로 Gemini 모델 객체를 한 번만 만들어 재사용하는 풀
+
+    genai.configure는 프로세스 전역 설정을 바꾸고 이미 만든 API 클라이언트(gRPC 채널)를
+    버리므로 처음 모델을 만들 때 한 번만 호출합니다. 모델 객체는 첫 호출 때 만든 비동기
+    클라이언트를 보관하므로, 모델을 재사용하면 연결도 재사용됩니다.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_models: int = 8):
+        """
+        Args:
+            api_key (Optional[str]): Gemini API 키
+            max_models (int): 보관할 최대 모델 객체 수 (초과 시 가장 오래 사용되지 않은 것부터 제거)
+        """
+        self.api_key = api_key
+        self.max_models = max_models
+        self._models: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.configured = False
+        self.created = 0
+        self.hits = 0
+        # 컨텍스트 캐시 모델: 키 -> (모델, CachedContent, 갱신 시각)
+        self._cached_models: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._context_failures: Dict[tuple, float] = {}
+        self._context_pending: set = set()  # 생성 중인 컨텍스트 캐시 키
+        self.context_created = 0
+        self.context_hits = 0
+        self.context_failed = 0
+
+    def _configure(self) -> None:
+        if self.configured:
+            return
+        if not use_fake_providers():
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            logger.info("Gemini API 구성 완료")
+        self.configured = True
+
+    def get(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None) -> Any:
+        """모델 객체를 반환합니다. 같은 모델 이름과 생성 설정이면 같은 객체를 반환합니다.
+
+        Args:
+            model_name (str): 모델 이름 (예: gemini-1.5-flash)
+            generation_config (Optional[Dict[str, Any]]): 생성 설정 (예: {"temperature": 0.7})
+
+        Returns:
+            Any: genai.GenerativeModel (또는 대체 모델)
+        """
+        key = (model_name, json.dumps(generation_config, sort_keys=True) if generation_config else None)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+
+            self._configure()
+            kwargs = {"generation_config": generation_config} if generation_config else {}
+            model = create_generative_model(model_name, **kwargs)
+            self._models[key] = model
+            self.created += 1
+            if len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+            logger.info(f"Gemini 모델 객체 생성: {model_name} (보관 {len(self._models)}개)")
+            return model
+
+    def get_cached(self, model_name: str, prefix: str,
+                   generation_config: Optional[Dict[str, Any]] = None,
+                   ttl_seconds: int = 3600) -> Optional[Any]:
+        """프롬프트 앞부분을 컨텍스트 캐시에 등록한 모델 객체를 반환합니다.
+
+        캐시는 유효 시간이 끝나기 전에 다시 만들고, 생성에 실패한 조합은 유효 시간 동안
+        다시 시도하지 않습니다. 캐시 생성은 네트워크 호출이므로 스레드에서 호출하며,
+        생성하는 동안 같은 키의 다른 요청은 기다리지 않고 None(전체 프롬프트 사용)을 받습니다.
+
+        Args:
+            model_name (str): 모델 이름
+            prefix (str): 캐시에 등록할 프롬프트 앞부분 (요청 간에 같은 지시문)
+            generation_config (Optional[Dict[str, Any]]): 생성 설정
+            ttl_seconds (int): 캐시 유효 시간(초)
+
+        Returns:
+            Optional[Any]: 모델 객체, 컨텍스트 캐시를 사용할 수 없으면 None
+        """
+        key = (
+            model_name,
+            json.dumps(generation_config, sort_keys=True) if generation_config else None,
+            hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        )
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cached_models.get(key)
+            if entry is not None and entry[2] > now:
+                self._cached_models.move_to_end(key)
+                self.context_hits += 1
+                return entry[0]
+            if self._context_failures.get(key, 0) > now or key in self._context_pending:
+                # 실패했거나 다른 요청이 만드는 중이면 기다리지 않고 전체 프롬프트로 요청
+                return None
+            self._context_pending.add(key)
+            self._configure()
+
+        # 네트워크 호출(캐시 생성/삭제)은 잠금 밖에서 실행 (get()은 이벤트 루프에서 같은 잠금을 사용)
+        kwargs = {"generation_config": generation_config} if generation_config else {}
+        try:
+            model, cached = create_cached_model(model_name, prefix, ttl_seconds, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self._context_pending.discard(key)
+                self.context_failed += 1
+                self._context_failures[key] = now + ttl_seconds
+            logger.warning(f"컨텍스트 캐시 생성 실패, 전체 프롬프트로 요청합니다: {str(e)}")
+            return None
+
+        evicted = []
+        with self._lock:
+            self._context_pending.discard(key)
+            # 만료 전에 갱신 (유효 시간의 90%)
+            self._cached_models[key] = (model, cached, now + ttl_seconds * 0.9)
+            self._cached_models.move_to_end(key)
+            self.context_created += 1
+            while len(self._cached_models) > self.max_models:
+                evicted.append(self._cached_models.popitem(last=False)[1][1])
+        logger.info(f"컨텍스트 캐시 생성: {model_name}, 앞부분 {len(prefix)} 자")
+
+        for cached_content in evicted:
+            if cached_content is not None:
+                try:
+                    cached_content.delete()
+                except Exception as e:
+                    logger.warning(f"컨텍스트 캐시 삭제 실패 (만료 시 자동 삭제): {str(e)}")
+        return model
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 사용 통계를 반환합니다."""
+        return {
+            "models": len(self._models),
+            "max_models": self.max_models,
+            "created": self.created,
+            "hits": self.hits,
+            "context_caches": len(self._cached_models),
+            "context_created": self.context_created,
+            "context_hits": self.context_hits,
+            "context_failed": self.context_failed
+        }
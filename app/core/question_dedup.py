@@ -0,0 +1,54 @@
+from typing import Iterable, List
+import logging
+import threading
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from app.core.cache import LRUCache
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class QuestionDeduplicator:
+    """문자 n-gram TF-IDF 유사도로 의미가 겹치는 질문을 걸러냅니다.
+
+    템플릿 질문으로 어휘와 IDF를 학습하고 템플릿 벡터를 생성 시 미리 계산합니다.
+    레이블이 들어간 질문처럼 처음 보는 문장은 한 번만 변환해 캐시합니다.
+    """
+
+    def __init__(self, corpus: Iterable[str], threshold: float = 0.5, cache_size: int = 4096):
+        """
+        Args:
+            corpus (Iterable[str]): 어휘 학습에 사용할 질문 문장
+            threshold (float): 이 값 이상의 코사인 유사도를 가진 질문은 중복으로 판단
+            cache_size (int): 문장 벡터 캐시 최대 항목 수
+        """
+        corpus = list(dict.fromkeys(corpus))
+        self.threshold = threshold
+        self.vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 3))
+        matrix = self.vectorizer.fit_transform(corpus).toarray().astype(np.float32)
+        self._precomputed = {text: row for text, row in zip(corpus, matrix)}
+        self._cache = LRUCache(cache_size, 0)
+        self._lock = threading.Lock()
+
+    def vector(self, text: str) -> np.ndarray:
+        """L2 정규화된 문장 벡터를 반환합니다."""
+        row = self._precomputed.get(text)
+        if row is not None:
+            return row
+        row = self._cache.get(text)
+        if row is None:
+            # TfidfVectorizer.transform은 스레드 안전이 보장되지 않음
+            with self._lock:
+                row = self.vectorizer.transform([text]).toarray()[0].astype(np.float32)
+            self._cache.set(text, row)
+        return row
+
+    def vectors(self, texts: List[str]) -> np.ndarray:
+        """문장 목록의 벡터를 (문장 수 x 어휘 수) 행렬로 반환합니다."""
+        return np.stack([self.vector(text) for text in texts])
+
+    def is_duplicate(self, vector: np.ndarray, selected: np.ndarray) -> bool:
+        """이미 선택된 벡터들 중 유사도가 기준 이상인 것이 있는지 확인합니다."""
+        return len(selected) > 0 and float((selected @ vector).max()) >= self.threshold
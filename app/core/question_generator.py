@@ -1,185 +1,178 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import asyncio
 import logging
-from enum import Enum
-from google.cloud import translate_v2 as translate
 from app.core.config import settings
+from app.core.providers import create_translate_client
+from app.core.question_ranking import extract_signals
+from app.core.question_rules import QuestionCategory, QuestionLevel, QuestionRules, QuestionRuleStore
+from app.core.translation import TranslationMemo
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class QuestionLevel(Enum):
-    """질문 난이도 레벨"""
-    BASIC = 1      # 기본 인식/회상
-    CONTEXT = 2    # 맥락/감정
-    REFLECTIVE = 3 # 반성적/통합적
+class QuestionGenerator:
+    def __init__(self, translate_client=None, translation_memo: TranslationMemo = None,
+                 rules_store: QuestionRuleStore = None, cache_only: bool = False):
+        """질문 생성기 초기화
 
-class QuestionCategory(Enum):
-    """질문 카테고리"""
-    TEMPORAL = "temporal"      # 시간-순차적
-    SENSORY = "sensory"       # 감각-경험적
-    RELATIONAL = "relational" # 관계-사회적
-    IDENTITY = "identity"     # 정체성-내러티브
+        Args:
+            translate_client: 미리 생성된 번역 클라이언트 (없으면 설정에 따라 생성)
+            translation_memo (TranslationMemo): 번역 캐시 (없으면 word_mapping으로 초기화해 생성)
+            rules_store (QuestionRuleStore): 질문 규칙 저장소 (없으면 설정된 규칙 파일로 생성)
+            cache_only (bool): True이면 Translation API 없이 캐시된 번역만 사용 (없으면 원문)
+        """
+        self.translate_client = None if cache_only else translate_client
+        if not cache_only:
+            try:
+                if self.translate_client is None:
+                    self.translate_client = create_translate_client()
+                logger.info("번역 클라이언트가 성공적으로 초기화되었습니다.")
+            except Exception as e:
+                logger.warning(f"번역 클라이언트 초기화 실패: {str(e)}")
+                logger.warning("번역 기능이 비활성화된 상태로 실행됩니다.")
 
-class QuestionGenerator:
-    def __init__(self):
-        """질문 생성기 초기화"""
-        self.translate_client = None
-        try:
-            self.translate_client = translate.Client()
-            logger.info("번역 클라이언트가 성공적으로 초기화되었습니다.")
-        except Exception as e:
-            logger.warning(f"번역 클라이언트 초기화 실패: {str(e)}")
-            logger.warning("번역 기능이 비활성화된 상태로 실행됩니다.")
-
-        # 영어-한국어 단어 매핑
-        self.word_mapping = {
-            # 장소
-            'beach': '해변',
-            'mountain': '산',
-            'park': '공원',
-            'restaurant': '식당',
-            'house': '집',
-            'office': '사무실',
-            'sea': '바다',
-            'indoor': '실내',
-            'room': '방',
-            'interior': '실내',
-            
-            # 활동
-            'party': '파티',
-            'wedding': '결혼식',
-            'graduation': '졸업식',
-            'travel': '여행',
-            'sport': '운동',
-            'dining': '식사',
-            'vacation': '휴가',
-            'ceremony': '행사',
-            'award': '시상식',
-            'performance': '공연',
-            
-            # 감정
-            'happiness': '행복',
-            'joy': '기쁨',
-            'fun': '즐거움',
-            'smile': '미소',
-            'sadness': '슬픔',
-            'serious': '진지함',
-            'anger': '분노',
-            
-            # 시간
-            'morning': '아침',
-            'afternoon': '오후',
-            'evening': '저녁',
-            'night': '밤',
-            
-            # 날씨
-            'sunny': '맑은',
-            'rainy': '비오는',
-            'cloudy': '흐린',
-            'snowy': '눈오는'
-        }
+        # 질문 규칙 (단어 매핑, 분류 키워드, 템플릿) - 파일이 바뀌면 새 스냅샷으로 교체
+        self.rules_store = rules_store or QuestionRuleStore.from_settings()
 
-        self.question_templates = {
-            QuestionCategory.TEMPORAL: {
-                QuestionLevel.BASIC: [
-                    "이 사진은 언제 찍은 것인가요?",
-                    "이 날의 날씨는 어땠나요?",
-                    "이 순간은 얼마나 오래 지속되었나요?"
-                ],
-                QuestionLevel.CONTEXT: [
-                    "이 순간을 기록하게 된 특별한 계기가 있었나요?",
-                    "이 때 가장 기억에 남는 순간은 언제인가요?",
-                    "이 시기에 일상생활은 어떠했나요?"
-                ],
-                QuestionLevel.REFLECTIVE: [
-                    "이 순간이 당신의 인생에서 어떤 의미를 가지나요?",
-                    "이 때와 비교해서 지금은 무엇이 가장 크게 변했나요?",
-                    "이 경험이 당신의 삶에 어떤 영향을 주었나요?"
-                ]
-            },
-            QuestionCategory.SENSORY: {
-                QuestionLevel.BASIC: [
-                    "이 장소에서 들리던 소리들을 기억하시나요?",
-                    "이 곳의 특별한 촉감이나 질감이 기억나시나요?",
-                    "주변의 냄새나 향기가 기억나시나요?"
-                ],
-                QuestionLevel.CONTEXT: [
-                    "이 장소의 전반적인 분위기는 어떠했나요?",
-                    "주변 환경의 모습과 색감은 어땠나요?",
-                    "그 곳의 온도나 공기는 어떤 느낌이었나요?"
-                ],
-                QuestionLevel.REFLECTIVE: [
-                    "이 장소에서의 경험 중 가장 인상 깊은 감각은 무엇인가요?",
-                    "이 곳의 어떤 감각적 기억이 지금도 생생한가요?",
-                    "비슷한 장소에 갈 때마다 이 때의 기억이 떠오르나요?"
-                ]
-            },
-            QuestionCategory.RELATIONAL: {
-                QuestionLevel.BASIC: [
-                    "사진 속 사람들은 누구인가요?",
-                    "함께 있는 사람들과는 어떤 관계인가요?",
-                    "이 순간을 함께 한 사람은 몇 명인가요?"
-                ],
-                QuestionLevel.CONTEXT: [
-                    "이 사람들과 나눈 대화나 활동이 기억나시나요?",
-                    "함께 있어서 특별했던 순간이 있었나요?",
-                    "서로에 대해 새롭게 알게 된 점이 있나요?"
-                ],
-                QuestionLevel.REFLECTIVE: [
-                    "이 사람들과의 관계가 현재는 어떻게 변했나요?",
-                    "이 만남이 이후의 관계에 어떤 영향을 주었나요?",
-                    "이 사람들과의 추억 중 가장 소중한 것은 무엇인가요?"
-                ]
-            },
-            QuestionCategory.IDENTITY: {
-                QuestionLevel.BASIC: [
-                    "이 때 당신의 나이는 몇 살이었나요?",
-                    "이 시기에 어떤 일을 하고 계셨나요?",
-                    "당시의 취미나 관심사는 무엇이었나요?"
-                ],
-                QuestionLevel.CONTEXT: [
-                    "이 시기에 당신에게 가장 중요했던 것은 무엇인가요?",
-                    "이 때의 꿈이나 목표는 무엇이었나요?",
-                    "당시의 생활방식은 어떠했나요?"
-                ],
-                QuestionLevel.REFLECTIVE: [
-                    "이 경험이 당신을 어떻게 성장시켰나요?",
-                    "이 시기의 선택들이 현재의 당신을 만드는데 어떤 영향을 주었나요?",
-                    "지금 돌아보면 이 때의 자신에게 해주고 싶은 말이 있나요?"
-                ]
-            }
-        }
+        # 번역 캐시 (word_mapping은 항상 적중하는 정적 계층)
+        self.translation_memo = translation_memo or TranslationMemo.from_settings(seed=self.word_mapping)
+        self.rules_store.subscribe(self._on_rules_reloaded)
+
+    @property
+    def rules(self) -> QuestionRules:
+        """현재 질문 규칙 스냅샷"""
+        return self.rules_store.get()
+
+    @property
+    def word_mapping(self):
+        """영어-한국어 단어 매핑"""
+        return self.rules.word_mapping
+
+    @property
+    def question_templates(self):
+        """카테고리/레벨별 질문 템플릿"""
+        return self.rules.question_templates
+
+    @property
+    def ranker(self):
+        """후보 질문 점수화/선택기"""
+        return self.rules.ranker
+
+    def _on_rules_reloaded(self, rules: QuestionRules) -> None:
+        # 번역 캐시의 정적 계층을 새 매핑으로 교체
+        self.translation_memo.static = {k.lower(): v for k, v in rules.word_mapping.items()}
+
+    def warm_up(self) -> None:
+        """요청 처리 전에 필요한 준비 작업을 수행합니다."""
+        logger.info(f"질문 생성기 준비 완료 (번역 클라이언트: {'사용' if self.translate_client else '미사용'})")
 
     def _translate_context(self, text: str) -> str:
         """컨텍스트를 고려하여 영어 텍스트를 한국어로 변환합니다."""
         if not text:
             return text
-            
-        # 소문자로 변환하여 매핑 검색
-        text_lower = text.lower()
-        
-        # 매핑된 단어가 있으면 사용
-        if text_lower in self.word_mapping:
-            return self.word_mapping[text_lower]
-            
-        # 매핑이 없는 경우 Translation API 사용 시도
-        try:
-            if self.translate_client:
-                result = self.translate_client.translate(
-                    text,
-                    target_language='ko',
-                    source_language='en'
-                )
-                return result['translatedText']
-        except Exception as e:
-            logger.warning(f"번역 실패, 기본 매핑 사용: {str(e)}")
-            
-        # 실패 시 원본 반환
-        return text
+        return self.translate_labels([text])[text]
+
+    def translate_labels(self, texts: Iterable[str]) -> Dict[str, str]:
+        """여러 레이블을 한 번에 한국어로 변환합니다.
+
+        캐시에 없는 레이블만 모아 Translation API를 묶음 단위로 호출하므로
+        레이블 수와 관계없이 요청당 왕복 횟수가 일정합니다.
+
+        Args:
+            texts (Iterable[str]): 영어 레이블 목록 (중복 허용)
+
+        Returns:
+            Dict[str, str]: {레이블: 번역} (번역 실패 시 원문)
+        """
+        translations, chunks = self._lookup_translations(texts)
+        # 캐시에 없는 레이블만 Translation API로 일괄 번역
+        for chunk in chunks:
+            try:
+                translations.update(self._translate_chunk(chunk))
+            except Exception as e:
+                logger.warning(f"번역 실패, 원문 사용: {str(e)}")
+        return translations
+
+    async def translate_labels_async(self, texts: Iterable[str], timeout: float = None) -> Dict[str, str]:
+        """이벤트 루프를 막지 않고 여러 레이블을 한국어로 변환합니다.
+
+        캐시에 없는 레이블 묶음은 스레드에서 동시에 번역하며, 제한 시간 안에
+        끝나지 않은 묶음은 영어 원문을 사용합니다. 늦게 끝난 번역도 캐시에는 저장되므로
+        다음 요청부터 사용됩니다.
+
+        Args:
+            texts (Iterable[str]): 영어 레이블 목록 (중복 허용)
+            timeout (float): 번역 대기 시간(초) (기본값: settings.TRANSLATION_TIMEOUT)
+
+        Returns:
+            Dict[str, str]: {레이블: 번역} (번역 실패 또는 시간 초과 시 원문)
+        """
+        timeout = timeout if timeout is not None else settings.TRANSLATION_TIMEOUT
+        if self.translation_memo.disk is None:
+            translations, chunks = self._lookup_translations(texts)
+        else:
+            # 영구 캐시 조회와 사용 빈도 저장(SQLite)은 이벤트 루프 밖에서 실행
+            translations, chunks = await asyncio.to_thread(self._lookup_translations, list(texts))
+        if not chunks:
+            return translations
+
+        results = await asyncio.gather(*(
+            asyncio.wait_for(asyncio.to_thread(self._translate_chunk, chunk), timeout=timeout)
+            for chunk in chunks
+        ), return_exceptions=True)
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"번역 시간 초과({timeout}초), 원문 사용: {len(chunk)}개 레이블")
+            elif isinstance(result, Exception):
+                logger.warning(f"번역 실패, 원문 사용: {str(result)}")
+            else:
+                translations.update(result)
+        return translations
+
+    def _lookup_translations(self, texts: Iterable[str]) -> Tuple[Dict[str, str], List[List[str]]]:
+        """캐시에서 번역을 찾고, 없는 레이블은 API 호출 단위로 묶어 반환합니다."""
+        translations = {}
+        missing = []
+        for text in texts:
+            if not text or text in translations:
+                continue
+            # 매핑 또는 이전 번역 결과가 있으면 사용
+            cached = self.translation_memo.get(text)
+            if cached is None:
+                missing.append(text)
+                cached = text  # 실패 시 원본 반환
+            translations[text] = cached
 
-    def _extract_context(self, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
-        """이미지 분석 결과에서 컨텍스트 정보를 추출합니다."""
+        if not self.translate_client:
+            return translations, []
+        batch_size = settings.TRANSLATION_BATCH_SIZE
+        return translations, [missing[start:start + batch_size] for start in range(0, len(missing), batch_size)]
+
+    def _translate_chunk(self, chunk: List[str]) -> Dict[str, str]:
+        """레이블 묶음을 Translation API로 번역하고 캐시에 저장합니다."""
+        results = self.translate_client.translate(
+            chunk,
+            target_language='ko',
+            source_language='en'
+        )
+        translated = {}
+        for text, result in zip(chunk, results):
+            translated[text] = result['translatedText']
+            self.translation_memo.set(text, result['translatedText'])
+        return translated
+
+    def _extract_context(self, analysis_result: Dict[str, Any],
+                         translations: Optional[Dict[str, str]] = None,
+                         rules: Optional[QuestionRules] = None) -> Dict[str, Any]:
+        """이미지 분석 결과에서 컨텍스트 정보를 추출합니다.
+
+        Args:
+            analysis_result: Vision API의 이미지 분석 결과
+            translations: 미리 번역한 {레이블: 번역} (없으면 이 이미지의 레이블을 일괄 번역)
+            rules: 사용할 규칙 스냅샷 (없으면 현재 규칙)
+        """
+        rules = rules or self.rules
         context = {
             'location': None,
             'activity': None,
@@ -192,84 +185,123 @@ class QuestionGenerator:
         
         # 레이블 분석
         labels = analysis_result.get('labels', [])
+        if translations is None:
+            translations = self.translate_labels(label['description'].lower() for label in labels)
         for label in labels:
             desc = label['description'].lower()
             score = label['score']
             
             # 한국어로 변환
-            korean_desc = self._translate_context(desc)
+            korean_desc = translations.get(desc) or self._translate_context(desc)
+            
+            # 한 번의 탐색으로 해당하는 모든 슬롯 분류
+            slots = rules.context_matcher.match(desc)
             
             # 감정 분석
-            if desc in ['happiness', 'joy', 'fun', 'smile']:
+            if 'emotion_positive' in slots:
                 context['emotion'] = {'type': 'positive', 'score': score, 'label': korean_desc}
-            elif desc in ['sadness', 'serious', 'anger']:
+            elif 'emotion_negative' in slots:
                 context['emotion'] = {'type': 'negative', 'score': score, 'label': korean_desc}
                 
             # 장소 분석
-            if any(word in desc for word in ['beach', 'mountain', 'park', 'restaurant', 'house', 'office', 'sea']):
+            if 'location' in slots:
                 context['location'] = {'type': desc, 'score': score, 'label': korean_desc}
                 
             # 활동 분석
-            if any(word in desc for word in ['party', 'wedding', 'graduation', 'travel', 'sport', 'dining', 'vacation']):
+            if 'activity' in slots:
                 context['activity'] = {'type': desc, 'score': score, 'label': korean_desc}
                 
             # 실내/실외 분석
-            if any(word in desc for word in ['indoor', 'room', 'interior']):
+            if 'indoor' in slots:
                 context['is_indoor'] = True
                 
             # 시간/날씨 분석
-            if any(word in desc for word in ['morning', 'afternoon', 'evening', 'night']):
+            if 'time_of_day' in slots:
                 context['time_of_day'] = {'type': desc, 'score': score, 'label': korean_desc}
-            elif any(word in desc for word in ['sunny', 'rainy', 'cloudy', 'snowy']):
+            elif 'weather' in slots:
                 context['weather'] = {'type': desc, 'score': score, 'label': korean_desc}
         
         return context
 
-    def generate_questions(self, analysis_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def generate_questions_batch(self, analysis_results: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """여러 분석 결과의 레이블을 한 번에 번역한 뒤 이미지별 질문을 생성합니다.
+        
+        Args:
+            analysis_results: Vision API의 이미지 분석 결과 목록
+            
+        Returns:
+            List[List[Dict[str, Any]]]: 입력 순서대로 이미지별 질문 목록
+        """
+        translations = self.translate_labels(
+            label['description'].lower()
+            for analysis_result in analysis_results
+            for label in analysis_result.get('labels', [])
+        )
+        return [self.generate_questions(analysis_result, translations) for analysis_result in analysis_results]
+
+    async def generate_questions_async(self, analysis_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """레이블 번역을 이벤트 루프 밖에서 수행하는 generate_questions의 비동기 버전입니다.
+        
+        Args:
+            analysis_result: Vision API의 이미지 분석 결과
+            
+        Returns:
+            List[Dict[str, Any]]: 생성된 질문 목록
+        """
+        translations = await self.translate_labels_async(
+            label['description'].lower() for label in analysis_result.get('labels', [])
+        )
+        return self.generate_questions(analysis_result, translations)
+
+    async def generate_questions_batch_async(self, analysis_results: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """generate_questions_batch의 비동기 버전입니다."""
+        translations = await self.translate_labels_async(
+            label['description'].lower()
+            for analysis_result in analysis_results
+            for label in analysis_result.get('labels', [])
+        )
+        return [self.generate_questions(analysis_result, translations) for analysis_result in analysis_results]
+
+    def generate_questions(self, analysis_result: Dict[str, Any],
+                           translations: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
         """Vision API 분석 결과를 기반으로 질문을 생성합니다.
         
         Args:
             analysis_result: Vision API의 이미지 분석 결과
+            translations: 미리 번역한 {레이블: 번역} (일괄 처리 시 사용)
             
         Returns:
             List[Dict[str, Any]]: 생성된 질문 목록
         """
         questions = []
         
+        # 요청 처리 중 규칙이 교체되어도 같은 스냅샷을 사용
+        rules = self.rules
+        
         # 컨텍스트 정보 추출
-        context = self._extract_context(analysis_result)
+        context = self._extract_context(analysis_result, translations, rules)
         
         # 1. 시간-순차적 질문 생성
-        temporal_questions = self._generate_temporal_questions(analysis_result, context)
-        questions.extend(temporal_questions[:3])
+        questions.extend(self._generate_temporal_questions(analysis_result, context, rules))
         
         # 2. 감각-경험적 질문 생성
-        sensory_questions = self._generate_sensory_questions(analysis_result, context)
-        questions.extend(sensory_questions[:3])
+        questions.extend(self._generate_sensory_questions(analysis_result, context, rules))
         
         # 3. 관계-사회적 질문 생성
-        relational_questions = self._generate_relational_questions(analysis_result, context)
-        questions.extend(relational_questions[:3])
-        
-        # 4. 정체성-내러티브 질문 생성 (필요한 경우)
-        if len(questions) < 5:
-            identity_questions = self._generate_identity_questions(analysis_result)
-            questions.extend(identity_questions[:3])  # 최대 3개
+        questions.extend(self._generate_relational_questions(analysis_result, context, rules))
         
-        # 최소 5개 질문 확보
-        while len(questions) < 5:
-            questions.append({
-                "category": QuestionCategory.TEMPORAL.value,
-                "level": QuestionLevel.BASIC.value,
-                "question": "이 순간에 대해 기억나는 것을 자유롭게 이야기해주세요."
-            })
+        # 4. 정체성-내러티브 질문 생성
+        questions.extend(self._generate_identity_questions(analysis_result, rules))
         
-        return questions[:10]  # 최대 10개 질문 반환
+        # 생성된 질문과 템플릿 질문을 분석 신호로 점수화해 선택 (쉬운 레벨부터 정렬)
+        signals = extract_signals(analysis_result, context, rules.achievement_labels)
+        return rules.ranker.rank(questions, signals)
 
-    def _generate_temporal_questions(self, analysis_result: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_temporal_questions(self, analysis_result: Dict[str, Any], context: Dict[str, Any],
+                                     rules: Optional[QuestionRules] = None) -> List[Dict[str, Any]]:
         """컨텍스트를 고려한 시간-순차적 질문을 생성합니다."""
         questions = []
-        base_questions = self.question_templates[QuestionCategory.TEMPORAL]
+        base_questions = (rules or self.rules).question_templates[QuestionCategory.TEMPORAL]
         
         # 기본 시간 관련 질문 추가
         questions.append({
@@ -298,10 +330,11 @@ class QuestionGenerator:
         
         return questions
 
-    def _generate_sensory_questions(self, analysis_result: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_sensory_questions(self, analysis_result: Dict[str, Any], context: Dict[str, Any],
+                                    rules: Optional[QuestionRules] = None) -> List[Dict[str, Any]]:
         """컨텍스트를 고려한 감각-경험적 질문을 생성합니다."""
         questions = []
-        base_questions = self.question_templates[QuestionCategory.SENSORY]
+        base_questions = (rules or self.rules).question_templates[QuestionCategory.SENSORY]
         
         # 장소가 감지된 경우 특화된 질문 생성
         if context['location']:
@@ -335,10 +368,11 @@ class QuestionGenerator:
         
         return questions
 
-    def _generate_relational_questions(self, analysis_result: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_relational_questions(self, analysis_result: Dict[str, Any], context: Dict[str, Any],
+                                       rules: Optional[QuestionRules] = None) -> List[Dict[str, Any]]:
         """컨텍스트를 고려한 관계-사회적 질문을 생성합니다."""
         questions = []
-        base_questions = self.question_templates[QuestionCategory.RELATIONAL]
+        base_questions = (rules or self.rules).question_templates[QuestionCategory.RELATIONAL]
         
         # 얼굴이 감지된 경우
         if context['people_count'] > 0:
@@ -366,23 +400,25 @@ class QuestionGenerator:
         
         return questions
 
-    def _generate_identity_questions(self, analysis_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_identity_questions(self, analysis_result: Dict[str, Any],
+                                     rules: Optional[QuestionRules] = None) -> List[Dict[str, Any]]:
         """정체성-내러티브 질문을 생성합니다."""
         questions = []
+        rules = rules or self.rules
+        base_questions = rules.question_templates[QuestionCategory.IDENTITY]
         
         # 특별한 활동이나 성취가 감지된 경우
-        achievement_labels = ["graduation", "ceremony", "award", "performance", "sport"]
-        if any(label["description"].lower() in achievement_labels for label in analysis_result.get("labels", [])):
+        if any(label["description"].lower() in rules.achievement_labels for label in analysis_result.get("labels", [])):
             questions.append({
                 "category": QuestionCategory.IDENTITY.value,
                 "level": QuestionLevel.BASIC.value,
-                "question": self.question_templates[QuestionCategory.IDENTITY][QuestionLevel.BASIC][1]
+                "question": base_questions[QuestionLevel.BASIC][min(1, len(base_questions[QuestionLevel.BASIC]) - 1)]
             })
             
             questions.append({
                 "category": QuestionCategory.IDENTITY.value,
                 "level": QuestionLevel.REFLECTIVE.value,
-                "question": self.question_templates[QuestionCategory.IDENTITY][QuestionLevel.REFLECTIVE][0]
+                "question": base_questions[QuestionLevel.REFLECTIVE][0]
             })
         
         return questions 
\ No newline at end of file
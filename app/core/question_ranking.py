@@ -0,0 +1,251 @@
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import numpy as np
+from app.core.question_dedup import QuestionDeduplicator
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 분석 결과에서 추출하는 신호 (모두 0~1)
+SIGNALS: Tuple[str, ...] = (
+    'bias',              # 항상 1
+    'activity',          # 감지된 활동 레이블 점수
+    'location',          # 감지된 장소 레이블 점수
+    'emotion',           # 감지된 감정 레이블 점수
+    'positive_emotion',  # 긍정 감정일 때의 감정 점수
+    'people',            # 가장 높은 얼굴 감지 신뢰도
+    'group',             # 두 명 이상일 때의 얼굴 감지 신뢰도
+    'time_weather',      # 시간대와 날씨가 모두 감지됐을 때의 평균 점수
+    'achievement',       # 성취 관련 레이블 점수
+    'label_strength',    # 상위 3개 레이블 점수 평균
+)
+_SIGNAL_INDEX = {name: index for index, name in enumerate(SIGNALS)}
+
+# 분석 결과에 맞춰 생성된 질문의 (카테고리, 레벨)별 가중치
+# 생성기는 (카테고리, 레벨)마다 최대 한 개의 질문을 만듭니다.
+GENERATED_WEIGHTS: Dict[Tuple[str, int], Dict[str, float]] = {
+    ('temporal', 1): {'bias': 0.9},
+    ('temporal', 2): {'bias': 0.6, 'activity': 1.0},
+    ('temporal', 3): {'bias': 0.5, 'emotion': 1.0},
+    ('sensory', 1): {'bias': 0.6, 'location': 1.0},
+    ('sensory', 2): {'bias': 0.6, 'time_weather': 1.0},
+    ('sensory', 3): {'bias': 0.6, 'label_strength': 0.4},
+    ('relational', 1): {'bias': 0.5, 'people': 1.0},
+    ('relational', 2): {'bias': 0.5, 'group': 1.0},
+    ('relational', 3): {'bias': 0.5, 'activity': 0.5, 'positive_emotion': 0.8},
+    ('identity', 1): {'bias': 0.4, 'achievement': 1.0},
+    ('identity', 3): {'bias': 0.4, 'achievement': 1.0},
+}
+
+# 일반 템플릿 질문의 카테고리별 가중치와 필수 신호 (필수 신호가 0이면 후보에서 제외)
+TEMPLATE_WEIGHTS: Dict[str, Dict[str, float]] = {
+    'temporal': {'bias': 0.3, 'emotion': 0.2},
+    'sensory': {'bias': 0.3, 'location': 0.3},
+    'relational': {'bias': 0.2, 'people': 0.4, 'group': 0.2},
+    'identity': {'bias': 0.2, 'achievement': 0.3},
+}
+TEMPLATE_REQUIRES: Dict[str, str] = {
+    'relational': 'people',
+}
+# 템플릿은 쉬운 레벨일수록, 목록 앞쪽일수록 약간 우선
+TEMPLATE_LEVEL_BONUS = {1: 0.05, 2: 0.0, 3: -0.05}
+TEMPLATE_ORDER_PENALTY = 0.01
+
+FALLBACK_QUESTION = {
+    "category": "temporal",
+    "level": 1,
+    "question": "이 순간에 대해 기억나는 것을 자유롭게 이야기해주세요."
+}
+
+
+def _weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    vector = np.zeros(len(SIGNALS), dtype=np.float64)
+    for name, weight in weights.items():
+        vector[_SIGNAL_INDEX[name]] = weight
+    return vector
+
+
+def extract_signals(analysis_result: Dict[str, Any], context: Dict[str, Any],
+                    achievement_labels: AbstractSet[str] = frozenset()) -> np.ndarray:
+    """분석 결과와 추출된 컨텍스트에서 순위 계산용 신호 벡터를 만듭니다.
+
+    Args:
+        analysis_result: Vision API의 이미지 분석 결과
+        context: QuestionGenerator._extract_context 결과
+        achievement_labels: 성취 관련 레이블 (소문자)
+
+    Returns:
+        np.ndarray: SIGNALS 순서의 신호 벡터
+    """
+    signals = np.zeros(len(SIGNALS), dtype=np.float64)
+    signals[_SIGNAL_INDEX['bias']] = 1.0
+
+    if context['activity']:
+        signals[_SIGNAL_INDEX['activity']] = context['activity']['score']
+    if context['location']:
+        signals[_SIGNAL_INDEX['location']] = context['location']['score']
+    if context['emotion']:
+        signals[_SIGNAL_INDEX['emotion']] = context['emotion']['score']
+        if context['emotion']['type'] == 'positive':
+            signals[_SIGNAL_INDEX['positive_emotion']] = context['emotion']['score']
+    if context['time_of_day'] and context['weather']:
+        signals[_SIGNAL_INDEX['time_weather']] = (context['time_of_day']['score'] + context['weather']['score']) / 2
+
+    faces = analysis_result.get('faces', [])
+    if faces:
+        confidence = max(face.get('confidence', 1.0) for face in faces)
+        signals[_SIGNAL_INDEX['people']] = confidence
+        if len(faces) > 1:
+            signals[_SIGNAL_INDEX['group']] = confidence
+
+    labels = analysis_result.get('labels', [])
+    if labels:
+        scores = sorted((label.get('score', 0.0) for label in labels), reverse=True)[:3]
+        signals[_SIGNAL_INDEX['label_strength']] = sum(scores) / len(scores)
+        signals[_SIGNAL_INDEX['achievement']] = max(
+            (label.get('score', 0.0) for label in labels
+             if label['description'].lower() in achievement_labels),
+            default=0.0
+        )
+    return signals
+
+
+class QuestionRanker:
+    """후보 질문을 분석 신호로 점수화하고 다양성/레벨 균형 제약 아래 선택합니다.
+
+    템플릿 질문의 가중치 행렬은 생성 시 한 번만 만들고, 요청마다
+    (후보 수 x 신호 수) 행렬과 신호 벡터의 곱으로 모든 후보를 한 번에 점수화합니다.
+    """
+
+    def __init__(self, templates: Iterable[Tuple[str, int, str]],
+                 min_count: int = 5, max_count: int = 10,
+                 min_score: float = 0.5, max_per_category: int = 3,
+                 deduplicator: Optional[QuestionDeduplicator] = None):
+        """
+        Args:
+            templates: (카테고리, 레벨, 질문) 템플릿 목록
+            min_count (int): 최소 질문 수
+            max_count (int): 최대 질문 수
+            min_score (float): 최소 개수를 채운 뒤 추가로 선택할 질문의 최소 점수
+            max_per_category (int): 카테고리별 최대 질문 수
+            deduplicator (Optional[QuestionDeduplicator]): 의미가 겹치는 질문을 거르는 필터
+        """
+        self.min_count = min_count
+        self.max_count = max_count
+        self.min_score = min_score
+        self.max_per_category = max_per_category
+        self.deduplicator = deduplicator
+
+        self.templates: List[Dict[str, Any]] = []
+        rows, requires = [], []
+        position: Dict[Tuple[str, int], int] = {}
+        for category, level, question in templates:
+            order = position.get((category, level), 0)
+            position[(category, level)] = order + 1
+            self.templates.append({"category": category, "level": level, "question": question})
+            row = _weight_vector(TEMPLATE_WEIGHTS.get(category, {'bias': 0.2}))
+            row[_SIGNAL_INDEX['bias']] += TEMPLATE_LEVEL_BONUS.get(level, 0.0) - TEMPLATE_ORDER_PENALTY * order
+            rows.append(row)
+            required = TEMPLATE_REQUIRES.get(category)
+            requires.append(_SIGNAL_INDEX[required] if required else -1)
+        self._template_weights = np.array(rows, dtype=np.float64).reshape(-1, len(SIGNALS))
+        self._template_requires = np.array(requires, dtype=np.int64)
+        self._generated_weights = {key: _weight_vector(weights) for key, weights in GENERATED_WEIGHTS.items()}
+        self._default_weights = _weight_vector({'bias': 0.5})
+
+    def score(self, generated: List[Dict[str, Any]], signals: np.ndarray) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """생성된 질문과 템플릿 질문을 한 번에 점수화합니다.
+
+        Args:
+            generated: 분석 결과에 맞춰 생성된 질문 목록
+            signals: extract_signals 결과
+
+        Returns:
+            Tuple[List[Dict[str, Any]], np.ndarray]: 후보 목록과 점수 (제외된 후보는 -inf)
+        """
+        generated_weights = np.array([
+            self._generated_weights.get((q["category"], q["level"]), self._default_weights) for q in generated
+        ], dtype=np.float64).reshape(-1, len(SIGNALS))
+        weights = np.vstack((generated_weights, self._template_weights))
+        scores = weights @ signals
+
+        template_scores = scores[len(generated):]
+        gated = self._template_requires >= 0
+        blocked = gated.copy()
+        blocked[gated] = signals[self._template_requires[gated]] <= 0
+        template_scores[blocked] = -np.inf
+        return generated + self.templates, scores
+
+    def select(self, candidates: List[Dict[str, Any]], scores: np.ndarray) -> List[Dict[str, Any]]:
+        """점수 순으로 제약을 지키며 질문을 선택하고 쉬운 레벨부터 정렬합니다.
+
+        1) 레벨마다 최소 점수를 넘는 최고 점수 질문을 하나씩 선택
+        2) 최소 점수를 넘는 질문을 (카테고리, 레벨)당 하나, 카테고리당 max_per_category개까지 추가
+        3) min_count에 못 미치면 점수와 무관하게 남은 후보로 채움 (다른 (카테고리, 레벨) 우선)
+        같은 문장의 질문은 한 번만 선택하며, 마지막 채우기 전까지는 이미 선택된 질문과
+        의미가 겹치는 질문(deduplicator 기준)도 건너뜁니다.
+
+        Args:
+            candidates: 후보 질문 목록
+            scores: 후보별 점수
+
+        Returns:
+            List[Dict[str, Any]]: 선택된 질문 목록
+        """
+        order = np.argsort(-scores, kind="stable")
+        eligible = order[np.isfinite(scores[order])]
+        confident = eligible[scores[eligible] >= self.min_score]
+
+        chosen: List[int] = []
+        texts = set()
+        slots = set()
+        per_category: Dict[str, int] = {}
+        vectors: List[np.ndarray] = []
+
+        def take(index: int, strict: bool) -> bool:
+            question = candidates[index]
+            slot = (question["category"], question["level"])
+            if question["question"] in texts:
+                return False
+            if strict and slot in slots:
+                return False
+            if per_category.get(question["category"], 0) >= self.max_per_category:
+                return False
+            if self.deduplicator is not None:
+                vector = self.deduplicator.vector(question["question"])
+                if strict and vectors and self.deduplicator.is_duplicate(vector, np.stack(vectors)):
+                    return False
+                vectors.append(vector)
+            chosen.append(index)
+            texts.add(question["question"])
+            slots.add(slot)
+            per_category[question["category"]] = per_category.get(question["category"], 0) + 1
+            return True
+
+        for level in sorted({candidates[index]["level"] for index in confident}):
+            for index in confident:
+                if candidates[index]["level"] == level and take(int(index), True):
+                    break
+
+        for index in confident:
+            if len(chosen) >= self.max_count:
+                break
+            take(int(index), True)
+
+        for strict in (True, False):
+            for index in eligible:
+                if len(chosen) >= self.min_count:
+                    break
+                take(int(index), strict)
+
+        selected = sorted(chosen, key=lambda index: (candidates[index]["level"], -scores[index]))
+        questions = [dict(candidates[index]) for index in selected[:self.max_count]]
+        while len(questions) < self.min_count:
+            questions.append(dict(FALLBACK_QUESTION))
+        return questions
+
+    def rank(self, generated: List[Dict[str, Any]], signals: np.ndarray) -> List[Dict[str, Any]]:
+        """후보를 점수화하고 선택합니다."""
+        candidates, scores = self.score(generated, signals)
+        return self.select(candidates, scores)
@@ -0,0 +1,306 @@
+"""저장된 분석 결과로 질문 일괄 재생성
+
+질문 규칙이 바뀌었을 때 analysis_results/에 저장된 분석 결과 전체의 질문을 HTTP API 없이
+다시 만듭니다. 파일 목록을 청크로 나누어 프로세스 풀에서 처리하며, 작업 프로세스가
+청크마다 JSON Lines 출력 파일 하나를 씁니다. 번역은 Translation API를 호출하지 않고
+word_mapping과 영구 번역 캐시에 있는 번역만 사용합니다 (없으면 영어 원문).
+
+출력 디렉토리:
+    manifest.txt        처리 대상 파일 목록 (첫 실행 시 고정, 재개할 때 그대로 사용)
+    checkpoint.json     규칙 버전, 청크 크기, 완료된 청크 번호
+    part-000000.jsonl   한 줄에 분석 결과 하나: {"source", "index", "questions"}
+                        (읽을 수 없는 파일은 {"source", "error"})
+
+실행:
+    python -m app.core.question_regeneration --input analysis_results --output regenerated
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import argparse
+import json
+import logging
+import os
+import time
+from app.core.config import settings
+from app.core.question_generator import QuestionGenerator
+from app.core.question_rules import DEFAULT_RULES_PATH, QuestionRuleStore, load_rules
+from app.core.translation import SQLiteTranslationStore, TranslationMemo
+from app.models.analysis import AnalysisResult, dumps
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+MANIFEST_FILE = "manifest.txt"
+CHECKPOINT_FILE = "checkpoint.json"
+
+# 작업 프로세스의 질문 생성기 (_init_worker에서 생성)
+_generator: Optional[QuestionGenerator] = None
+
+
+class RegenerationError(Exception):
+    """기존 체크포인트로 이어서 실행할 수 없는 경우"""
+
+
+def load_cached_translations(db_path: str) -> Dict[str, str]:
+    """영구 번역 캐시에 저장된 번역 전체를 읽습니다. (파일이 없으면 빈 딕셔너리)"""
+    if not db_path or not os.path.exists(db_path):
+        return {}
+    store = SQLiteTranslationStore(db_path)
+    try:
+        return store.items()
+    finally:
+        store.close()
+
+
+def iter_analyses(data: Dict[str, Any]) -> Iterator[Tuple[Optional[int], Any]]:
+    """저장 파일 하나에서 (일괄 분석 내 순번, 분석 결과)를 꺼냅니다.
+
+    단일 분석 파일은 순번이 None이며, 일괄 분석 파일은 성공한 결과만 꺼냅니다.
+    분석 결과가 없는 파일(스토리 결과 등)은 아무것도 반환하지 않습니다.
+    """
+    if "analysis_result" in data:
+        yield None, data["analysis_result"]
+    for result in data.get("results", ()):
+        if result.get("status") == "success" and "analysis_result" in result:
+            yield result.get("index"), result["analysis_result"]
+
+
+def _init_worker(rules_path: str, translations: Dict[str, str]) -> None:
+    """작업 프로세스마다 한 번 질문 생성기를 만듭니다."""
+    global _generator
+    rules_store = QuestionRuleStore(rules_path)
+    _generator = QuestionGenerator(
+        translation_memo=TranslationMemo(seed={**translations, **rules_store.current.word_mapping}),
+        rules_store=rules_store,
+        cache_only=True
+    )
+
+
+def _write_atomic(path: str, content: str) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def _part_path(output_dir: str, chunk_id: int) -> str:
+    return os.path.join(output_dir, f"part-{chunk_id:06d}.jsonl")
+
+
+def _process_chunk(chunk_id: int, input_dir: str, output_dir: str, names: List[str]) -> Dict[str, int]:
+    """청크 하나의 질문을 재생성해 출력 파일로 쓰고 처리 건수를 반환합니다."""
+    lines = []
+    analyses = failures = skipped = 0
+    misses = _generator.translation_memo.misses
+    for name in names:
+        try:
+            with open(os.path.join(input_dir, name), "rb") as f:
+                data = json.loads(f.read())
+            found = False
+            for index, analysis in iter_analyses(data):
+                found = True
+                questions = _generator.generate_questions(AnalysisResult.load(analysis))
+                lines.append(dumps({
+                    "source": name,
+                    "index": index,
+                    "questions": [
+                        {"category": q["category"], "level": q["level"], "question": q["question"]}
+                        for q in questions
+                    ]
+                }))
+                analyses += 1
+            if not found:
+                skipped += 1
+        except Exception as e:
+            failures += 1
+            lines.append(dumps({"source": name, "error": f"{type(e).__name__}: {str(e)}"}))
+
+    _write_atomic(_part_path(output_dir, chunk_id), "".join(line + "\n" for line in lines))
+    return {
+        "chunk": chunk_id,
+        "files": len(names),
+        "analyses": analyses,
+        "failures": failures,
+        "skipped_files": skipped,
+        "translation_misses": _generator.translation_memo.misses - misses
+    }
+
+
+def _load_manifest(input_dir: str, output_dir: str) -> List[str]:
+    """처리 대상 파일 목록을 읽거나, 없으면 입력 디렉토리를 훑어 고정합니다."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f if line.strip()]
+    with os.scandir(input_dir) as entries:
+        names = sorted(entry.name for entry in entries if entry.is_file() and entry.name.endswith(".json"))
+    _write_atomic(path, "".join(name + "\n" for name in names))
+    return names
+
+
+def _reset_output(output_dir: str) -> None:
+    for name in os.listdir(output_dir):
+        if name in (MANIFEST_FILE, CHECKPOINT_FILE) or (name.startswith("part-") and name.endswith(".jsonl")):
+            os.remove(os.path.join(output_dir, name))
+
+
+def regenerate(input_dir: str, output_dir: str, rules_path: str = DEFAULT_RULES_PATH,
+               workers: Optional[int] = None, chunk_size: int = 256,
+               translations_db: Optional[str] = None, max_chunks: Optional[int] = None,
+               restart: bool = False, progress_interval: float = 5.0) -> Dict[str, Any]:
+    """저장된 분석 결과 전체의 질문을 재생성합니다.
+
+    완료된 청크는 체크포인트에 기록되므로 중단 후 다시 실행하면 남은 청크만 처리합니다.
+
+    Args:
+        input_dir (str): 분석 결과 JSON 파일 디렉토리
+        output_dir (str): 출력 디렉토리
+        rules_path (str): 적용할 질문 규칙 파일
+        workers (Optional[int]): 작업 프로세스 수 (기본값: CPU 수, 1 이하이면 현재 프로세스에서 처리)
+        chunk_size (int): 청크당 파일 수
+        translations_db (Optional[str]): 영구 번역 캐시 경로 (기본값: TRANSLATION_CACHE_DB_PATH)
+        max_chunks (Optional[int]): 이번 실행에서 처리할 최대 청크 수 (기본값: 전체)
+        restart (bool): 기존 체크포인트와 출력을 지우고 처음부터 실행
+        progress_interval (float): 진행 상황 로그 및 체크포인트 저장 간격(초)
+
+    Returns:
+        Dict[str, Any]: 처리 건수와 처리량 통계
+
+    Raises:
+        RegenerationError: 체크포인트의 규칙 버전이나 청크 크기가 다른 경우
+    """
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    if restart:
+        _reset_output(output_dir)
+
+    rules = load_rules(rules_path)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILE)
+    completed = set()
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("rules_checksum") != rules.checksum or checkpoint.get("chunk_size") != chunk_size:
+            raise RegenerationError(
+                f"다른 규칙({checkpoint.get('rules_checksum')}) 또는 청크 크기({checkpoint.get('chunk_size')})로 "
+                f"만든 체크포인트입니다. 처음부터 다시 실행하려면 restart를 지정하세요."
+            )
+        completed.update(checkpoint.get("completed", ()))
+
+    names = _load_manifest(input_dir, output_dir)
+    chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+    pending = [chunk_id for chunk_id in range(len(chunks)) if chunk_id not in completed]
+    if max_chunks is not None:
+        pending = pending[:max_chunks]
+    logger.info(
+        f"질문 재생성 시작: 파일 {len(names)}개, 청크 {len(chunks)}개 중 {len(pending)}개 처리 "
+        f"(규칙 {rules.revision} {rules.checksum})"
+    )
+
+    totals = {"files": 0, "analyses": 0, "failures": 0, "skipped_files": 0, "translation_misses": 0}
+    pending_files = sum(len(chunks[chunk_id]) for chunk_id in pending)
+    last_report = time.perf_counter()
+
+    def save_checkpoint() -> None:
+        _write_atomic(checkpoint_path, json.dumps({
+            "version": CHECKPOINT_VERSION,
+            "input": os.path.abspath(input_dir),
+            "rules_revision": rules.revision,
+            "rules_checksum": rules.checksum,
+            "chunk_size": chunk_size,
+            "chunks": len(chunks),
+            "completed": sorted(completed)
+        }))
+
+    def record(result: Dict[str, int]) -> None:
+        nonlocal last_report
+        completed.add(result["chunk"])
+        for key in totals:
+            totals[key] += result[key]
+        now = time.perf_counter()
+        if now - last_report >= progress_interval:
+            last_report = now
+            save_checkpoint()
+            rate = totals["files"] / (now - start)
+            logger.info(
+                f"질문 재생성 진행: 파일 {totals['files']}/{pending_files}, 분석 결과 {totals['analyses']}건, "
+                f"{rate:.0f}파일/초, 남은 시간 약 {(pending_files - totals['files']) / rate:.0f}초"
+            )
+
+    translations = load_cached_translations(
+        settings.TRANSLATION_CACHE_DB_PATH if translations_db is None else translations_db
+    )
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers <= 1 or len(pending) <= 1:
+            _init_worker(rules_path, translations)
+            for chunk_id in pending:
+                record(_process_chunk(chunk_id, input_dir, output_dir, chunks[chunk_id]))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(rules_path, translations)) as executor:
+                # 파일 목록 전체를 한 번에 제출하지 않고 작업 프로세스 수의 두 배만 대기열에 유지
+                queue = iter(pending)
+                running = set()
+                for chunk_id in queue:
+                    running.add(executor.submit(_process_chunk, chunk_id, input_dir, output_dir, chunks[chunk_id]))
+                    if len(running) >= workers * 2:
+                        done, running = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(future.result())
+                for future in wait(running).done:
+                    record(future.result())
+    finally:
+        save_checkpoint()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "input": input_dir,
+        "output": output_dir,
+        "rules": {"revision": rules.revision, "checksum": rules.checksum},
+        "workers": workers,
+        "total_files": len(names),
+        "chunks": len(chunks),
+        "processed_chunks": len(pending),
+        "remaining_chunks": len(chunks) - len(completed),
+        **totals,
+        "cached_translations": len(translations),
+        "elapsed_sec": round(elapsed, 3),
+        "files_per_sec": round(totals["files"] / elapsed, 1) if elapsed else 0.0,
+        "analyses_per_sec": round(totals["analyses"] / elapsed, 1) if elapsed else 0.0
+    }
+    logger.info(
+        f"질문 재생성 완료: 분석 결과 {totals['analyses']}건 ({summary['analyses_per_sec']}건/초), "
+        f"실패 {totals['failures']}개, 남은 청크 {summary['remaining_chunks']}개"
+    )
+    return summary
+
+
+def main() -> None:
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="저장된 분석 결과의 질문을 현재 규칙으로 일괄 재생성합니다.")
+    parser.add_argument("--input", default="analysis_results", help="분석 결과 JSON 파일 디렉토리")
+    parser.add_argument("--output", required=True, help="출력 디렉토리 (체크포인트 포함)")
+    parser.add_argument("--rules", default=settings.QUESTION_RULES_PATH or DEFAULT_RULES_PATH, help="질문 규칙 파일")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="청크당 파일 수")
+    parser.add_argument("--translations-db", default=None, help="영구 번역 캐시 경로")
+    parser.add_argument("--max-chunks", type=int, default=None, help="이번 실행에서 처리할 최대 청크 수")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터 실행")
+    args = parser.parse_args()
+
+    try:
+        summary = regenerate(
+            args.input, args.output, rules_path=args.rules, workers=args.workers,
+            chunk_size=args.chunk_size, translations_db=args.translations_db,
+            max_chunks=args.max_chunks, restart=args.restart
+        )
+    except RegenerationError as e:
+        parser.exit(2, f"{str(e)}\n")
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""질문 생성 규칙 데이터 로더
+
+QUESTION_RULES.md의 원칙을 구현한 단어 매핑, 컨텍스트 분류 키워드, 성취 레이블,
+질문 템플릿을 버전이 있는 JSON 파일(app/rules/question_rules.json)에서 읽어
+조회용 구조로 컴파일합니다. 컴파일된 규칙은 변경할 수 없는 스냅샷이며, 다시 읽을 때는
+새 스냅샷을 만든 뒤 참조만 교체하므로 처리 중인 요청은 시작 시점의 규칙을 그대로 사용합니다.
+"""
+from dataclasses import dataclass
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from app.core.config import settings
+from app.core.context_rules import ContextMatcher
+from app.core.question_dedup import QuestionDeduplicator
+from app.core.question_ranking import QuestionRanker
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SUPPORTED_VERSION = 1
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "rules", "question_rules.json")
+
+# 질문 생성기가 사용하는 컨텍스트 슬롯
+CONTEXT_SLOTS = frozenset((
+    'emotion_positive', 'emotion_negative', 'location', 'activity', 'indoor', 'time_of_day', 'weather'
+))
+
+
+class QuestionLevel(Enum):
+    """질문 난이도 레벨"""
+    BASIC = 1      # 기본 인식/회상
+    CONTEXT = 2    # 맥락/감정
+    REFLECTIVE = 3 # 반성적/통합적
+
+
+class QuestionCategory(Enum):
+    """질문 카테고리"""
+    TEMPORAL = "temporal"      # 시간-순차적
+    SENSORY = "sensory"       # 감각-경험적
+    RELATIONAL = "relational" # 관계-사회적
+    IDENTITY = "identity"     # 정체성-내러티브
+
+
+class QuestionRulesError(Exception):
+    """규칙 파일을 읽거나 검증할 수 없는 경우"""
+
+
+@dataclass(frozen=True)
+class QuestionRules:
+    """컴파일된 질문 규칙 스냅샷"""
+    version: int
+    revision: str
+    checksum: str
+    word_mapping: Mapping[str, str]
+    context_rules: Tuple[Tuple[str, str, Tuple[str, ...]], ...]
+    achievement_labels: FrozenSet[str]
+    question_templates: Mapping[QuestionCategory, Mapping[QuestionLevel, Tuple[str, ...]]]
+    context_matcher: ContextMatcher
+    ranker: QuestionRanker
+    loaded_at: float
+
+    def info(self) -> Dict[str, Any]:
+        """규칙 버전 정보를 반환합니다."""
+        return {
+            "version": self.version,
+            "revision": self.revision,
+            "checksum": self.checksum,
+            "word_mapping": len(self.word_mapping),
+            "templates": sum(len(q) for levels in self.question_templates.values() for q in levels.values()),
+            "loaded_at": self.loaded_at
+        }
+
+
+def compile_rules(data: Dict[str, Any], checksum: str = "") -> QuestionRules:
+    """규칙 데이터를 검증하고 조회용 구조로 컴파일합니다.
+
+    Args:
+        data (Dict[str, Any]): 규칙 파일 내용
+        checksum (str): 규칙 파일 내용의 해시
+
+    Returns:
+        QuestionRules: 컴파일된 규칙 스냅샷
+
+    Raises:
+        QuestionRulesError: 형식이 올바르지 않은 경우
+    """
+    if data.get("version") != SUPPORTED_VERSION:
+        raise QuestionRulesError(f"지원하지 않는 규칙 버전입니다: {data.get('version')}")
+
+    try:
+        word_mapping = {str(k).lower(): str(v) for k, v in data["word_mapping"].items()}
+
+        context_rules = []
+        for rule in data["context_rules"]:
+            if rule["slot"] not in CONTEXT_SLOTS:
+                raise QuestionRulesError(f"알 수 없는 컨텍스트 슬롯입니다: {rule['slot']}")
+            if rule["match"] not in ("exact", "substring"):
+                raise QuestionRulesError(f"알 수 없는 일치 방식입니다: {rule['match']}")
+            context_rules.append((rule["slot"], rule["match"], tuple(k.lower() for k in rule["keywords"])))
+
+        achievement_labels = frozenset(label.lower() for label in data["achievement_labels"])
+
+        question_templates = {}
+        for category in QuestionCategory:
+            levels = data["question_templates"][category.value]
+            question_templates[category] = MappingProxyType({
+                level: tuple(levels[level.name]) for level in QuestionLevel
+            })
+            for level, questions in question_templates[category].items():
+                if not questions or not all(isinstance(q, str) and q for q in questions):
+                    raise QuestionRulesError(f"{category.value}/{level.name} 템플릿이 비어 있습니다.")
+    except (KeyError, TypeError, AttributeError) as e:
+        raise QuestionRulesError(f"규칙 파일 형식이 올바르지 않습니다: {type(e).__name__} {str(e)}")
+
+    templates = [
+        (category.value, level.value, question)
+        for category, levels in question_templates.items()
+        for level, questions in levels.items()
+        for question in questions
+    ]
+    deduplicator = None
+    if settings.QUESTION_DEDUP_ENABLED:
+        deduplicator = QuestionDeduplicator(
+            [question for _, _, question in templates],
+            threshold=settings.QUESTION_DEDUP_THRESHOLD
+        )
+    ranker = QuestionRanker(
+        templates,
+        min_count=settings.QUESTION_MIN_COUNT,
+        max_count=settings.QUESTION_MAX_COUNT,
+        min_score=settings.QUESTION_MIN_SCORE,
+        max_per_category=settings.QUESTION_MAX_PER_CATEGORY,
+        deduplicator=deduplicator
+    )
+
+    return QuestionRules(
+        version=data["version"],
+        revision=str(data.get("revision", "")),
+        checksum=checksum,
+        word_mapping=MappingProxyType(word_mapping),
+        context_rules=tuple(context_rules),
+        achievement_labels=achievement_labels,
+        question_templates=MappingProxyType(question_templates),
+        context_matcher=ContextMatcher(context_rules),
+        ranker=ranker,
+        loaded_at=time.time()
+    )
+
+
+def load_rules(path: str = DEFAULT_RULES_PATH) -> QuestionRules:
+    """규칙 파일을 읽어 컴파일합니다.
+
+    Raises:
+        QuestionRulesError: 파일을 읽을 수 없거나 형식이 올바르지 않은 경우
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw.decode("utf-8"))
+    except (OSError, ValueError) as e:
+        raise QuestionRulesError(f"규칙 파일을 읽을 수 없습니다: {path} ({str(e)})")
+    return compile_rules(data, hashlib.sha256(raw).hexdigest()[:12])
+
+
+class QuestionRuleStore:
+    """규칙 스냅샷을 보관하고 파일이 바뀌면 다시 읽는 저장소
+
+    읽기 측은 current 참조만 읽으므로 잠금이 없습니다. 파일 변경 확인과 다시 읽기는
+    백그라운드 감시 스레드(또는 reload 호출)만 수행하며, 새 규칙 컴파일이 끝난 뒤
+    참조를 교체합니다. 새 규칙이 잘못된 경우 기존 스냅샷을 유지합니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_RULES_PATH, check_interval: float = 0.0):
+        """
+        Args:
+            path (str): 규칙 파일 경로
+            check_interval (float): 감시 스레드의 파일 변경 확인 간격(초), 0 이하이면 자동 확인 안 함
+
+        Raises:
+            QuestionRulesError: 처음 읽은 규칙이 올바르지 않은 경우
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._listeners: List[Callable[[QuestionRules], None]] = []
+        self._mtime = self._stat()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.current: QuestionRules = load_rules(path)
+        logger.info(f"질문 규칙 로드 완료: v{self.current.version} {self.current.revision} ({self.current.checksum})")
+        if check_interval > 0:
+            self._watcher = threading.Thread(target=self._watch, name="question-rules-watcher", daemon=True)
+            self._watcher.start()
+
+    @classmethod
+    def from_settings(cls) -> "QuestionRuleStore":
+        """설정값으로 규칙 저장소를 생성합니다."""
+        return cls(
+            path=settings.QUESTION_RULES_PATH or DEFAULT_RULES_PATH,
+            check_interval=settings.QUESTION_RULES_RELOAD_INTERVAL
+        )
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def subscribe(self, listener: Callable[[QuestionRules], None]) -> None:
+        """규칙이 교체될 때 호출할 함수를 등록합니다."""
+        self._listeners.append(listener)
+
+    def get(self) -> QuestionRules:
+        """현재 규칙 스냅샷을 반환합니다."""
+        return self.current
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            self._check()
+
+    def _check(self) -> None:
+        # reload 호출이 진행 중이면 이번 확인은 건너뜀
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            mtime = self._stat()
+            if mtime is None or mtime == self._mtime:
+                return
+            self._mtime = mtime
+            self._swap()
+        except QuestionRulesError:
+            pass
+        except Exception as e:
+            # 감시 스레드가 종료되지 않도록 예상하지 못한 오류도 기록만 함
+            logger.error(f"질문 규칙 변경 확인 중 오류 발생: {str(e)}")
+        finally:
+            self._reload_lock.release()
+
+    def reload(self) -> QuestionRules:
+        """규칙 파일을 즉시 다시 읽습니다.
+
+        Raises:
+            QuestionRulesError: 새 규칙이 올바르지 않은 경우 (기존 규칙 유지)
+        """
+        with self._reload_lock:
+            self._mtime = self._stat()
+            return self._swap()
+
+    def _swap(self) -> QuestionRules:
+        start = time.perf_counter()
+        try:
+            rules = load_rules(self.path)
+        except QuestionRulesError as e:
+            self.failures += 1
+            self.last_error = str(e)
+            logger.error(f"질문 규칙 다시 읽기 실패, 기존 규칙을 유지합니다: {str(e)}")
+            raise
+        self.current = rules
+        self.reloads += 1
+        self.last_error = None
+        for listener in self._listeners:
+            listener(rules)
+        logger.info(
+            f"질문 규칙 교체 완료: {rules.revision} ({rules.checksum}), "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return rules
+
+    def close(self) -> None:
+        """파일 감시 스레드를 종료합니다."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 규칙과 다시 읽기 통계를 반환합니다."""
+        return {
+            "path": self.path,
+            "current": self.current.info(),
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error
+        }
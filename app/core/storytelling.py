@@ -1,22 +1,83 @@
-import google.generativeai as genai
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
+from collections import Counter
 import os
+import hashlib
+import json
 import logging
-import requests
+import httpx
 from datetime import datetime
+from app.core.cache import LRUCache
 from app.core.config import settings
+from app.core.image_processing import preprocess_image
+from app.core.providers import GenerativeModelPool, use_fake_providers
+from app.core.story_prompt import StoryPromptTemplate
+from app.core.upload import UploadTooLargeError, read_image_stream, sniff_image_type
 from PIL import Image
+import asyncio
 import io
+import time
 import traceback
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _prepare_image(content: bytes, content_type: str) -> Dict[str, Any]:
+    """이미지를 디코딩해 확인하고 Gemini에 보낼 inline 데이터로 만듭니다. (스레드에서 실행)
+
+    PIL 이미지를 그대로 넘기면 SDK가 이벤트 루프에서 다시 인코딩하므로,
+    전처리된(또는 원본) 바이트를 MIME 타입과 함께 전달합니다.
+
+    Args:
+        content (bytes): 내려받은 이미지 바이너리
+        content_type (str): 시그니처로 감지한 MIME 타입
+
+    Returns:
+        Dict[str, Any]: mime_type, data를 담은 Blob 형식 딕셔너리
+    """
+    if settings.IMAGE_PREPROCESS_ENABLED:
+        content, stats = preprocess_image(content)
+        # 재인코딩하지 않고 원본을 반환한 경우가 있으므로 결과 바이트로 타입을 다시 확인
+        content_type = sniff_image_type(content[:16]) or content_type
+        logger.info(f"이미지 전처리 완료: {stats['bytes_saved']} bytes 절감")
+
+    with Image.open(io.BytesIO(content)) as image:
+        logger.info(f"이미지 크기: {image.size}, 포맷: {image.format}")
+    return {"mime_type": content_type, "data": content}
+
+
+def story_cache_key(prompt: str, generation_config: Optional[Dict[str, Any]] = None,
+                    image_hash: Optional[str] = None) -> str:
+    """스토리 결과 캐시 키를 만듭니다.
+
+    같은 모델, 생성 설정, 프롬프트, 이미지 내용이면 같은 키가 됩니다.
+    (media_id는 프롬프트에 포함되지 않으므로 키에도 포함하지 않음)
+
+    Args:
+        prompt (str): create_storytelling_prompt로 만든 프롬프트
+        generation_config (Optional[Dict[str, Any]]): Gemini 생성 설정
+        image_hash (Optional[str]): 이미지 바이너리의 SHA-256 (이미지가 없으면 None)
+
+    Returns:
+        str: SHA-256 16진수 문자열
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([settings.GEMINI_MODEL, generation_config, image_hash],
+                             sort_keys=True, default=str).encode("utf-8"))
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
 class StorytellingGenerator:
 
-    def __init__(self):
-        """초기화 및 API 키 설정"""
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 cache: Optional[LRUCache] = None):
+        """초기화 및 API 키 설정
+
+        Args:
+            transport (Optional[httpx.AsyncBaseTransport]): 이미지 다운로드에 사용할 전송 계층 (테스트용)
+            cache (Optional[LRUCache]): 스토리 결과 캐시 (없으면 설정에 따라 생성)
+        """
         self.api_key = os.getenv("GOOGLE_API_KEY")
 
         if not self.api_key:
@@ -33,111 +94,249 @@ class StorytellingGenerator:
             masked_key = self.api_key[:6] + "..." + self.api_key[-4:] if len(self.api_key) > 8 else "***"
             logger.info(f"API 키 확인: {masked_key}")
 
+        # 정적 지시문을 재사용하는 프롬프트 템플릿
+        self.prompts = StoryPromptTemplate()
+
+        # 모델 이름 + 생성 설정별 모델 객체 풀 (SDK 구성과 연결을 요청 간에 재사용)
+        self.models = GenerativeModelPool(self.api_key, settings.GEMINI_MODEL_POOL_SIZE)
+
+        # 이미지 다운로드용 공유 HTTP 클라이언트 (이벤트 루프별로 처음 사용할 때 생성)
+        self._transport = transport
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 스토리 결과 캐시와 이미지 URL -> 내용 해시 (재요청 시 이미지를 다시 내려받지 않음)
+        if cache is None and settings.STORY_CACHE_ENABLED:
+            cache = LRUCache(settings.STORY_CACHE_MAX_ENTRIES, settings.STORY_CACHE_TTL)
+        self.cache = cache
+        # URL의 내용이 바뀌어도 TTL 동안은 이전 해시를 사용하므로 결과 캐시보다 짧게 유지
+        self.image_hashes: Optional[LRUCache] = None
+        if settings.STORY_IMAGE_HASH_TTL > 0:
+            self.image_hashes = LRUCache(settings.STORY_CACHE_MAX_ENTRIES, settings.STORY_IMAGE_HASH_TTL)
+        self.cache_bypassed = 0
+        self.cache_coalesced = 0
+        # 같은 키로 생성 중인 요청 (생성 중에 들어온 재시도는 Gemini를 다시 호출하지 않고 결과를 기다림)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Gemini 응답의 누적 토큰 사용량 (prompt, cached, output)
+        self.usage: Counter = Counter()
+
+    def warm_up(self) -> None:
+        """Gemini SDK를 구성하고 기본 모델 객체를 미리 만듭니다."""
+        if self.api_key or use_fake_providers():
+            self.models.get(settings.GEMINI_MODEL)
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프에서 재사용할 연결 풀 기반 HTTP 클라이언트를 반환합니다."""
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_loop is not loop or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=settings.STORY_IMAGE_TIMEOUT,
+                limits=httpx.Limits(max_connections=settings.STORY_IMAGE_MAX_CONNECTIONS),
+                follow_redirects=True
+            )
+            self._http_loop = loop
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """이미지 다운로드용 HTTP 클라이언트를 닫습니다."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def _download_image(self, image_url: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """이미지를 내려받아 (Blob 형식 딕셔너리, 원본 SHA-256)을 반환합니다."""
+        max_size = settings.max_image_size_int
+        async with self._get_http_client().stream("GET", image_url) as response:
+            if response.status_code != 200:
+                logger.warning(f"이미지를 가져올 수 없습니다 (상태 코드: {response.status_code})")
+                return None
+            if int(response.headers.get("content-length", 0)) > max_size:
+                raise UploadTooLargeError(f"이미지 크기가 {max_size} bytes를 넘었습니다.")
+            upload = await read_image_stream(response.aiter_bytes(), max_size)
+        if self.image_hashes is not None:
+            self.image_hashes.set(image_url, upload.sha256)
+        image = await asyncio.to_thread(_prepare_image, upload.content, upload.content_type)
+        return image, upload.sha256
+
+    async def fetch_image(self, image_url: str) -> Optional[Dict[str, Any]]:
+        """이미지를 스트리밍으로 내려받아 Gemini에 보낼 inline 데이터로 만듭니다.
+
+        크기 제한(MAX_IMAGE_SIZE)을 넘으면 내려받는 도중 중단하고,
+        디코딩과 전처리는 이벤트 루프 밖에서 실행합니다.
+
+        Args:
+            image_url (str): 이미지 URL
+
+        Returns:
+            Optional[Dict[str, Any]]: Blob 형식 딕셔너리, 응답 상태 코드가 200이 아니면 None
+
+        Raises:
+            UploadTooLargeError: 이미지 크기가 제한을 넘은 경우
+            UnsupportedImageError: 이미지 시그니처를 인식할 수 없는 경우
+            httpx.HTTPError: 연결 실패 또는 제한 시간 초과
+        """
+        downloaded = await self._download_image(image_url)
+        return downloaded[0] if downloaded else None
+
+    async def _prepare_story(self, prompt: str, image_url: Optional[str],
+                             options: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]],
+                                                                         Optional[str],
+                                                                         Optional[Dict[str, Any]]]:
+        """이미지를 준비하고 스토리 결과 캐시를 조회합니다.
+
+        이미 본 이미지 URL은 기록된 내용 해시로 먼저 조회하므로, 캐시 적중 시 이미지를 내려받지 않습니다.
+        URL의 내용이 바뀌었는지는 확인하지 않으므로, 해시 기록이 유지되는 STORY_IMAGE_HASH_TTL 동안은
+        같은 URL에 대해 이전 이미지로 만든 스토리가 반환될 수 있습니다.
+        이미지를 가져오지 못해 텍스트만으로 생성하는 경우에는 캐시에 저장하지 않습니다.
+
+        Args:
+            prompt (str): 스토리 프롬프트
+            image_url (Optional[str]): 이미지 URL
+            options (Optional[Dict[str, Any]]): 요청 옵션 (regenerate=true이면 캐시 무시)
+
+        Returns:
+            Tuple: (Blob 형식 이미지 또는 None, 캐시 키 또는 None, 캐시된 결과 또는 None)
+        """
+        generation_config = options.get("generation_config") if options else None
+        use_cache = self.cache is not None
+        if use_cache and options and options.get("regenerate"):
+            self.cache_bypassed += 1
+            use_cache = False
+
+        key = None
+        if use_cache:
+            image_hash = self.image_hashes.get(image_url) if image_url and self.image_hashes is not None else None
+            if not image_url or image_hash:
+                key = story_cache_key(prompt, generation_config, image_hash)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return None, key, cached
+
+        image = None
+        if image_url:
+            # 이미지 데이터 가져오기
+            logger.info(f"이미지 URL이 제공되었습니다: {image_url}")
+            try:
+                downloaded = await self._download_image(image_url)
+            except Exception as img_error:
+                # 이미지 처리 오류시 상세 로깅 후 텍스트만으로 진행
+                logger.error(f"이미지 처리 중 오류 발생: {str(img_error)}")
+                logger.error(traceback.format_exc())
+                downloaded = None
+            if downloaded is None:
+                return None, None, None
+            image, image_hash = downloaded
+            if use_cache:
+                # 내려받은 내용의 해시로 키를 다시 만듦 (URL의 이미지가 바뀌었으면 기억된 해시와 다름)
+                downloaded_key = story_cache_key(prompt, generation_config, image_hash)
+                if downloaded_key != key:
+                    key = downloaded_key
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        return None, key, cached
+        return image, key, None
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """스토리 결과 캐시 통계를 반환합니다. 캐시를 사용하지 않으면 None을 반환합니다."""
+        if self.cache is None:
+            return None
+        return {**self.cache.stats(), "bypassed": self.cache_bypassed, "coalesced": self.cache_coalesced}
+
     def create_storytelling_prompt(self, questions: List[Dict[str, Any]],
                                    answers: List[Dict[str, Any]],
                                    options: Optional[Dict[str, Any]] = None) -> str:
-        """프롬프트 생성 메서드 """ # 기존 주석 유지
-
-        style = options.get("style", "warmly reflective") if options else "warmly reflective"
-        length = options.get("length", "medium") if options else "medium"
-        length_desc = {
-            "short": "약 150-250자",
-            "medium": "약 300-500자",
-            "long": "약 500-700자"
-        }.get(length, "약 300-500자")
-
-        categorized_qa = {}
-        for q in questions:
-            category = q.get("category", "general")
-            if category not in categorized_qa:
-                categorized_qa[category] = []
-
-            q_id = q.get("id")
-            answer_text = "답변 없음"
-            for a in answers:
-                if a.get("id") == q_id:
-                    answer_text = a.get("content", "답변 없음")
-                    break
-
-            categorized_qa[category].append({
-                "question": q.get("content", ""),
-                "answer": answer_text,
-                "level": q.get("level", 1),
-                "theme": q.get("theme", "general")
-            })
-
-        # << 프롬프트 내용 수정 시작 >>
-        prompt = f"""# 스토리텔링 생성 요청: **주어진 정보에 기반한** 사진 속 기억 재구성
-
-## **Core Task (핵심 임무):**
-주어진 사진 이미지와 사용자의 질문-답변(Q&A) 내용을 **정확히** 분석하여, 단순한 정보 나열이 아닌 **사용자의 소중한 추억을 따뜻하고 의미 있게, 그리고 사실에 기반하여** 재구성하는 감성 스토리텔링을 생성합니다. 목표는 사용자가 그 순간의 감정과 의미를 **제공된 정보를 바탕으로** 다시 느낄 수 있도록 돕는 것입니다.
-
-## **Crucial Grounding Rules (매우 중요한 준수 사항 - 반드시 지키세요!):**
-1.  **Factuality First (사실 우선 원칙):** 생성되는 모든 내용은 **반드시 제공된 질문-답변(Q&A) 내용과 사진 이미지에 명확히 나타난 정보에 근거해야 합니다.**
-2.  **No Fabrication (내용 조작 절대 금지):** Q&A나 이미지에 **언급되거나 명시되지 않은 새로운 인물, 사건, 구체적인 장소, 대화 내용 등을 절대로 임의로 만들어내거나 추측하여 추가하지 마십시오.** 이는 사용자의 실제 기억과 다를 수 있으며, 서비스의 신뢰도를 저해합니다.
-3.  **Stick to Provided Information (제공된 정보 내에서만 서술):** 답변이 짧거나 정보가 부족하더라도, **있는 정보를 최대한 활용하여 감성을 표현하되, 없는 사실을 상상하거나 지어내서는 안 됩니다.** 만약 Q&A 정보가 너무 부족하여 의미 있는 스토리 구성이 어렵다면, 주어진 정보만을 간결하게 요약하고 따뜻한 감상을 덧붙이는 선에서 마무리하십시오. 절대 없는 이야기를 만들지 마십시오.
-
-## **Input Analysis Guidance (입력 분석 가이드):**
-
-1.  **Image Analysis (이미지 분석 - Q&A 보조 역할):**
-    *   사진의 전체적인 분위기(예: 행복, 평온, 활기참, 그리움)를 파악하세요. **(단, 이는 Q&A 내용과 모순되지 않는 선에서, Q&A 내용을 뒷받침하는 근거로만 활용되어야 합니다.)**
-    *   주요 인물의 표정, 시선, 자세를 관찰하고 감정을 추론하세요. **(추론은 반드시 Q&A 내용을 보강하거나 설명하는 방향으로 이루어져야 하며, Q&A에 없는 새로운 감정을 부여하지 마십시오.)**
-    *   배경(장소, 시간대, 계절)과 주요 사물(특별한 의미가 있을 수 있는 것)을 주의 깊게 보세요.
-    *   이 시각적 정보들은 스토리의 **보조적인 묘사 수단**으로 활용하되, **Q&A 내용이 주된 정보 근거가 되어야 합니다.**
-
-2.  **Q&A Deep Dive (Q&A 심층 분석 및 활용 원칙 - 가장 중요!):**
-    *   각 답변에서 사용자가 강조하는 **핵심 감정, 인물, 장소, 사건**을 정확히 파악하여 이를 스토리의 중심으로 삼으세요.
-    *   답변들 사이의 연관성을 찾아 **제공된 정보 내에서만 해석 가능한** 이야기나 주제를 발견하세요.
-    *   질문의 'theme'이나 'category'를 참고하여 답변의 맥락을 더 깊이 이해하고, 이를 스토리에 반영하세요.
-    *   **답변이 짧거나 추상적이더라도, 이미지 정보를 보조적으로 활용하여 구체적인 장면이나 감정으로 확장할 수 있습니다. 그러나 이는 반드시 Q&A에서 벗어나지 않는 범위 내에서, Q&A 내용을 설명하거나 구체화하는 방식으로만 이루어져야 합니다. (예: Q&A에 "즐거웠다"는 답변이 있고 사진이 웃는 모습이라면, "사진 속 환한 미소는 그때의 즐거움을 말해주는 듯합니다" 와 같이 표현하십시오. "갑자기 친구가 나타나서 즐거웠다" 와 같이 Q&A에 없는 새로운 사건을 만들지 마십시오.)**
-
-## **Narrative Crafting Instructions (스토리 구성 지침):**
-
-1.  **Find the Emotional Core (Q&A 기반 감정의 핵 찾기):** 스토리의 중심이 될 **가장 중요한 감정이나 의미를 Q&A에서** 찾아 명확히 하세요.
-2.  **Weave Image and Text Seamlessly (사실 기반 이미지와 텍스트 결합):** 사진 속 시각적 요소(색감, 빛, 사물, 인물의 모습 등)를 묘사하며, 이를 사용자의 **답변 내용과 사실에 부합하도록, 그리고 Q&A 내용을 뒷받침하도록 자연스럽게 연결**하세요.
-3.  **Show, Don't Just Tell (Q&A 내용 구체화로 보여주기):** '행복했다'고 답변했다면, 그 행복이 사진 속 어떤 모습으로 드러나는지, 또는 답변의 어떤 구체적인 표현이나 뉘앙스에서 느껴지는지 등을 묘사하여 **Q&A의 감정을 생생하게 보여주세요.**
-4.  **Sensory Richness (제한적 감각 묘사 허용):** 시각 정보 외에 그 순간에 있었을 법한 소리, 냄새, 촉감 등을 상상하여 생생함을 더할 수 있습니다. 단, **이는 Q&A 내용이나 이미지에서 충분히 유추 가능하고 일반적인 상황에 국한되어야 합니다. (예: 바다 사진 -> '짭짤한 바다 내음이 느껴지는 듯합니다', 숲 사진 -> '고요한 숲 속 새소리가 들리는 듯합니다' 등. 특정 인물의 목소리, 특별한 음악, 구체적인 대화 내용 등은 Q&A에 명시적으로 언급되지 않았다면 절대 추가하지 마십시오.)**
-5.  **Meaningful Reflection (Q&A 중심의 의미 있는 성찰):** 스토리 끝에는 **Q&A를 통해 드러난** 그 기억이 사용자에게 어떤 의미를 지니는지, 혹은 그날의 감정이 현재까지 어떻게 이어지는지에 대한 짧고 따뜻한 성찰이나 여운을 남겨주세요. **이 역시 Q&A 내용에 기반해야 합니다.**
-6.  **Perspective & Tone (시점과 어조):**
-    *   **스타일:** `{style}` (예: 따뜻하고 회상적인, 공감적이고 다정한, 약간은 아련한). **사용자의 답변 어투와 감정을 존중하며, 과장되지 않고 진솔한** 긍정적이고 부드러운 어조를 유지하세요.
-    *   **시점:** 1인칭('나' 또는 '우리') 또는 사용자에게 말을 거는 듯한 2인칭('당신은', '기억하나요?')이나 따뜻한 3인칭 서술자 시점을 유연하게 사용하되, **일관성**을 유지하세요. 사용자의 답변 뉘앙스에 가장 잘 어울리는 시점을 선택하세요.
-
-## **Output Specifications (출력 명세):**
-
-*   **길이:** `{length_desc}` 로 작성해주세요.
-*   **형식:** 제목 없이, 마크다운 서식(예: `#`, `*`)을 사용하지 않은 **일반 텍스트**로만 작성해주세요.
-*   **가독성:** 자연스러운 단락 구분을 사용하여 읽기 편하게 구성해주세요.
-*   **내용:** **오직 제공된 Q&A와 이미지에 명시적으로 기반한** 긍정적이고 감동을 줄 수 있는 내용에 초점을 맞추세요. **절대로 정보를 추가하거나 왜곡하거나 없는 이야기를 지어내지 마세요. 이것이 가장 중요한 원칙입니다.**
-
-## **피해야 할 스토리텔링 예시 (환각 및 조작 예시):**
-
-### 예시 1: 언급되지 않은 인물/사건 추가 (Q&A 위반)
-*   [Q: 가장 기억에 남는 순간은? A: 졸업식 날 친구들과 사진 찍은 것]
-*   [Image: 졸업식 단체 사진]
-*   **잘못된 스토리 (환각):** 졸업식 날, 교장 선생님께서 깜짝 등장하셔서 모두에게 선물을 나눠주셨죠. 그리고 우리는 다 같이 교가를 불렀습니다. (-> 교장 선생님의 등장, 선물, 교가 등은 Q&A나 이미지에 없는 내용)
-*   **올바른 접근:** 졸업식 날, 사진 속 친구들과 함께 환하게 웃던 그 순간의 벅찬 감정과 설렘이 고스란히 전해집니다. 함께 했던 소중한 시간들이 주마등처럼 스쳐 지나가는 듯합니다.
-
-### 예시 2: Q&A와 무관한 과도한 상상 (Q&A 위반)
-*   [Q: 이 장소에서 무엇을 했나요? A: 조용히 산책했어요.]
-*   [Image: 숲길 사진]
-*   **잘못된 스토리 (환각):** 이 신비로운 숲길에서 당신은 길을 잃고 헤매다 우연히 숨겨진 폭포를 발견했을지도 모릅니다. 그곳에서 소원을 빌었을 수도 있고요.
-*   **올바른 접근:** 사진 속 고요하고 아름다운 숲길은 당신이 즐겼던 평화로운 산책의 순간을 떠올리게 합니다. 발밑의 낙엽 소리와 맑은 공기가 느껴지는 듯합니다.
-
-## **질문과 답변 정보 (이 정보를 절대 벗어나거나 왜곡하지 마십시오):**
-다음은 분석에 사용할 질문과 답변입니다. 여기에 없는 내용은 절대로 스토리에 포함시키지 마십시오.
-
-"""
-        # << 프롬프트 내용 수정 끝 >>
-
-        for category, qa_list in categorized_qa.items():
-            prompt += f"\n### {category.upper()} 카테고리\n"
-            for qa in qa_list:
-                prompt += f"- 질문 ({qa['theme'] if qa.get('theme') else 'general'} / Level {qa['level']}): {qa['question']}\n"
-                prompt += f"  답변: {qa['answer']}\n"
+        """프롬프트 생성 메서드
+
+        지시문은 (style, length)별로 미리 만든 것을 재사용하고 질문-답변 부분만 새로 조립합니다.
+        (app.core.story_prompt 참고)
+        """
+        return self.prompts.render(questions, answers, options)
+
+    async def _model_for(self, prefix: str, body: str,
+                         options: Optional[Dict[str, Any]]) -> Tuple[Any, str]:
+        """요청에 사용할 모델과 보낼 프롬프트를 반환합니다.
+
+        컨텍스트 캐시를 사용할 수 있으면 지시문이 등록된 모델과 질문-답변 부분만,
+        아니면 일반 모델과 전체 프롬프트를 반환합니다.
+        """
+        # 풀에서 모델 객체 재사용 (SDK 구성은 처음 한 번만 수행)
+        generation_config = options.get("generation_config") if options else None
+        if settings.GEMINI_CONTEXT_CACHE_ENABLED:
+            model = await asyncio.to_thread(
+                self.models.get_cached, settings.GEMINI_MODEL, prefix,
+                generation_config, settings.GEMINI_CONTEXT_CACHE_TTL
+            )
+            if model is not None:
+                return model, body
+        return self.models.get(settings.GEMINI_MODEL, generation_config), prefix + body
+
+    def _record_usage(self, usage_metadata: Any) -> None:
+        """응답의 토큰 사용량을 누적합니다."""
+        if not usage_metadata:
+            return
+        self.usage["requests"] += 1
+        self.usage["prompt_tokens"] += getattr(usage_metadata, "prompt_token_count", 0) or 0
+        self.usage["cached_tokens"] += getattr(usage_metadata, "cached_content_token_count", 0) or 0
+        self.usage["output_tokens"] += getattr(usage_metadata, "candidates_token_count", 0) or 0
+
+    def usage_stats(self) -> Dict[str, Any]:
+        """누적 토큰 사용량과 프롬프트 지시문 재사용 통계를 반환합니다."""
+        prompt_tokens = self.usage["prompt_tokens"]
+        return {
+            **{name: self.usage[name] for name in ("requests", "prompt_tokens", "cached_tokens", "output_tokens")},
+            "cached_ratio": self.usage["cached_tokens"] / prompt_tokens if prompt_tokens else 0.0,
+            "prompt_prefixes": self.prompts.stats()
+        }
+
+    async def _call_with_fallback(self, call: Callable[[Any], Awaitable[Any]], prompt: str,
+                                  image: Optional[Dict[str, Any]]) -> Tuple[Any, bool]:
+        """이미지를 포함해 Gemini를 호출하고, 실패하면 텍스트만으로 다시 호출합니다.
+
+        Args:
+            call (Callable[[Any], Awaitable[Any]]): contents를 받아 Gemini를 호출하는 함수
+            prompt (str): 보낼 프롬프트
+            image (Optional[Dict[str, Any]]): Blob 형식 이미지 (없으면 텍스트만 전송)
+
+        Returns:
+            Tuple[Any, bool]: (call의 결과, 이미지 포함 여부)
+
+        Raises:
+            Exception: 텍스트만으로 다시 호출해도 실패한 경우
+        """
+        if image is not None:
+            try:
+                # 단순 내용 전송 (텍스트와 이미지)
+                return await call([prompt, image]), True
+            except Exception as img_error:
+                # 이미지 포함 호출 오류시 상세 로깅 후 텍스트만으로 재시도
+                logger.error(f"이미지 포함 스토리 생성 중 오류 발생: {str(img_error)}")
+                logger.error(traceback.format_exc())
+        return await call(prompt), False
 
-        prompt += "\n---\n**이제 위의 모든 가이드라인, 특히 'Crucial Grounding Rules'와 '피해야 할 스토리텔링 예시'를 엄격히 준수하여, 오직 제공된 이미지와 Q&A 정보만을 바탕으로 사실에 기반한 감동적인 스토리텔링을 작성해주세요. 다시 한번 강조합니다: 절대로 제공된 정보 외의 내용을 추가하거나 지어내지 마십시오. 사용자의 실제 기억을 존중하는 것이 가장 중요합니다.**"
+    async def _generate(self, prefix: str, body: str, image: Optional[Dict[str, Any]],
+                        options: Optional[Dict[str, Any]]) -> Tuple[str, bool]:
+        """Gemini로 스토리를 생성합니다. 이미지 포함 호출이 실패하면 텍스트만으로 재시도합니다.
 
-        return prompt
+        Returns:
+            Tuple[str, bool]: (스토리, 이미지 포함 여부)
+        """
+        try:
+            model, prompt = await self._model_for(prefix, body, options)
+            response, with_image = await self._call_with_fallback(model.generate_content_async, prompt, image)
+            story_content = response.text
+            self._record_usage(getattr(response, "usage_metadata", None))
+            if with_image:
+                logger.info(f"스토리 생성 완료 (이미지 포함): {len(story_content)} 자")
+            else:
+                logger.info(f"텍스트만으로 스토리 생성 완료: {len(story_content)} 자")
+            return story_content, with_image
+
+        except Exception as api_error:
+            logger.error(f"Gemini API 호출 중 오류 발생: {str(api_error)}")
+            logger.error(traceback.format_exc())
+            raise Exception(f"Gemini API 호출 실패: {str(api_error)}")
 
     async def generate_story(self, media_id: int,
                             questions: List[Dict[str, Any]],
@@ -151,73 +350,51 @@ class StorytellingGenerator:
             # API 키 설정
             api_key = self.api_key
 
-            if not api_key:
+            if not api_key and not use_fake_providers():
                 logger.error("API 키가 설정되지 않았습니다")
                 raise Exception("API 키가 설정되지 않았습니다")
 
-            # 프롬프트 생성
-            prompt = self.create_storytelling_prompt(questions, answers, options)
-            logger.info(f"프롬프트 생성 완료: {len(prompt)} 자")
-
-            # 가장 기본적인 방식으로 Gemini API 설정
+            # 프롬프트 생성 (정적 지시문 + 질문-답변 부분)
+            prefix, body = self.prompts.split(questions, answers, options)
+            prompt = prefix + body
+            logger.info(f"프롬프트 생성 완료: {len(prompt)} 자 (지시문 {len(prefix)} 자)")
+
+            # 같은 프롬프트와 이미지로 만든 스토리가 있으면 Gemini 호출 없이 반환
+            image, cache_key, cached = await self._prepare_story(prompt, image_url, options)
+            if cached is not None:
+                logger.info(f"캐시된 스토리 반환: {len(cached['story_content'])} 자")
+                return {**cached, "media_id": media_id}
+
+            pending = self._inflight.get(cache_key) if cache_key else None
+            if pending is not None:
+                # 같은 요청이 생성 중이면 그 결과를 기다림 (실패하면 직접 생성)
+                self.cache_coalesced += 1
+                result = await asyncio.shield(pending)
+                if result is not None:
+                    return {**result, "media_id": media_id}
+            elif cache_key:
+                pending = asyncio.get_running_loop().create_future()
+                self._inflight[cache_key] = pending
+
+            result = None
             try:
-                # SDK 구성
-                genai.configure(api_key=api_key)
-                logger.info("Gemini API 구성 완료")
-
-                # 최대한 단순화된 방식으로 호출
-                if image_url:
-                    try:
-                        # 이미지 데이터 가져오기
-                        logger.info(f"이미지 URL이 제공되었습니다: {image_url}")
-                        image_response = requests.get(image_url, timeout=10)
-
-                        if image_response.status_code == 200:
-                            # 이미지 데이터를 PIL Image로 변환
-                            image = Image.open(io.BytesIO(image_response.content))
-                            logger.info(f"이미지 크기: {image.size}, 포맷: {image.format}")
-
-                            # 모델 초기화 (가장 기본적인 설정)
-                            model = genai.GenerativeModel('gemini-1.5-flash')
-
-                            # 단순 내용 전송 (텍스트와 이미지)
-                            response = await model.generate_content_async([prompt, image]) # async로 호출하려면 await 추가
-                            story_content = response.text
-                            logger.info(f"스토리 생성 완료 (이미지 포함): {len(story_content)} 자")
-                        else:
-                            # 이미지 로드 실패시 텍스트만으로 진행
-                            logger.warning(f"이미지를 가져올 수 없습니다 (상태 코드: {image_response.status_code})")
-                            model = genai.GenerativeModel('gemini-1.5-flash')
-                            response = await model.generate_content_async(prompt) # async로 호출하려면 await 추가
-                            story_content = response.text
-                            logger.info(f"스토리 생성 완료 (텍스트만): {len(story_content)} 자")
-                    except Exception as img_error:
-                        # 이미지 처리 오류시 상세 로깅 후 텍스트만으로 재시도
-                        logger.error(f"이미지 처리 중 오류 발생: {str(img_error)}")
-                        logger.error(traceback.format_exc())
-                        model = genai.GenerativeModel('gemini-1.5-flash')
-                        response = await model.generate_content_async(prompt) # async로 호출하려면 await 추가
-                        story_content = response.text
-                        logger.info(f"이미지 없이 텍스트만으로 스토리 생성 완료: {len(story_content)} 자")
-                else:
-                    # 텍스트만 있는 경우 단순 처리
-                    model = genai.GenerativeModel('gemini-1.5-flash')
-                    response = await model.generate_content_async(prompt) # async로 호출하려면 await 추가
-                    story_content = response.text
-                    logger.info(f"텍스트만으로 스토리 생성 완료: {len(story_content)} 자")
-
-            except Exception as api_error:
-                logger.error(f"Gemini API 호출 중 오류 발생: {str(api_error)}")
-                logger.error(traceback.format_exc())
-                raise Exception(f"Gemini API 호출 실패: {str(api_error)}")
+                story_content, with_image = await self._generate(prefix, body, image, options)
+                result = {
+                    "status": "success",
+                    "media_id": media_id,
+                    "story_content": story_content,
+                    "created_at": datetime.now().isoformat()
+                }
+                # 이미지 없이 대체 생성한 결과는 이미지 키로 캐시하지 않음
+                if cache_key and (image is None or with_image):
+                    self.cache.set(cache_key, result)
+            finally:
+                if cache_key and self._inflight.get(cache_key) is pending:
+                    del self._inflight[cache_key]
+                    pending.set_result(result)
 
             # 응답 구성
-            return {
-                "status": "success",
-                "media_id": media_id,
-                "story_content": story_content,
-                "created_at": datetime.now().isoformat()
-            }
+            return result
 
         except Exception as e:
             logger.error(f"스토리 생성 중 오류 발생: {str(e)}")
@@ -227,4 +404,79 @@ class StorytellingGenerator:
                 "media_id": media_id,
                 "message": str(e),
                 "created_at": datetime.now().isoformat()
-            }
\ No newline at end of file
+            }
+
+    async def stream_story(self, media_id: int,
+                           questions: List[Dict[str, Any]],
+                           answers: List[Dict[str, Any]],
+                           image_url: Optional[str] = None,
+                           options: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Gemini 스트리밍 API로 스토리를 생성하며 받은 텍스트 조각을 순서대로 반환합니다.
+
+        이미지를 가져오지 못하거나 이미지 포함 요청이 실패하면 generate_story와 같이
+        텍스트만으로 생성하고, 캐시된 스토리가 있으면 한 조각으로 바로 반환합니다.
+
+        Args:
+            media_id (int): 미디어 ID
+            questions (List[Dict[str, Any]]): 질문 목록
+            answers (List[Dict[str, Any]]): 답변 목록
+            image_url (Optional[str]): 이미지 URL
+            options (Optional[Dict[str, Any]]): style, length, generation_config, regenerate 옵션
+
+        Yields:
+            str: 스토리 텍스트 조각
+
+        Raises:
+            Exception: API 키가 없거나 Gemini 호출이 실패한 경우
+        """
+        logger.info(f"미디어 ID {media_id}에 대한 스트리밍 스토리 생성 시작")
+        if not self.api_key and not use_fake_providers():
+            logger.error("API 키가 설정되지 않았습니다")
+            raise Exception("API 키가 설정되지 않았습니다")
+
+        prefix, body = self.prompts.split(questions, answers, options)
+        image, cache_key, cached = await self._prepare_story(prefix + body, image_url, options)
+        if cached is not None:
+            logger.info(f"캐시된 스토리 반환: {len(cached['story_content'])} 자")
+            yield cached["story_content"]
+            return
+
+        model, prompt = await self._model_for(prefix, body, options)
+
+        start = time.perf_counter()
+        first_chunk_ms = None
+        parts = []
+        usage_metadata = None
+        try:
+            # 스트림 요청(첫 조각 수신 포함)이 이미지 때문에 실패하면 generate_story와 같이 텍스트만으로 재시도
+            response, with_image = await self._call_with_fallback(
+                lambda contents: model.generate_content_async(contents, stream=True), prompt, image
+            )
+            async for chunk in response:
+                # 사용량은 마지막 조각에 담겨 옴
+                usage_metadata = getattr(chunk, "usage_metadata", None) or usage_metadata
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # 종료 사유만 담긴 조각 등 텍스트가 없는 조각은 건너뜀
+                    continue
+                if not text:
+                    continue
+                if first_chunk_ms is None:
+                    first_chunk_ms = (time.perf_counter() - start) * 1000
+                parts.append(text)
+                yield text
+        except Exception as api_error:
+            logger.error(f"Gemini API 스트리밍 호출 중 오류 발생: {str(api_error)}")
+            raise Exception(f"Gemini API 호출 실패: {str(api_error)}")
+
+        self._record_usage(usage_metadata)
+        if cache_key and (image is None or with_image):
+            self.cache.set(cache_key, {
+                "status": "success",
+                "media_id": media_id,
+                "story_content": "".join(parts),
+                "created_at": datetime.now().isoformat()
+            })
+        total_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"스트리밍 스토리 생성 완료: {sum(map(len, parts))} 자 (첫 조각 {first_chunk_ms or 0:.1f}ms, 전체 {total_ms:.1f}ms)")
@@ -0,0 +1,241 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SQLiteTranslationStore:
+    """번역 결과와 사용 빈도를 SQLite 파일에 저장하는 영구 계층"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): SQLite 데이터베이스 파일 경로
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "source TEXT PRIMARY KEY, translated TEXT NOT NULL, "
+            "uses INTEGER NOT NULL DEFAULT 0, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, source: str) -> Optional[str]:
+        """저장된 번역을 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translated FROM translations WHERE source = ?", (source,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, source: str, translated: str) -> None:
+        """번역을 저장합니다. 기존 사용 빈도는 유지합니다."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO translations (source, translated, uses, updated_at) VALUES (?, ?, 0, ?) "
+                "ON CONFLICT(source) DO UPDATE SET translated = excluded.translated, "
+                "updated_at = excluded.updated_at",
+                (source, translated, time.time())
+            )
+            self._conn.commit()
+
+    def add_uses(self, uses: Dict[str, int]) -> None:
+        """누적된 사용 횟수를 한 번의 트랜잭션으로 반영합니다."""
+        if not uses:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE translations SET uses = uses + ? WHERE source = ?",
+                [(count, source) for source, count in uses.items()]
+            )
+            self._conn.commit()
+
+    def top(self, limit: int) -> List[Tuple[str, str, int]]:
+        """사용 빈도가 높은 순으로 (원문, 번역, 사용 횟수)를 반환합니다."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT source, translated, uses FROM translations "
+                "ORDER BY uses DESC, source LIMIT ?", (limit,)
+            ).fetchall()
+
+    def items(self) -> Dict[str, str]:
+        """저장된 번역 전체를 {원문: 번역}으로 반환합니다."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT source, translated FROM translations").fetchall())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def close(self) -> None:
+        """데이터베이스 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+
+class TranslationMemo:
+    """레이블 번역 결과를 기억하는 다단계 캐시
+
+    조회 순서는 정적 매핑(word_mapping) -> 메모리 LRU -> SQLite 영구 저장소입니다.
+    모두 없을 때만 호출 측이 Translation API를 사용하고 결과를 set()으로 등록합니다.
+    키는 소문자 영어 원문입니다.
+    """
+
+    def __init__(self, seed: Optional[Dict[str, str]] = None,
+                 max_entries: int = 4096, db_path: str = "", flush_every: int = 100):
+        """
+        Args:
+            seed (Optional[Dict[str, str]]): 항상 적중하는 정적 번역 매핑
+            max_entries (int): 메모리 캐시 최대 항목 수
+            db_path (str): 영구 저장소 파일 경로 (빈 문자열이면 사용하지 않음)
+            flush_every (int): 사용 빈도를 디스크에 반영할 조회 간격
+        """
+        self.static: Dict[str, str] = {k.lower(): v for k, v in (seed or {}).items()}
+        self.memory = LRUCache(max_entries, 0)
+        self.disk: Optional[SQLiteTranslationStore] = None
+        self.flush_every = flush_every
+        self._pending_uses: Counter = Counter()
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self.static_hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if db_path:
+            try:
+                self.disk = SQLiteTranslationStore(db_path)
+                logger.info(f"영구 번역 캐시를 사용합니다: {db_path} ({len(self.disk)}개)")
+            except Exception as e:
+                logger.warning(f"영구 번역 캐시 초기화 실패, 메모리 캐시만 사용합니다: {str(e)}")
+
+    @classmethod
+    def from_settings(cls, seed: Optional[Dict[str, str]] = None) -> "TranslationMemo":
+        """설정값으로 번역 캐시를 생성합니다."""
+        return cls(
+            seed=seed,
+            max_entries=settings.TRANSLATION_CACHE_MAX_ENTRIES,
+            db_path=settings.TRANSLATION_CACHE_DB_PATH,
+            flush_every=settings.TRANSLATION_CACHE_FLUSH_EVERY
+        )
+
+    def get(self, text: str) -> Optional[str]:
+        """번역을 조회합니다. 어느 계층에도 없으면 None을 반환합니다."""
+        key = text.lower()
+        translated = self.static.get(key)
+        if translated is not None:
+            self.static_hits += 1
+            return translated
+
+        translated = self.memory.get(key)
+        if translated is not None:
+            self.memory_hits += 1
+        elif self.disk is not None:
+            try:
+                translated = self.disk.get(key)
+            except Exception as e:
+                logger.warning(f"영구 번역 캐시 조회 실패: {str(e)}")
+            if translated is not None:
+                # 디스크 적중 결과를 메모리 계층으로 승격
+                self.memory.set(key, translated)
+                self.disk_hits += 1
+
+        if translated is None:
+            self.misses += 1
+            return None
+        self._count_use(key)
+        return translated
+
+    def set(self, text: str, translated: str) -> None:
+        """API로 얻은 번역을 모든 계층에 저장합니다."""
+        key = text.lower()
+        self.memory.set(key, translated)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, translated)
+            except Exception as e:
+                logger.warning(f"영구 번역 캐시 저장 실패: {str(e)}")
+        self._count_use(key)
+
+    def _count_use(self, key: str) -> None:
+        with self._lock:
+            self._pending_uses[key] += 1
+            self._pending_count += 1
+            pending = self._pending_count
+        if pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """누적된 사용 빈도를 영구 저장소에 반영합니다."""
+        with self._lock:
+            uses, self._pending_uses = self._pending_uses, Counter()
+            self._pending_count = 0
+        if self.disk is None or not uses:
+            return
+        try:
+            self.disk.add_uses(uses)
+        except Exception as e:
+            logger.warning(f"번역 사용 빈도 저장 실패: {str(e)}")
+
+    def export_top(self, limit: int = 50) -> Dict[str, str]:
+        """자주 쓰인 번역 중 정적 매핑에 없는 항목을 반환합니다.
+
+        결과를 word_mapping에 옮기면 다음 배포부터 캐시 조회 없이 번역됩니다.
+
+        Args:
+            limit (int): 최대 항목 수
+
+        Returns:
+            Dict[str, str]: 사용 빈도 순 {영어 원문: 번역}
+        """
+        self.flush()
+        if self.disk is None:
+            return {}
+        rows = [row for row in self.disk.top(limit + len(self.static)) if row[0] not in self.static]
+        return {source: translated for source, translated, _ in rows[:limit]}
+
+    def stats(self) -> Dict[str, object]:
+        """계층별 적중 통계를 반환합니다."""
+        lookups = self.static_hits + self.memory_hits + self.disk_hits + self.misses
+        return {
+            "static_entries": len(self.static),
+            "memory": self.memory.stats(),
+            "disk_entries": len(self.disk) if self.disk is not None else None,
+            "static_hits": self.static_hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0
+        }
+
+
+def main() -> None:
+    """자주 쓰인 번역을 word_mapping에 붙여넣을 수 있는 JSON으로 출력합니다."""
+    parser = argparse.ArgumentParser(description="영구 번역 캐시에서 자주 쓰인 번역을 내보냅니다.")
+    parser.add_argument("--db", default=settings.TRANSLATION_CACHE_DB_PATH, help="번역 캐시 파일 경로")
+    parser.add_argument("--limit", type=int, default=50, help="최대 항목 수")
+    args = parser.parse_args()
+
+    memo = TranslationMemo(db_path=args.db)
+    print(json.dumps(memo.export_top(args.limit), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
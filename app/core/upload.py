@@ -0,0 +1,181 @@
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Optional
+import hashlib
+import json
+import logging
+from fastapi import UploadFile
+from app.core.config import settings
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 파일 시그니처(매직 바이트) -> MIME 타입
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+_HEIF_BRANDS = (b"heic", b"heix", b"hevc", b"heim", b"heis", b"mif1", b"msf1", b"avif")
+
+
+class UploadTooLargeError(Exception):
+    """업로드 크기가 제한을 넘은 경우"""
+
+
+class UnsupportedImageError(Exception):
+    """이미지 시그니처를 인식할 수 없는 경우"""
+
+
+@dataclass
+class StreamedImage:
+    """스트리밍으로 읽은 이미지와 읽는 동안 계산한 정보"""
+    content: bytes
+    sha256: str
+    content_type: str
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """파일 앞부분의 매직 바이트로 이미지 MIME 타입을 추정합니다."""
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in _HEIF_BRANDS:
+        return "image/avif" if head[8:12] == b"avif" else "image/heic"
+    return None
+
+
+async def read_image_stream(chunks: AsyncIterator[bytes], max_size: int) -> StreamedImage:
+    """청크 단위로 이미지를 읽으며 크기 제한, 해시 계산, 시그니처 검사를 수행합니다.
+
+    제한을 넘는 순간 읽기를 중단하므로 요청당 메모리 사용량이 max_size로 제한됩니다.
+
+    Args:
+        chunks (AsyncIterator[bytes]): 이미지 데이터 청크
+        max_size (int): 최대 허용 크기(바이트)
+
+    Returns:
+        StreamedImage: 이미지 바이너리, SHA-256, 감지된 MIME 타입
+
+    Raises:
+        UploadTooLargeError: 크기가 max_size를 넘은 경우
+        UnsupportedImageError: 이미지 시그니처를 인식할 수 없는 경우
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    content_type = None
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if len(buffer) + len(chunk) > max_size:
+            raise UploadTooLargeError(f"이미지 크기가 {max_size} bytes를 넘었습니다.")
+        buffer += chunk
+        digest.update(chunk)
+        if content_type is None and len(buffer) >= 16:
+            content_type = sniff_image_type(bytes(buffer[:16]))
+            if content_type is None:
+                raise UnsupportedImageError("이미지 파일 시그니처를 인식할 수 없습니다.")
+    if content_type is None:
+        content_type = sniff_image_type(bytes(buffer[:16]))
+        if content_type is None:
+            raise UnsupportedImageError("이미지 파일 시그니처를 인식할 수 없습니다.")
+    return StreamedImage(content=bytes(buffer), sha256=digest.hexdigest(), content_type=content_type)
+
+
+async def iter_upload(upload: UploadFile, chunk_size: int = None) -> AsyncIterator[bytes]:
+    """업로드 파일을 청크 단위로 읽습니다."""
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class UploadSizeLimitMiddleware:
+    """지정된 경로의 요청 본문 크기를 제한하는 ASGI 미들웨어
+
+    FastAPI는 엔드포인트 실행 전에 multipart 본문 전체를 파싱하므로,
+    Content-Length가 제한을 넘는 요청은 본문을 읽기 전에 거부하고
+    Content-Length 없이 전송되는 본문은 누적 크기가 제한을 넘는 즉시 중단합니다.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_body_size: int):
+        """
+        Args:
+            app: 감쌀 ASGI 애플리케이션
+            paths (Iterable[str]): 제한을 적용할 요청 경로
+            max_body_size (int): 최대 본문 크기(바이트)
+        """
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                content_length = int(content_length)
+            except ValueError:
+                logger.warning(f"잘못된 Content-Length 헤더: {content_length!r} ({scope['path']})")
+                await self._send_error(send, 400, "INVALID_CONTENT_LENGTH", "Content-Length 헤더가 올바르지 않습니다.")
+                return
+            if content_length > self.max_body_size:
+                logger.warning(f"요청 본문이 너무 큽니다: {content_length} bytes ({scope['path']})")
+                await self._reject(send)
+                return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    logger.warning(f"요청 본문 수신 중 크기 제한 초과: {scope['path']}")
+                    rejected = True
+                    await self._reject(send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            # 이미 거부 응답을 보낸 경우 애플리케이션의 응답은 버림
+            if not rejected:
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+    async def _reject(self, send) -> None:
+        await self._send_error(
+            send, 413, "FILE_TOO_LARGE",
+            f"이미지 크기가 너무 큽니다. 최대 허용 크기: {settings.max_image_size_int/1024/1024}MB"
+        )
+
+    async def _send_error(self, send, status: int, error_code: str, message: str) -> None:
+        body = json.dumps({
+            "detail": {
+                "error_code": error_code,
+                "message": message
+            }
+        }, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,10 +1,19 @@
 from google.cloud import vision
 from google.cloud.vision_v1 import ImageAnnotatorClient
 from google.cloud.vision_v1.types import Image
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import grpc
 import io
 import logging
 from app.core.config import settings
+from app.core.cache import AnalysisCache, content_hash
+from app.core.image_processing import preprocess_image
+from app.core.image_hash import NearDuplicateIndex, dhash, hamming_distance
+from app.core.providers import FakeImageAnnotatorClient, use_fake_providers
+from app.models.analysis import AnalysisResult, DetectedObjects, Faces, Label, TextAnnotations, TextFragments
 import os
 from pathlib import Path
 from google.oauth2 import service_account
@@ -14,8 +23,45 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class VisionAIClient:
-    def __init__(self):
-        """Vision API 클라이언트를 초기화합니다."""
+    def __init__(self, client: Optional[ImageAnnotatorClient] = None,
+                 cache: Optional[AnalysisCache] = None,
+                 near_duplicates: Optional[NearDuplicateIndex] = None):
+        """Vision API 클라이언트를 초기화합니다.
+
+        Args:
+            client (Optional[ImageAnnotatorClient]): 미리 생성된 클라이언트 (없으면 인증 파일로 생성)
+            cache (Optional[AnalysisCache]): 분석 결과 캐시 (없으면 설정에 따라 생성)
+            near_duplicates (Optional[NearDuplicateIndex]): 유사 이미지 인덱스 (없으면 설정에 따라 생성)
+        """
+        if cache is None and settings.ANALYSIS_CACHE_ENABLED:
+            cache = AnalysisCache(
+                max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.ANALYSIS_CACHE_TTL,
+                db_path=settings.ANALYSIS_CACHE_DB_PATH,
+                db_max_entries=settings.ANALYSIS_CACHE_DB_MAX_ENTRIES
+            )
+        self.cache = cache
+
+        if near_duplicates is None and settings.NEAR_DUPLICATE_ENABLED:
+            near_duplicates = NearDuplicateIndex(
+                capacity=settings.NEAR_DUPLICATE_WINDOW,
+                max_distance=settings.NEAR_DUPLICATE_MAX_DISTANCE,
+                ttl_seconds=settings.NEAR_DUPLICATE_TTL
+            )
+        self.near_duplicates = near_duplicates
+
+        # 동기 gRPC 호출을 이벤트 루프 밖에서 실행하기 위한 전용 스레드 풀
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.VISION_MAX_WORKERS,
+            thread_name_prefix="vision"
+        )
+
+        if client is None and use_fake_providers():
+            client = FakeImageAnnotatorClient.from_settings()
+        if client is not None:
+            self.client = client
+            return
+
         try:
             # 프로젝트 루트 디렉토리 찾기
             base_dir = Path(__file__).parent.parent.parent
@@ -33,30 +79,83 @@ class VisionAIClient:
             logger.error(f"Vision API 클라이언트 초기화 실패: {str(e)}")
             raise
 
-    async def analyze_image(self, image_content: bytes) -> Dict[str, Any]:
+    def warm_up(self, timeout: float) -> None:
+        """gRPC 채널 연결을 미리 맺어 첫 요청의 연결 지연을 없앱니다."""
+        transport = getattr(self.client, "transport", None)
+        channel = getattr(transport, "grpc_channel", None)
+        if channel is not None:
+            grpc.channel_ready_future(channel).result(timeout=timeout)
+            logger.info("Vision API 채널 연결 완료")
+
+    async def analyze_image(self, image_content: bytes,
+                            features: Union[str, Iterable[str], None] = None,
+                            content_sha256: Optional[str] = None) -> AnalysisResult:
         """이미지를 분석하여 다양한 특성을 추출합니다.
         
         Args:
             image_content (bytes): 분석할 이미지의 바이너리 데이터
+            features: 실행할 기능 목록 또는 프로필 이름 (없으면 VISION_DEFAULT_FEATURES)
+            content_sha256 (Optional[str]): 이미 계산된 이미지 SHA-256 (없으면 계산)
             
         Returns:
-            Dict[str, Any]: 분석 결과를 포함하는 딕셔너리
+            AnalysisResult: 분석 결과 (딕셔너리처럼 읽을 수 있으며, 요청하지 않은 기능은 빈 기본값)
         """
+        features = resolve_features(features)
         try:
+            # 동일한 이미지는 캐시된 분석 결과 재사용
+            cache_key = None
+            if self.cache is not None:
+                cache_key = _cache_key(image_content, features, content_sha256)
+            if cache_key is not None:
+                cached = await self.cache.get_async(cache_key)
+                if cached is not None:
+                    logger.info(f"캐시된 이미지 분석 결과를 사용합니다: {cache_key[:12]}")
+                    return cached
+
+            # 최근 분석한 유사 이미지(연사 등)가 있으면 그 결과를 재사용
+            phash = await self._perceptual_hash(image_content)
+            if phash is not None:
+                match = self.near_duplicates.find(phash, features)
+                if match is not None:
+                    analysis, distance, source_hash = match
+                    logger.info(f"유사 이미지의 분석 결과를 재사용합니다 (해밍 거리: {distance})")
+                    return _mark_reused(analysis, distance, source_hash)
+
+            # 업로드 전 축소 및 재인코딩
+            image_content = await self._preprocess(image_content)
+
             # 이미지 객체 생성
             image = Image(content=image_content)
             
-            # 다양한 분석 기능 실행
-            response = {
-                'labels': await self._detect_labels(image),
-                'objects': await self._detect_objects(image),
-                'faces': await self._detect_faces(image),
-                'landmarks': await self._detect_landmarks(image),
-                'text': await self._detect_text(image),
-                'safe_search': await self._detect_safe_search(image),
-                'colors': await self._detect_properties(image)
-            }
+            if settings.VISION_BATCH_ANNOTATE:
+                # 단일 annotate_image 요청으로 요청된 기능 모두 실행
+                annotation = await self._annotate_all(image, features)
+                response = split_annotation(annotation, features)
+                # 요청 자체가 실패한 결과는 캐시하지 않음
+                cacheable = annotation is not None and not annotation.error.code
+            else:
+                # 요청된 분석 기능을 동시에 실행
+                detectors = {
+                    'labels': self._detect_labels,
+                    'objects': self._detect_objects,
+                    'faces': self._detect_faces,
+                    'landmarks': self._detect_landmarks,
+                    'text': self._detect_text,
+                    'safe_search': self._detect_safe_search,
+                    'colors': self._detect_properties
+                }
+                results = await asyncio.gather(*(detectors[key](image) for key in features))
+                response = split_annotation(None, ())
+                response.update((key, value) for key, (value, _) in zip(features, results))
+                # 하나라도 실패해 기본값으로 대체된 결과는 캐시하지 않음
+                cacheable = all(ok for _, ok in results)
             
+            if cacheable:
+                if cache_key is not None:
+                    await self.cache.set_many_async([(cache_key, response)])
+                if phash is not None:
+                    self.near_duplicates.add(phash, features, response)
+
             logger.info("이미지 분석이 성공적으로 완료되었습니다.")
             return response
             
@@ -64,126 +163,366 @@ class VisionAIClient:
             logger.error(f"이미지 분석 중 오류 발생: {str(e)}")
             raise
 
-    async def _detect_labels(self, image: Image) -> List[Dict[str, Any]]:
-        """이미지의 레이블을 감지합니다."""
+    async def _call(self, method: Callable, *args, **kwargs) -> Any:
+        """동기 Vision 클라이언트 메서드를 스레드 풀에서 실행합니다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs)
+        )
+
+    async def _perceptual_hash(self, image_content: bytes) -> Optional[int]:
+        """유사 이미지 인덱스를 사용하는 경우 스레드 풀에서 지각 해시를 계산합니다."""
+        if self.near_duplicates is None:
+            return None
+        return await self._call(dhash, image_content)
+
+    async def _preprocess(self, image_content: bytes) -> bytes:
+        """설정에 따라 이미지를 스레드 풀에서 전처리하고 절감된 용량을 기록합니다."""
+        if not settings.IMAGE_PREPROCESS_ENABLED:
+            return image_content
+        processed, stats = await self._call(preprocess_image, image_content)
+        logger.info(
+            f"이미지 전처리 완료: {stats['original_bytes']} -> {stats['processed_bytes']} bytes "
+            f"({stats['bytes_saved']} bytes 절감)"
+        )
+        return processed
+
+    async def _annotate_all(self, image: Image,
+                            features: Tuple[str, ...]) -> Optional[vision.AnnotateImageResponse]:
+        """한 번의 annotate_image 요청으로 요청된 기능을 실행합니다. 실패 시 None을 반환합니다."""
         try:
-            response = self.client.label_detection(image=image)
-            return [{
-                'description': label.description,
-                'score': label.score,
-                'topicality': label.topicality
-            } for label in response.label_annotations]
+            return await self._call(self.client.annotate_image, {
+                'image': image,
+                'features': _feature_requests(features)
+            })
         except Exception as e:
-            logger.error(f"레이블 감지 중 오류 발생: {str(e)}")
-            return []
+            logger.error(f"일괄 이미지 분석 요청 실패: {str(e)}")
+            return None
 
-    async def _detect_objects(self, image: Image) -> List[Dict[str, Any]]:
-        """이미지 내의 객체를 감지합니다."""
+    async def analyze_images(self, image_contents: List[bytes],
+                             features: Union[str, Iterable[str], None] = None) -> List[Any]:
+        """여러 이미지를 batch_annotate_images 요청으로 묶어 분석합니다.
+
+        요청당 최대 VISION_BATCH_SIZE장씩 나누어 동시에 호출하며,
+        캐시에 있는 이미지는 요청에서 제외합니다.
+
+        Args:
+            image_contents (List[bytes]): 분석할 이미지들의 바이너리 데이터
+            features: 실행할 기능 목록 또는 프로필 이름 (없으면 VISION_DEFAULT_FEATURES)
+
+        Returns:
+            List[Any]: 입력 순서대로의 분석 결과(AnalysisResult), 실패한 이미지는 Exception
+        """
+        features = resolve_features(features)
+        results: List[Any] = [None] * len(image_contents)
+        cache_keys: List[Optional[str]] = [None] * len(image_contents)
+        pending = []
+        if self.cache is not None:
+            cache_keys = [_cache_key(content, features) for content in image_contents]
+            cached_results = await asyncio.gather(*(self.cache.get_async(key) for key in cache_keys))
+        else:
+            cached_results = [None] * len(image_contents)
+        for index, cached in enumerate(cached_results):
+            if cached is not None:
+                results[index] = cached
+                continue
+            pending.append(index)
+
+        # 유사 이미지는 인덱스의 결과를 재사용하고, 배치 내 유사 이미지는 대표 이미지만 요청
+        phashes = dict(zip(pending, await asyncio.gather(
+            *(self._perceptual_hash(image_contents[index]) for index in pending)
+        )))
+        leaders = []
+        followers = {}
+        for index in pending:
+            phash = phashes[index]
+            if phash is not None:
+                match = self.near_duplicates.find(phash, features)
+                if match is not None:
+                    results[index] = _mark_reused(*match)
+                    continue
+                leader = next((
+                    leader for leader in leaders if phashes[leader] is not None
+                    and hamming_distance(phashes[leader], phash) <= self.near_duplicates.max_distance
+                ), None)
+                if leader is not None:
+                    followers[index] = leader
+                    continue
+            leaders.append(index)
+
+        processed = await asyncio.gather(*(self._preprocess(image_contents[index]) for index in leaders))
+        processed_contents = dict(zip(leaders, processed))
+
+        batch_size = settings.VISION_BATCH_SIZE
+        chunks = [leaders[i:i + batch_size] for i in range(0, len(leaders), batch_size)]
+        responses = await asyncio.gather(*(
+            self._call(self.client.batch_annotate_images, requests=[{
+                'image': Image(content=processed_contents[index]),
+                'features': _feature_requests(features)
+            } for index in chunk]) for chunk in chunks
+        ), return_exceptions=True)
+
+        to_cache = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                logger.error(f"일괄 이미지 분석 요청 실패 ({len(chunk)}장): {str(response)}")
+                for index in chunk:
+                    results[index] = response
+                continue
+            for index, annotation in zip(chunk, response.responses):
+                if annotation.error.code:
+                    results[index] = Exception(f"이미지 분석 실패: {annotation.error.message}")
+                    continue
+                results[index] = split_annotation(annotation, features)
+                if cache_keys[index] is not None:
+                    to_cache.append((cache_keys[index], results[index]))
+                if phashes[index] is not None:
+                    self.near_duplicates.add(phashes[index], features, results[index])
+
+        if to_cache:
+            await self.cache.set_many_async(to_cache)
+
+        for index, leader in followers.items():
+            if isinstance(results[leader], Exception):
+                results[index] = results[leader]
+            else:
+                distance = hamming_distance(phashes[leader], phashes[index])
+                results[index] = _mark_reused(results[leader], distance, phashes[leader])
+
+        logger.info(f"일괄 이미지 분석 완료: {len(image_contents)}장 중 {len(leaders)}장 요청, {len(chunks)}회 호출")
+        return results
+
+    async def _detect(self, method: Callable, parse: Callable, default: Any, name: str, image: Image) -> Tuple[Any, bool]:
+        """단일 기능 감지 요청을 실행합니다.
+
+        Args:
+            method (Callable): 호출할 Vision 클라이언트 메서드
+            parse (Callable): 응답에서 결과를 추출하는 함수
+            default (Any): 실패 시 반환할 빈 기본값
+            name (str): 로그에 표시할 기능 이름
+            image (Image): 분석할 이미지
+
+        Returns:
+            Tuple[Any, bool]: (결과, 성공 여부). 실패하면 빈 기본값과 False
+        """
         try:
-            response = self.client.object_localization(image=image)
-            return [{
-                'name': obj.name,
-                'score': obj.score,
-                'bounding_box': {
-                    'left': obj.bounding_poly.normalized_vertices[0].x,
-                    'top': obj.bounding_poly.normalized_vertices[0].y,
-                    'right': obj.bounding_poly.normalized_vertices[2].x,
-                    'bottom': obj.bounding_poly.normalized_vertices[2].y
-                }
-            } for obj in response.localized_object_annotations]
+            response = await self._call(method, image=image)
+            if response.error.code:
+                raise Exception(response.error.message)
+            return parse(response), True
         except Exception as e:
-            logger.error(f"객체 감지 중 오류 발생: {str(e)}")
-            return []
+            logger.error(f"{name} 중 오류 발생: {str(e)}")
+            return default, False
 
-    async def _detect_faces(self, image: Image) -> List[Dict[str, Any]]:
+    async def _detect_labels(self, image: Image) -> Tuple[List[Label], bool]:
+        """이미지의 레이블을 감지합니다."""
+        return await self._detect(self.client.label_detection, _parse_labels, [], "레이블 감지", image)
+
+    async def _detect_objects(self, image: Image) -> Tuple[DetectedObjects, bool]:
+        """이미지 내의 객체를 감지합니다."""
+        return await self._detect(self.client.object_localization, _parse_objects, DetectedObjects(), "객체 감지", image)
+
+    async def _detect_faces(self, image: Image) -> Tuple[Faces, bool]:
         """이미지 내의 얼굴을 감지합니다."""
-        try:
-            response = self.client.face_detection(image=image)
-            return [{
-                'confidence': face.detection_confidence,
-                'joy': face.joy_likelihood,
-                'sorrow': face.sorrow_likelihood,
-                'anger': face.anger_likelihood,
-                'surprise': face.surprise_likelihood,
-                'bounding_box': {
-                    'left': face.bounding_poly.vertices[0].x,
-                    'top': face.bounding_poly.vertices[0].y,
-                    'right': face.bounding_poly.vertices[2].x,
-                    'bottom': face.bounding_poly.vertices[2].y
-                }
-            } for face in response.face_annotations]
-        except Exception as e:
-            logger.error(f"얼굴 감지 중 오류 발생: {str(e)}")
-            return []
+        return await self._detect(self.client.face_detection, _parse_faces, Faces(), "얼굴 감지", image)
 
-    async def _detect_landmarks(self, image: Image) -> List[Dict[str, Any]]:
+    async def _detect_landmarks(self, image: Image) -> Tuple[List[Dict[str, Any]], bool]:
         """이미지 내의 랜드마크를 감지합니다."""
-        try:
-            response = self.client.landmark_detection(image=image)
-            return [{
-                'description': landmark.description,
-                'score': landmark.score,
-                'locations': [{
-                    'latitude': location.lat_lng.latitude,
-                    'longitude': location.lat_lng.longitude
-                } for location in landmark.locations]
-            } for landmark in response.landmark_annotations]
-        except Exception as e:
-            logger.error(f"랜드마크 감지 중 오류 발생: {str(e)}")
-            return []
+        return await self._detect(self.client.landmark_detection, _parse_landmarks, [], "랜드마크 감지", image)
 
-    async def _detect_text(self, image: Image) -> Dict[str, Any]:
+    async def _detect_text(self, image: Image) -> Tuple[TextAnnotations, bool]:
         """이미지 내의 텍스트를 감지합니다."""
-        try:
-            response = self.client.text_detection(image=image)
-            return {
-                'full_text': response.text_annotations[0].description if response.text_annotations else "",
-                'texts': [{
-                    'text': text.description,
-                    'confidence': text.confidence,
-                    'bounding_box': {
-                        'left': text.bounding_poly.vertices[0].x,
-                        'top': text.bounding_poly.vertices[0].y,
-                        'right': text.bounding_poly.vertices[2].x,
-                        'bottom': text.bounding_poly.vertices[2].y
-                    }
-                } for text in response.text_annotations[1:]]
-            }
-        except Exception as e:
-            logger.error(f"텍스트 감지 중 오류 발생: {str(e)}")
-            return {'full_text': "", 'texts': []}
+        return await self._detect(self.client.text_detection, _parse_text, TextAnnotations(), "텍스트 감지", image)
 
-    async def _detect_safe_search(self, image: Image) -> Dict[str, Any]:
+    async def _detect_safe_search(self, image: Image) -> Tuple[Dict[str, Any], bool]:
         """이미지의 안전성을 검사합니다."""
-        try:
-            response = self.client.safe_search_detection(image=image)
-            safe = response.safe_search_annotation
-            return {
-                'adult': safe.adult,
-                'medical': safe.medical,
-                'spoof': safe.spoof,
-                'violence': safe.violence,
-                'racy': safe.racy
-            }
-        except Exception as e:
-            logger.error(f"안전성 검사 중 오류 발생: {str(e)}")
-            return {}
+        return await self._detect(self.client.safe_search_detection, _parse_safe_search, {}, "안전성 검사", image)
 
-    async def _detect_properties(self, image: Image) -> Dict[str, Any]:
+    async def _detect_properties(self, image: Image) -> Tuple[Dict[str, Any], bool]:
         """이미지의 색상 속성을 감지합니다."""
+        return await self._detect(self.client.image_properties, _parse_properties, {'dominant_colors': []}, "이미지 속성 감지", image)
+
+def _parse_labels(response) -> List[Label]:
+    """응답에서 레이블 결과를 추출합니다."""
+    return [
+        Label(label.description, label.score, label.topicality)
+        for label in response.label_annotations
+    ]
+
+
+def _parse_objects(response) -> DetectedObjects:
+    """응답에서 객체 결과를 추출합니다."""
+    objects = DetectedObjects()
+    for obj in response.localized_object_annotations:
+        vertices = obj.bounding_poly.normalized_vertices
+        objects.append((obj.name, obj.score), (vertices[0].x, vertices[0].y, vertices[2].x, vertices[2].y))
+    return objects
+
+
+def _parse_faces(response) -> Faces:
+    """응답에서 얼굴 결과를 추출합니다."""
+    faces = Faces()
+    for face in response.face_annotations:
+        vertices = face.bounding_poly.vertices
+        faces.append(
+            (face.detection_confidence, face.joy_likelihood, face.sorrow_likelihood,
+             face.anger_likelihood, face.surprise_likelihood),
+            (vertices[0].x, vertices[0].y, vertices[2].x, vertices[2].y)
+        )
+    return faces
+
+
+def _parse_landmarks(response) -> List[Dict[str, Any]]:
+    """응답에서 랜드마크 결과를 추출합니다."""
+    return [{
+        'description': landmark.description,
+        'score': landmark.score,
+        'locations': [{
+            'latitude': location.lat_lng.latitude,
+            'longitude': location.lat_lng.longitude
+        } for location in landmark.locations]
+    } for landmark in response.landmark_annotations]
+
+
+def _parse_text(response) -> TextAnnotations:
+    """응답에서 텍스트 결과를 추출합니다."""
+    annotations = response.text_annotations
+    if not annotations:
+        return TextAnnotations()
+    texts = TextFragments()
+    for text in annotations[1:]:
+        vertices = text.bounding_poly.vertices
+        texts.append((text.description, text.confidence),
+                     (vertices[0].x, vertices[0].y, vertices[2].x, vertices[2].y))
+    return TextAnnotations(annotations[0].description, texts)
+
+
+def _parse_safe_search(response) -> Dict[str, Any]:
+    """응답에서 안전성 검사 결과를 추출합니다."""
+    safe = response.safe_search_annotation
+    return {
+        'adult': safe.adult,
+        'medical': safe.medical,
+        'spoof': safe.spoof,
+        'violence': safe.violence,
+        'racy': safe.racy
+    }
+
+
+def _parse_properties(response) -> Dict[str, Any]:
+    """응답에서 색상 속성 결과를 추출합니다."""
+    return {
+        'dominant_colors': [{
+            'color': {
+                'red': color.color.red,
+                'green': color.color.green,
+                'blue': color.color.blue
+            },
+            'score': color.score,
+            'pixel_fraction': color.pixel_fraction
+        } for color in response.image_properties_annotation.dominant_colors.colors]
+    }
+
+
+# 결과 키별 (Vision 기능 타입, 파서, 실패 시 기본값 생성 함수, 로그용 이름)
+FEATURES = {
+    'labels': (vision.Feature.Type.LABEL_DETECTION, _parse_labels, list, "레이블 감지"),
+    'objects': (vision.Feature.Type.OBJECT_LOCALIZATION, _parse_objects, DetectedObjects, "객체 감지"),
+    'faces': (vision.Feature.Type.FACE_DETECTION, _parse_faces, Faces, "얼굴 감지"),
+    'landmarks': (vision.Feature.Type.LANDMARK_DETECTION, _parse_landmarks, list, "랜드마크 감지"),
+    'text': (vision.Feature.Type.TEXT_DETECTION, _parse_text, TextAnnotations, "텍스트 감지"),
+    'safe_search': (vision.Feature.Type.SAFE_SEARCH_DETECTION, _parse_safe_search, dict, "안전성 검사"),
+    'colors': (vision.Feature.Type.IMAGE_PROPERTIES, _parse_properties,
+               lambda: {'dominant_colors': []}, "이미지 속성 감지")
+}
+
+
+# 기능 프로필: 'questions'는 질문 생성에 필요한 기능만 실행
+FEATURE_PROFILES = {
+    'full': tuple(FEATURES.keys()),
+    'questions': ('labels', 'faces')
+}
+
+
+def resolve_features(features: Union[str, Iterable[str], None] = None) -> Tuple[str, ...]:
+    """기능 목록(쉼표 구분 문자열, 목록 또는 프로필 이름)을 정규화합니다.
+
+    Args:
+        features: 예) "labels,faces", ["labels"], "questions" (없으면 VISION_DEFAULT_FEATURES)
+
+    Returns:
+        Tuple[str, ...]: FEATURES 순서로 정렬된 결과 키 목록
+
+    Raises:
+        ValueError: 알 수 없는 기능 이름이 포함된 경우
+    """
+    if not features:
+        features = settings.VISION_DEFAULT_FEATURES
+    if isinstance(features, str):
+        features = features.split(',')
+
+    requested = set()
+    for name in (name.strip() for name in features):
+        if not name:
+            continue
+        if name in FEATURE_PROFILES:
+            requested.update(FEATURE_PROFILES[name])
+        elif name in FEATURES:
+            requested.add(name)
+        else:
+            raise ValueError(f"알 수 없는 분석 기능입니다: {name}")
+    if not requested:
+        raise ValueError("분석 기능이 지정되지 않았습니다.")
+    return tuple(key for key in FEATURES if key in requested)
+
+
+def _mark_reused(analysis: Union[AnalysisResult, Dict[str, Any]], distance: int,
+                 source_hash: int) -> Union[AnalysisResult, Dict[str, Any]]:
+    """유사 이미지에서 재사용한 분석 결과임을 표시한 사본을 반환합니다."""
+    reused_analysis = {
+        'reused': True,
+        'distance': distance,
+        'source_phash': f"{source_hash:016x}"
+    }
+    if isinstance(analysis, AnalysisResult):
+        return analysis.with_extra(reused_analysis=reused_analysis)
+    return dict(analysis, reused_analysis=reused_analysis)
+
+
+def _cache_key(image_content: bytes, features: Tuple[str, ...],
+               content_sha256: Optional[str] = None) -> str:
+    """이미지 해시와 기능 목록으로 캐시 키를 만듭니다."""
+    return f"{content_sha256 or content_hash(image_content)}:{','.join(features)}"
+
+
+def _feature_requests(features: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """요청된 분석 기능에 대한 Feature 요청 목록을 반환합니다."""
+    return [{'type_': FEATURES[key][0]} for key in features]
+
+
+def split_annotation(annotation, features: Iterable[str] = FEATURES.keys()) -> AnalysisResult:
+    """하나의 AnnotateImageResponse를 analyze_image 결과 형태로 분리합니다.
+
+    요청하지 않은 기능과 파싱 오류가 발생한 기능은 빈 기본값으로 채웁니다.
+
+    Args:
+        annotation: Vision API 응답 (요청 실패 시 None)
+        features: 응답에서 추출할 결과 키 목록
+
+    Returns:
+        AnalysisResult: 기능별 분석 결과
+    """
+    if annotation is not None and annotation.error.code:
+        logger.error(f"일괄 이미지 분석 응답 오류: {annotation.error.message}")
+
+    result = AnalysisResult()
+    if annotation is None:
+        return result
+    for key, (_, parser, _, name) in FEATURES.items():
+        if key not in features:
+            continue
         try:
-            response = self.client.image_properties(image=image)
-            return {
-                'dominant_colors': [{
-                    'color': {
-                        'red': color.color.red,
-                        'green': color.color.green,
-                        'blue': color.color.blue
-                    },
-                    'score': color.score,
-                    'pixel_fraction': color.pixel_fraction
-                } for color in response.image_properties_annotation.dominant_colors.colors]
-            }
+            setattr(result, key, parser(annotation))
         except Exception as e:
-            logger.error(f"이미지 속성 감지 중 오류 발생: {str(e)}")
-            return {'dominant_colors': []} 
\ No newline at end of file
+            logger.error(f"{name} 중 오류 발생: {str(e)}")
+    return result
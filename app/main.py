@@ -1,19 +1,77 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from app.core.config import settings
-from app.api.v1.api import router as api_v1_router
+from app.core.clients import clients
+from app.core.upload import UploadSizeLimitMiddleware
+from app.api.v1.api import drain_story_tasks, router as api_v1_router
+import asyncio
+import logging
+import os
+import time
 
 # 환경 변수 로드
 load_dotenv()
 
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """기동 시 디렉토리 생성과 클라이언트 워밍업을, 종료 시 캐시와 연결 정리를 수행합니다."""
+    start = time.perf_counter()
+
+    # 디렉토리 생성
+    os.makedirs(settings.TEMP_UPLOAD_DIR, exist_ok=True)
+    os.makedirs("analysis_results", exist_ok=True)
+
+    if settings.WARMUP_ON_STARTUP:
+        result = await clients.warm_up()
+        logger.info(f"워밍업 완료: {result}")
+    clients.ready = True
+    logger.info(f"서버 준비 완료 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+    yield
+
+    # 누적된 번역 사용 빈도를 디스크에 반영
+    question_generator = clients.peek("question_generator")
+    if question_generator is not None:
+        await asyncio.to_thread(question_generator.translation_memo.flush)
+        # 규칙 파일 감시 스레드 종료
+        question_generator.rules_store.close()
+
+    # 연결이 끊긴 요청을 포함해 진행 중인 스토리 생성과 저장 완료
+    await drain_story_tasks()
+
+    # 이미지 다운로드용 HTTP 연결 정리
+    storytelling = clients.peek("storytelling")
+    if storytelling is not None:
+        await storytelling.aclose()
+
 app = FastAPI(
     title="Memory AI Service",
     description="Memory Album AI Analysis Service",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# CORS 설정
+# 단일 이미지 업로드는 본문을 읽기 전에 크기 제한 적용
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    paths=[f"{settings.API_V1_STR}/analyze-image"],
+    max_body_size=settings.max_image_size_int + settings.UPLOAD_MULTIPART_OVERHEAD
+)
+
+# 일괄 업로드는 요청 전체 본문 크기 제한 (multipart 파싱 전에 적용)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    paths=[f"{settings.API_V1_STR}/analyze-images"],
+    max_body_size=settings.analyze_batch_max_body_size
+)
+
+# CORS 설정 (마지막에 등록해 가장 바깥에서 실행되므로, 크기 제한 거부 응답에도 CORS 헤더가 붙음)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.BACKEND_CORS_ORIGINS,
@@ -31,4 +89,10 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/ready")
+async def readiness_check():
+    """워밍업이 끝나고 모든 클라이언트가 준비되었는지 확인합니다."""
+    status = clients.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
@@ -0,0 +1,431 @@
+"""Vision 분석 결과 모델
+
+VisionAIClient가 반환하는 분석 결과를 감지 항목마다 딕셔너리를 만들지 않고
+필드별 배열(array)로 보관합니다. 경계 상자는 항목당 네 값(left, top, right, bottom)을
+이어 붙인 하나의 배열에 저장합니다.
+
+기존 호출 측을 위해 결과 전체가 Mapping 인터페이스를 제공합니다.
+result['faces'][0]['bounding_box']처럼 접근하면 그 시점에 해당 항목의 딕셔너리를 만듭니다.
+
+직렬화 형식:
+    to_json()      기존 응답과 같은 구조의 JSON (Spring 응답, 백엔드 전송)
+    to_compact()   필드별 배열 구조, 'format' 키로 구분 (파일 저장, 영구 캐시)
+"""
+from array import array
+from collections.abc import Mapping, MutableMapping, Sequence
+from dataclasses import dataclass, field, replace
+from json.encoder import encode_basestring
+from math import isfinite
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+
+BOX_KEYS = ('left', 'top', 'right', 'bottom')
+COMPACT_FORMAT = "analysis-compact/1"
+
+# 분석 기능 결과 키 (VisionAIClient FEATURES 순서)
+SECTIONS = ('labels', 'objects', 'faces', 'landmarks', 'text', 'safe_search', 'colors')
+
+
+# json.dumps는 기본값이 아닌 옵션이면 호출마다 인코더를 새로 만드므로 하나를 재사용
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+_LABEL_TEMPLATE = '{"description":%s,"score":%r,"topicality":%r}'
+_LABEL_TEMPLATE_NULLABLE = '{"description":%s,"score":%s,"topicality":%s}'
+
+
+def _json_floats(values: Iterable[float]) -> List[str]:
+    """실수 값을 JSON 숫자 문자열로 바꿉니다. NaN, 무한대는 JSON에 없으므로 null로 씁니다."""
+    return [repr(value) if isfinite(value) else "null" for value in values]
+
+
+@dataclass(slots=True, eq=False)
+class Label(Mapping):
+    """레이블 감지 결과"""
+    description: str
+    score: float
+    topicality: float
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'description':
+            return self.description
+        if key == 'score':
+            return self.score
+        if key == 'topicality':
+            return self.topicality
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(('description', 'score', 'topicality'))
+
+    def __len__(self) -> int:
+        return 3
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'description': self.description, 'score': self.score, 'topicality': self.topicality}
+
+    @classmethod
+    def coerce(cls, value: Mapping) -> "Label":
+        if isinstance(value, cls):
+            return value
+        return cls(value['description'], value.get('score', 0.0), value.get('topicality', 0.0))
+
+
+class AnnotationColumns(Sequence):
+    """경계 상자가 있는 감지 결과 목록을 필드별 배열로 보관합니다.
+
+    하위 클래스는 FIELDS에 (필드 이름, array 타입 코드)를 정의합니다.
+    타입 코드가 빈 문자열인 필드(문자열)는 리스트로 보관합니다.
+    """
+    __slots__ = ('columns', 'boxes')
+    FIELDS: Tuple[Tuple[str, str], ...] = ()
+    BOX_TYPECODE = 'i'
+    _TEMPLATE = ""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 항목 하나의 JSON 틀: {"name":%s,...,"bounding_box":{"left":%s,...}}
+        fields = "".join(f'"{name}":%s,' for name, _ in cls.FIELDS)
+        box = ",".join(f'"{key}":%s' for key in BOX_KEYS)
+        cls._TEMPLATE = f'{{{fields}"bounding_box":{{{box}}}}}'
+
+    def __init__(self, columns: Optional[Mapping] = None, boxes: Iterable = ()):
+        """
+        Args:
+            columns (Optional[Mapping]): 필드 이름별 값 목록
+            boxes (Iterable): 항목마다 left, top, right, bottom을 이어 붙인 값
+
+        Raises:
+            ValueError: 필드별 값 개수가 경계 상자 개수와 다른 경우
+        """
+        self.columns = {name: array(code) if code else [] for name, code in self.FIELDS}
+        self.boxes = array(self.BOX_TYPECODE, boxes)
+        if columns is not None:
+            for name, column in self.columns.items():
+                column.extend(columns[name])
+        if len(self.boxes) % 4 or any(len(column) != len(self) for column in self.columns.values()):
+            raise ValueError(f"{type(self).__name__}: 필드별 값 개수가 경계 상자 개수와 다릅니다.")
+
+    def append(self, values: Sequence, box: Sequence) -> None:
+        """항목 하나를 추가합니다. values는 FIELDS 순서, box는 BOX_KEYS 순서입니다."""
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+        self.boxes.extend(box)
+
+    def __len__(self) -> int:
+        return len(self.boxes) // 4
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"{type(self).__name__} index out of range")
+        record = {name: column[index] for name, column in self.columns.items()}
+        start = index * 4
+        record['bounding_box'] = dict(zip(BOX_KEYS, self.boxes[start:start + 4]))
+        return record
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, AnnotationColumns):
+            return type(self) is type(other) and self.columns == other.columns and self.boxes == other.boxes
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} items)"
+
+    @classmethod
+    def coerce(cls, value: Iterable[Mapping]) -> "AnnotationColumns":
+        """기존 딕셔너리 목록 형식을 변환합니다."""
+        if isinstance(value, cls):
+            return value
+        result = cls()
+        for record in value:
+            box = record['bounding_box']
+            result.append([record[name] for name, _ in cls.FIELDS], [box[key] for key in BOX_KEYS])
+        return result
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """기존 딕셔너리 목록 형식으로 변환합니다."""
+        return list(self)
+
+    def to_compact(self) -> Dict[str, list]:
+        """필드별 배열 구조로 변환합니다."""
+        data = {name: column.tolist() if isinstance(column, array) else list(column)
+                for name, column in self.columns.items()}
+        data['boxes'] = self.boxes.tolist()
+        return data
+
+    @classmethod
+    def from_compact(cls, data: Mapping) -> "AnnotationColumns":
+        return cls(data, data['boxes'])
+
+    def to_json(self) -> str:
+        """기존 딕셔너리 목록과 같은 구조의 JSON 배열을 항목 딕셔너리 없이 만듭니다."""
+        if not self.boxes:
+            return "[]"
+        # 실수 열은 합계로 NaN/무한대 포함 여부를 한 번에 확인하고, 포함된 경우에만 null로 변환
+        columns = [map(encode_basestring, column) if not code
+                   else _json_floats(column) if code == 'd' and not isfinite(sum(column))
+                   else column
+                   for (_, code), column in zip(self.FIELDS, self.columns.values())]
+        boxes = self.boxes
+        if self.BOX_TYPECODE == 'd' and not isfinite(sum(boxes)):
+            boxes = _json_floats(boxes)
+        rows = zip(*columns, boxes[0::4], boxes[1::4], boxes[2::4], boxes[3::4])
+        template = self._TEMPLATE
+        return "[" + ",".join([template % row for row in rows]) + "]"
+
+
+class DetectedObjects(AnnotationColumns):
+    """객체 감지 결과 (경계 상자는 0~1 정규화 좌표)"""
+    __slots__ = ()
+    FIELDS = (('name', ''), ('score', 'd'))
+    BOX_TYPECODE = 'd'
+
+
+class Faces(AnnotationColumns):
+    """얼굴 감지 결과 (감정 값은 Vision Likelihood 정수)"""
+    __slots__ = ()
+    FIELDS = (('confidence', 'd'), ('joy', 'b'), ('sorrow', 'b'), ('anger', 'b'), ('surprise', 'b'))
+
+
+class TextFragments(AnnotationColumns):
+    """텍스트 감지 결과의 단어 조각"""
+    __slots__ = ()
+    FIELDS = (('text', ''), ('confidence', 'd'))
+
+
+@dataclass(slots=True, eq=False)
+class TextAnnotations(Mapping):
+    """텍스트 감지 결과"""
+    full_text: str = ""
+    texts: TextFragments = field(default_factory=TextFragments)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'full_text':
+            return self.full_text
+        if key == 'texts':
+            return self.texts
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(('full_text', 'texts'))
+
+    def __len__(self) -> int:
+        return 2
+
+    @classmethod
+    def coerce(cls, value: Mapping) -> "TextAnnotations":
+        if isinstance(value, cls):
+            return value
+        return cls(value.get('full_text', ""), TextFragments.coerce(value.get('texts', ())))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'full_text': self.full_text, 'texts': self.texts.to_list()}
+
+    def to_compact(self) -> Dict[str, Any]:
+        return {'full_text': self.full_text, 'texts': self.texts.to_compact()}
+
+    @classmethod
+    def from_compact(cls, data: Mapping) -> "TextAnnotations":
+        return cls(data.get('full_text', ""), TextFragments.from_compact(data['texts']))
+
+    def to_json(self) -> str:
+        return f'{{"full_text":{encode_basestring(self.full_text)},"texts":{self.texts.to_json()}}}'
+
+
+def _default_colors() -> Dict[str, Any]:
+    return {'dominant_colors': []}
+
+
+# 키에 값을 대입할 때 기존 딕셔너리 형식을 변환하는 함수
+_COERCE = {
+    'labels': lambda value: [Label.coerce(label) for label in value],
+    'objects': DetectedObjects.coerce,
+    'faces': Faces.coerce,
+    'text': TextAnnotations.coerce,
+}
+
+
+@dataclass(slots=True, eq=False)
+class AnalysisResult(MutableMapping):
+    """이미지 한 장의 Vision 분석 결과
+
+    분석 기능 키(SECTIONS)는 항상 존재하며, 그 밖의 키(예: reused_analysis)는 extra에 보관합니다.
+    딕셔너리처럼 읽고 쓸 수 있고, 기존 형식의 값을 대입하면 내부 형식으로 변환합니다.
+    """
+    labels: List[Label] = field(default_factory=list)
+    objects: DetectedObjects = field(default_factory=DetectedObjects)
+    faces: Faces = field(default_factory=Faces)
+    landmarks: List[Dict[str, Any]] = field(default_factory=list)
+    text: TextAnnotations = field(default_factory=TextAnnotations)
+    safe_search: Dict[str, Any] = field(default_factory=dict)
+    colors: Dict[str, Any] = field(default_factory=_default_colors)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in SECTIONS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in SECTIONS:
+            coerce = _COERCE.get(key)
+            setattr(self, key, coerce(value) if coerce else value)
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        # 분석 기능 키는 항상 존재하므로 삭제하면 빈 기본값으로 되돌림
+        if key in SECTIONS:
+            setattr(self, key, AnalysisResult.__dataclass_fields__[key].default_factory())
+        else:
+            del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from SECTIONS
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return len(SECTIONS) + len(self.extra)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in SECTIONS or key in self.extra
+
+    def with_extra(self, **extra: Any) -> "AnalysisResult":
+        """분석 기능 결과를 공유하고 추가 키만 더한 사본을 반환합니다."""
+        return replace(self, extra={**self.extra, **extra})
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "AnalysisResult":
+        """기존 딕셔너리 형식의 분석 결과를 변환합니다."""
+        result = cls()
+        for key, value in data.items():
+            result[key] = value
+        return result
+
+    @classmethod
+    def from_compact(cls, data: Mapping) -> "AnalysisResult":
+        """to_compact() 결과를 다시 읽습니다."""
+        result = cls()
+        for key, value in data.items():
+            if key == 'format':
+                continue
+            if key == 'labels':
+                result.labels = [Label(*row) for row in zip(value['description'], value['score'], value['topicality'])]
+            elif key in ('objects', 'faces'):
+                setattr(result, key, type(getattr(result, key)).from_compact(value))
+            elif key == 'text':
+                result.text = TextAnnotations.from_compact(value)
+            else:
+                result[key] = value
+        return result
+
+    @classmethod
+    def load(cls, data: Mapping) -> "AnalysisResult":
+        """기존 형식과 필드별 배열 형식을 구분해 읽습니다."""
+        if data.get('format') == COMPACT_FORMAT:
+            return cls.from_compact(data)
+        return cls.from_dict(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """기존 딕셔너리 형식으로 변환합니다."""
+        return {
+            'labels': [label.to_dict() for label in self.labels],
+            'objects': self.objects.to_list(),
+            'faces': self.faces.to_list(),
+            'landmarks': self.landmarks,
+            'text': self.text.to_dict(),
+            'safe_search': self.safe_search,
+            'colors': self.colors,
+            **self.extra
+        }
+
+    def to_compact(self) -> Dict[str, Any]:
+        """필드별 배열 구조로 변환합니다."""
+        return {
+            'format': COMPACT_FORMAT,
+            'labels': {
+                'description': [label.description for label in self.labels],
+                'score': [label.score for label in self.labels],
+                'topicality': [label.topicality for label in self.labels]
+            },
+            'objects': self.objects.to_compact(),
+            'faces': self.faces.to_compact(),
+            'landmarks': self.landmarks,
+            'text': self.text.to_compact(),
+            'safe_search': self.safe_search,
+            'colors': self.colors,
+            **self.extra
+        }
+
+    def to_json(self) -> str:
+        """기존 딕셔너리 형식과 같은 구조의 JSON 문자열을 만듭니다."""
+        labels = ",".join([
+            _LABEL_TEMPLATE % (encode_basestring(label.description), label.score, label.topicality)
+            if isfinite(label.score + label.topicality)
+            else _LABEL_TEMPLATE_NULLABLE % (encode_basestring(label.description),
+                                             *_json_floats((label.score, label.topicality)))
+            for label in self.labels
+        ])
+        parts = [
+            f'"labels":[{labels}]',
+            '"objects":' + self.objects.to_json(),
+            '"faces":' + self.faces.to_json(),
+            '"landmarks":' + (_dumps(self.landmarks) if self.landmarks else "[]"),
+            '"text":' + self.text.to_json(),
+            '"safe_search":' + (_dumps(self.safe_search) if self.safe_search else "{}"),
+            '"colors":' + _dumps(self.colors)
+        ]
+        parts.extend(f"{encode_basestring(key)}:{dumps(value)}" for key, value in self.extra.items())
+        return "{" + ",".join(parts) + "}"
+
+    def to_compact_json(self) -> str:
+        """필드별 배열 구조의 JSON 문자열을 만듭니다."""
+        return _dumps(self.to_compact())
+
+
+def _contains_analysis(value: Any) -> bool:
+    # ABC 기반 isinstance 검사는 느리므로 정확한 타입으로 비교
+    cls = type(value)
+    if cls is AnalysisResult:
+        return True
+    if cls is dict:
+        return any(map(_contains_analysis, value.values()))
+    if cls is list or cls is tuple:
+        return any(map(_contains_analysis, value))
+    return False
+
+
+def dumps(data: Any, compact: bool = False) -> str:
+    """AnalysisResult가 포함된 응답 구조를 공백 없는 JSON 문자열로 직렬화합니다.
+
+    AnalysisResult는 자체 직렬화를 사용하고, AnalysisResult가 없는 하위 값은
+    json.dumps 한 번으로 직렬화합니다.
+
+    Args:
+        data (Any): 직렬화할 값
+        compact (bool): True이면 AnalysisResult를 필드별 배열 구조로 직렬화 (파일 저장용)
+
+    Returns:
+        str: JSON 문자열
+    """
+    if isinstance(data, AnalysisResult):
+        return data.to_compact_json() if compact else data.to_json()
+    if isinstance(data, dict):
+        return "{" + ",".join(
+            f"{encode_basestring(str(key))}:"
+            f"{dumps(value, compact) if _contains_analysis(value) else _dumps(value)}"
+            for key, value in data.items()
+        ) + "}"
+    if isinstance(data, (list, tuple)):
+        return "[" + ",".join(
+            dumps(value, compact) if _contains_analysis(value) else _dumps(value) for value in data
+        ) + "]"
+    return _dumps(data)
@@ -0,0 +1,185 @@
+"""스토리 프롬프트 생성 벤치마크
+
+변경 전 방식(요청마다 지시문 전체를 생성하고 질문마다 답변 목록을 순회)과
+StoryPromptTemplate(지시문 재사용, 답변 id 색인)의 프롬프트 생성 비용, 그리고
+Gemini 컨텍스트 캐시를 사용할 때 요청마다 보내는 프롬프트 크기를 비교합니다.
+
+    legacy_build       변경 전 create_storytelling_prompt와 같은 방식
+    template_build     StoryPromptTemplate.render
+    request_full       전체 프롬프트로 GenerateContentRequest 생성 및 직렬화
+    request_cached     질문-답변 부분만으로 GenerateContentRequest 생성 및 직렬화 (컨텍스트 캐시 사용 시)
+
+토큰 수는 네트워크 없이 측정할 수 없으므로 글자 수, 요청 바이트 수와 대체 클라이언트의
+추정 토큰 수(app.core.providers.estimate_tokens)를 보고합니다. 실제 토큰 사용량은
+/api/v1/cache-stats의 story_tokens(응답 usage_metadata 누적)에서 확인합니다.
+
+실행:
+    python -m benchmarks.prompt_pipeline --iterations 500
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import random
+import time
+from google.ai import generativelanguage as glm
+from google.generativeai.types import content_types
+from app.core.config import settings
+from app.core.providers import estimate_tokens
+from app.core.story_prompt import CLOSING, INSTRUCTIONS_TEMPLATE, StoryPromptTemplate
+from benchmarks.question_pipeline import _git_revision, _measure
+
+CATEGORIES = ("temporal", "sensory", "relational", "identity", "achievement", "general")
+
+# 질문-답변 쌍 수
+PROFILES = {
+    "typical": 5,
+    "large": 30,
+    "stress": 300,
+}
+
+
+def legacy_prompt(questions: List[Dict[str, Any]], answers: List[Dict[str, Any]],
+                  options: Optional[Dict[str, Any]] = None) -> str:
+    """변경 전 create_storytelling_prompt와 같은 방식으로 프롬프트를 만듭니다.
+
+    요청마다 지시문 전체를 새로 만들고, 질문마다 답변 목록을 처음부터 순회합니다 (O(Q×A)).
+    """
+    style = options.get("style", "warmly reflective") if options else "warmly reflective"
+    length = options.get("length", "medium") if options else "medium"
+    length_desc = {
+        "short": "약 150-250자",
+        "medium": "약 300-500자",
+        "long": "약 500-700자"
+    }.get(length, "약 300-500자")
+
+    categorized_qa = {}
+    for q in questions:
+        category = q.get("category", "general")
+        if category not in categorized_qa:
+            categorized_qa[category] = []
+
+        q_id = q.get("id")
+        answer_text = "답변 없음"
+        for a in answers:
+            if a.get("id") == q_id:
+                answer_text = a.get("content", "답변 없음")
+                break
+
+        categorized_qa[category].append({
+            "question": q.get("content", ""),
+            "answer": answer_text,
+            "level": q.get("level", 1),
+            "theme": q.get("theme", "general")
+        })
+
+    prompt = INSTRUCTIONS_TEMPLATE.format(style=style, length_desc=length_desc)
+    for category, qa_list in categorized_qa.items():
+        prompt += f"\n### {category.upper()} 카테고리\n"
+        for qa in qa_list:
+            prompt += f"- 질문 ({qa['theme'] if qa.get('theme') else 'general'} / Level {qa['level']}): {qa['question']}\n"
+            prompt += f"  답변: {qa['answer']}\n"
+    return prompt + CLOSING
+
+
+def synthetic_story_request(rng: random.Random, count: int) -> Dict[str, Any]:
+    """질문 count개와 순서를 섞은 답변으로 이루어진 스토리 요청을 만듭니다."""
+    questions = [{
+        "id": i,
+        "category": rng.choice(CATEGORIES),
+        "level": rng.randint(1, 3),
+        "theme": rng.choice(("general", "family", "travel", "")),
+        "content": f"이 사진에서 {i}번째로 기억나는 순간은 무엇인가요?"
+    } for i in range(count)]
+    answers = [{"id": i, "content": f"{i}번째 답변: 가족과 바닷가에서 보낸 여름 오후였어요."} for i in range(count)]
+    rng.shuffle(answers)
+    return {"questions": questions, "answers": answers,
+            "options": {"style": "warmly reflective", "length": rng.choice(("short", "medium", "long"))}}
+
+
+def _request_bytes(text: str) -> bytes:
+    request = glm.GenerateContentRequest(model=f"models/{settings.GEMINI_MODEL}",
+                                         contents=content_types.to_contents(text))
+    return glm.GenerateContentRequest.serialize(request)
+
+
+def run(iterations: int = 500, seed: int = 0, profiles: Optional[List[str]] = None) -> Dict[str, Any]:
+    """프로필별로 프롬프트 생성 비용과 요청 크기를 측정합니다.
+
+    Args:
+        iterations (int): 구간별 측정 횟수
+        seed (int): 합성 데이터 난수 시드
+        profiles (Optional[List[str]]): 측정할 프로필 (기본값: 전체)
+
+    Returns:
+        Dict[str, Any]: 측정 환경 정보와 결과
+    """
+    template = StoryPromptTemplate()
+    warmup = min(50, iterations)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for profile in profiles or list(PROFILES):
+        rng = random.Random(f"{seed}-{profile}")
+        requests = [synthetic_story_request(rng, PROFILES[profile]) for _ in range(iterations)]
+        splits = [template.split(r["questions"], r["answers"], r["options"]) for r in requests]
+        assert all(legacy_prompt(r["questions"], r["answers"], r["options"]) == prefix + body
+                   for r, (prefix, body) in zip(requests[:10], splits))
+
+        results[profile] = {
+            "legacy_build": _measure(lambda r: legacy_prompt(r["questions"], r["answers"], r["options"]),
+                                     requests, warmup),
+            "template_build": _measure(lambda r: template.render(r["questions"], r["answers"], r["options"]),
+                                       requests, warmup),
+            "request_full": _measure(lambda s: _request_bytes(s[0] + s[1]), splits, warmup),
+            "request_cached": _measure(lambda s: _request_bytes(s[1]), splits, warmup),
+        }
+
+        prefix, body = splits[0]
+        full, cached = len(_request_bytes(prefix + body)), len(_request_bytes(body))
+        results[profile]["payload"] = {
+            "prompt_chars": len(prefix) + len(body),
+            "instruction_chars": len(prefix),
+            "request_bytes_full": full,
+            "request_bytes_cached": cached,
+            "estimated_prompt_tokens": estimate_tokens(prefix + body),
+            "estimated_cached_tokens": estimate_tokens(prefix),
+            "cached_share": round(1 - cached / full, 3)
+        }
+
+    return {
+        "benchmark": "prompt_pipeline",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": _git_revision(),
+        "iterations": iterations,
+        "seed": seed,
+        "profiles": {name: {"qa_pairs": PROFILES[name]} for name in results},
+        "results": results
+    }
+
+
+def main() -> None:
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="스토리 프롬프트 생성 벤치마크")
+    parser.add_argument("--iterations", type=int, default=500, help="구간별 측정 횟수")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 난수 시드")
+    parser.add_argument("--profile", action="append", choices=list(PROFILES), help="측정할 프로필 (반복 지정 가능)")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    report = run(iterations=args.iterations, seed=args.seed, profiles=args.profile)
+    for profile, stages in report["results"].items():
+        payload = stages.pop("payload")
+        for stage, stats in stages.items():
+            print(f"{profile:8s} {stage:15s} {stats['ops_per_sec']:>10.1f} ops/s  "
+                  f"p50 {stats['p50_us']:>9.1f}us  p99 {stats['p99_us']:>9.1f}us")
+        print(f"{profile:8s} 요청 크기 {payload['request_bytes_full']} -> {payload['request_bytes_cached']} bytes "
+              f"(지시문 {payload['cached_share']:.0%}, 추정 토큰 {payload['estimated_prompt_tokens']} 중 "
+              f"{payload['estimated_cached_tokens']} 캐시)")
+        stages["payload"] = payload
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
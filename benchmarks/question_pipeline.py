@@ -0,0 +1,255 @@
+"""분석 결과 -> 질문 생성 경로 벤치마크
+
+인증 정보 없이 합성한 Vision analysis_result(AnalysisResult)로 다음 구간의 처리량과 지연 백분위를 측정합니다.
+번역은 지연 없는 대체 클라이언트와 메모리 캐시로 대체합니다.
+
+    extract_context      QuestionGenerator._extract_context
+    generate_questions   QuestionGenerator.generate_questions
+    serialize_response   API 응답 구조 JSON 직렬화 (app.models.analysis.dumps)
+    save_analysis        api.save_analysis_result (임시 디렉토리에 저장)
+
+실행:
+    python -m benchmarks.question_pipeline --output bench.json
+    python -m benchmarks.question_pipeline --baseline bench.json --max-regression 20
+"""
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+# 외부 서비스 없이 실행 (설정 로드 전에 지정)
+os.environ.setdefault("AI_PROVIDER", "fake")
+os.environ.setdefault("TRANSLATION_CACHE_DB_PATH", "")
+
+from app.core.providers import FakeTranslateClient  # noqa: E402
+from app.core.question_generator import QuestionGenerator  # noqa: E402
+from app.core.question_rules import load_rules  # noqa: E402
+from app.core.translation import TranslationMemo  # noqa: E402
+from app.models.analysis import AnalysisResult, dumps  # noqa: E402
+
+# 실제 Vision 응답에서 자주 나오는 레이블 + 규칙 파일의 키워드
+COMMON_LABELS = (
+    "Sky", "Cloud", "Tree", "Plant", "Smile", "Happy", "Fun", "Leisure", "Event", "Family",
+    "Beach", "Sea", "Water", "Mountain", "Park", "Grass", "Flower", "Building", "Room", "Table",
+    "Food", "Dining", "Party", "Wedding", "Graduation", "Travel", "Vacation", "Sport", "Night",
+    "Evening", "Morning", "Sunny", "Cloudy", "Snow", "Child", "Gesture", "Facial expression",
+    "Sleeve", "Eyewear", "Hat", "Dress", "Suit", "Tableware", "Drinkware", "Cake", "Ceremony",
+    "Crowd", "Stage", "Performance", "Award", "Interior design", "House", "Restaurant", "Office"
+)
+
+# (레이블 수, 얼굴 수, OCR 조각 수)
+PROFILES = {
+    "small": (5, 1, 0),
+    "typical": (15, 3, 20),
+    "large": (50, 20, 2000),
+}
+
+
+def synthetic_analysis(rng: random.Random, labels: int, faces: int, texts: int) -> Dict[str, Any]:
+    """VisionAIClient.analyze_image 결과와 같은 구조의 합성 분석 결과를 만듭니다.
+
+    Args:
+        rng (random.Random): 난수 생성기
+        labels (int): 레이블 수
+        faces (int): 얼굴 수
+        texts (int): OCR 텍스트 조각 수
+
+    Returns:
+        Dict[str, Any]: 합성 analysis_result
+    """
+    def box():
+        left, top = rng.randint(0, 3000), rng.randint(0, 3000)
+        return {'left': left, 'top': top, 'right': left + rng.randint(5, 400), 'bottom': top + rng.randint(5, 200)}
+
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10)))
+             for _ in range(texts)]
+    names = rng.sample(COMMON_LABELS, min(labels, len(COMMON_LABELS)))
+    names += [f"Label {i}" for i in range(labels - len(names))]
+    return {
+        'labels': sorted(({
+            'description': name,
+            'score': round(rng.uniform(0.5, 0.99), 4),
+            'topicality': round(rng.uniform(0.5, 0.99), 4)
+        } for name in names), key=lambda label: label['score'], reverse=True),
+        'faces': [{
+            'confidence': round(rng.uniform(0.6, 0.99), 4),
+            'joy': rng.randint(1, 5),
+            'sorrow': rng.randint(1, 5),
+            'anger': rng.randint(1, 5),
+            'surprise': rng.randint(1, 5),
+            'bounding_box': box()
+        } for _ in range(faces)],
+        'text': {
+            'full_text': " ".join(words),
+            'texts': [{'text': word, 'confidence': round(rng.uniform(0.5, 1.0), 4), 'bounding_box': box()}
+                      for word in words]
+        }
+    }
+
+
+def _summarize(samples_ns: List[int]) -> Dict[str, float]:
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1000
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return {
+        "iterations": len(samples),
+        "ops_per_sec": round(len(samples) / (samples.sum() / 1e6), 1),
+        "mean_us": round(float(samples.mean()), 2),
+        "p50_us": round(float(p50), 2),
+        "p90_us": round(float(p90), 2),
+        "p99_us": round(float(p99), 2),
+        "max_us": round(float(samples.max()), 2)
+    }
+
+
+def _measure(func: Callable[[Any], Any], inputs: List[Any], warmup: int) -> Dict[str, float]:
+    for item in inputs[:warmup]:
+        func(item)
+    samples = []
+    for item in inputs:
+        start = time.perf_counter_ns()
+        func(item)
+        samples.append(time.perf_counter_ns() - start)
+    return _summarize(samples)
+
+
+async def _measure_async(func: Callable[[Any], Any], inputs: List[Any], warmup: int) -> Dict[str, float]:
+    for item in inputs[:warmup]:
+        await func(item)
+    samples = []
+    for item in inputs:
+        start = time.perf_counter_ns()
+        await func(item)
+        samples.append(time.perf_counter_ns() - start)
+    return _summarize(samples)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(iterations: int = 500, seed: int = 0, profiles: Optional[List[str]] = None,
+        save_iterations: Optional[int] = None) -> Dict[str, Any]:
+    """모든 구간을 프로필별로 측정합니다.
+
+    Args:
+        iterations (int): 구간별 측정 횟수
+        seed (int): 합성 데이터 난수 시드
+        profiles (Optional[List[str]]): 측정할 프로필 (기본값: 전체)
+        save_iterations (Optional[int]): 파일 저장 측정 횟수 (기본값: iterations)
+
+    Returns:
+        Dict[str, Any]: 측정 환경 정보와 결과
+    """
+    from app.api.v1.api import save_analysis_result
+
+    rules = load_rules()
+    generator = QuestionGenerator(
+        translate_client=FakeTranslateClient(),
+        translation_memo=TranslationMemo(seed=rules.word_mapping)
+    )
+    warmup = min(50, iterations)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for profile in profiles or list(PROFILES):
+        rng = random.Random(f"{seed}-{profile}")
+        labels, faces, texts = PROFILES[profile]
+        analyses = [AnalysisResult.from_dict(synthetic_analysis(rng, labels, faces, texts))
+                    for _ in range(iterations)]
+        responses = [{
+            "analysis_result": analysis,
+            "questions": generator.generate_questions(analysis)
+        } for analysis in analyses]
+
+        results[profile] = {
+            "extract_context": _measure(generator._extract_context, analyses, warmup),
+            "generate_questions": _measure(generator.generate_questions, analyses, warmup),
+            "serialize_response": _measure(dumps, responses, warmup),
+        }
+
+        count = save_iterations or iterations
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            os.makedirs("analysis_results")
+            try:
+                results[profile]["save_analysis"] = asyncio.run(
+                    _measure_async(save_analysis_result, responses[:count], min(warmup, count))
+                )
+            finally:
+                os.chdir(cwd)
+
+    return {
+        "benchmark": "question_pipeline",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "iterations": iterations,
+        "seed": seed,
+        "profiles": {name: dict(zip(("labels", "faces", "texts"), PROFILES[name])) for name in results},
+        "results": results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """기준 결과 대비 p50 지연이 max_regression(%) 넘게 늘어난 구간을 반환합니다."""
+    regressions = []
+    for profile, stages in current["results"].items():
+        for stage, stats in stages.items():
+            before = baseline.get("results", {}).get(profile, {}).get(stage)
+            if not before:
+                continue
+            change = (stats["p50_us"] - before["p50_us"]) / before["p50_us"] * 100
+            print(f"{profile:8s} {stage:20s} p50 {before['p50_us']:>10.1f}us -> {stats['p50_us']:>10.1f}us ({change:+.1f}%)")
+            if change > max_regression:
+                regressions.append(f"{profile}/{stage}")
+    return regressions
+
+
+def main() -> None:
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="분석 결과 -> 질문 생성 경로 벤치마크")
+    parser.add_argument("--iterations", type=int, default=500, help="구간별 측정 횟수")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 난수 시드")
+    parser.add_argument("--profile", action="append", choices=list(PROFILES), help="측정할 프로필 (반복 지정 가능)")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="허용할 p50 지연 증가율(%%)")
+    args = parser.parse_args()
+
+    report = run(iterations=args.iterations, seed=args.seed, profiles=args.profile)
+
+    for profile, stages in report["results"].items():
+        for stage, stats in stages.items():
+            print(f"{profile:8s} {stage:20s} {stats['ops_per_sec']:>10.1f} ops/s  "
+                  f"p50 {stats['p50_us']:>9.1f}us  p99 {stats['p99_us']:>9.1f}us")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_regression)
+        if regressions:
+            print(f"성능 저하 구간: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
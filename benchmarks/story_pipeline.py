@@ -0,0 +1,132 @@
+"""스토리 생성 경로의 Gemini 호출 오버헤드 벤치마크
+
+실제 google-generativeai SDK를 사용하되 GenerativeServiceAsyncClient.generate_content를
+즉시 응답하는 스텁으로 바꿔, 네트워크 없이 요청당 SDK 처리 비용만 측정합니다.
+
+    per_request      요청마다 genai.configure + GenerativeModel 생성 (풀 도입 전 방식)
+    pooled           GenerativeModelPool에서 모델 객체 재사용
+    generate_story   StorytellingGenerator.generate_story 전체 (프롬프트 생성 포함, 결과 캐시 무시)
+    cached_story     같은 요청을 반복한 경우 (스토리 결과 캐시 적중)
+
+per_request는 요청마다 비동기 클라이언트(gRPC 채널)를 새로 만들며, 실제 환경에서는
+여기에 연결 수립과 TLS 핸드셰이크 비용이 더해집니다.
+
+실행:
+    python -m benchmarks.story_pipeline --iterations 500
+"""
+from typing import Any, Dict
+import argparse
+import asyncio
+import json
+import os
+import time
+from unittest import mock
+
+os.environ.setdefault("TRANSLATION_CACHE_DB_PATH", "")
+
+import google.generativeai as genai  # noqa: E402
+from google.ai import generativelanguage as glm  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.providers import DEFAULT_STORY  # noqa: E402
+from app.core.storytelling import StorytellingGenerator  # noqa: E402
+from benchmarks.question_pipeline import _measure_async  # noqa: E402
+
+STUB_API_KEY = "stub-" + "0" * 34
+
+QUESTIONS = [
+    {"id": i, "category": category, "level": level, "content": f"질문 {i}", "theme": "general"}
+    for i, (category, level) in enumerate([("temporal", 1), ("sensory", 2), ("relational", 2), ("identity", 3)])
+]
+ANSWERS = [{"id": i, "content": f"답변 {i}"} for i in range(len(QUESTIONS))]
+
+
+async def _stub_generate_content(self, request, **kwargs) -> glm.GenerateContentResponse:
+    return glm.GenerateContentResponse(candidates=[{
+        "content": {"role": "model", "parts": [{"text": DEFAULT_STORY}]},
+        "finish_reason": glm.Candidate.FinishReason.STOP
+    }])
+
+
+async def _per_request(prompt: str) -> str:
+    genai.configure(api_key=STUB_API_KEY)
+    model = genai.GenerativeModel(settings.GEMINI_MODEL)
+    return (await model.generate_content_async(prompt)).text
+
+
+def run(iterations: int = 500) -> Dict[str, Any]:
+    """스텁 전송 계층으로 각 방식의 요청당 지연을 측정합니다.
+
+    Args:
+        iterations (int): 방식별 측정 횟수
+
+    Returns:
+        Dict[str, Any]: 방식별 지연 통계와 풀 통계
+    """
+    original_provider, original_method = settings.AI_PROVIDER, glm.GenerativeServiceAsyncClient.generate_content
+    settings.AI_PROVIDER = "google"
+    glm.GenerativeServiceAsyncClient.generate_content = _stub_generate_content
+    try:
+        with mock.patch.dict(os.environ, {"GOOGLE_API_KEY": STUB_API_KEY}):
+            generator = StorytellingGenerator()
+        pool = generator.models
+        prompt = generator.create_storytelling_prompt(QUESTIONS, ANSWERS)
+        prompts = [prompt] * iterations
+        warmup = min(50, iterations)
+
+        async def pooled(text: str) -> str:
+            model = pool.get(settings.GEMINI_MODEL)
+            return (await model.generate_content_async(text)).text
+
+        async def story(_: str) -> Dict[str, Any]:
+            result = await generator.generate_story(1, QUESTIONS, ANSWERS, options={"regenerate": True})
+            assert result["status"] == "success", result
+            return result
+
+        async def cached_story(_: str) -> Dict[str, Any]:
+            result = await generator.generate_story(1, QUESTIONS, ANSWERS)
+            assert result["status"] == "success", result
+            return result
+
+        async def measure_all() -> Dict[str, Dict[str, Any]]:
+            return {
+                "per_request": await _measure_async(_per_request, prompts, warmup),
+                "pooled": await _measure_async(pooled, prompts, warmup),
+                "generate_story": await _measure_async(story, prompts, warmup),
+                "cached_story": await _measure_async(cached_story, prompts, warmup)
+            }
+
+        results = asyncio.run(measure_all())
+    finally:
+        settings.AI_PROVIDER = original_provider
+        glm.GenerativeServiceAsyncClient.generate_content = original_method
+
+    return {
+        "benchmark": "story_pipeline",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "genai": genai.__version__,
+        "iterations": iterations,
+        "results": results,
+        "pool": pool.stats(),
+        "story_cache": generator.cache_stats()
+    }
+
+
+def main() -> None:
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="스토리 생성 경로의 Gemini 호출 오버헤드 벤치마크")
+    parser.add_argument("--iterations", type=int, default=500, help="방식별 측정 횟수")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    report = run(iterations=args.iterations)
+    for mode, stats in report["results"].items():
+        print(f"{mode:15s} {stats['ops_per_sec']:>10.1f} ops/s  "
+              f"p50 {stats['p50_us']:>9.1f}us  p99 {stats['p99_us']:>9.1f}us")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import asyncio
+import inspect
+import os
+
+# 테스트는 인증 정보 없이 로컬 대체 클라이언트로 실행
+os.environ.setdefault("AI_PROVIDER", "fake")
+os.environ.setdefault("TRANSLATION_CACHE_DB_PATH", "")
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "recordings")
+
+
+def pytest_pyfunc_call(pyfuncitem):
+    """async 테스트 함수를 이벤트 루프에서 실행"""
+    if inspect.iscoroutinefunction(pyfuncitem.obj):
+        arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+        asyncio.run(pyfuncitem.obj(**arguments))
+        return True
+    return None
@@ -0,0 +1,109 @@
+import json
+from array import array
+from app.api.v1.api import save_analysis_result
+from app.core.cache import AnalysisCache
+from app.core.vision import split_annotation
+from app.models.analysis import AnalysisResult, dumps
+from tests.test_vision_batch import _sample_response
+
+
+def _legacy_analysis():
+    return {
+        'labels': [{'description': 'Beach', 'score': 0.9, 'topicality': 0.8}],
+        'objects': [{'name': 'Person', 'score': 0.7,
+                     'bounding_box': {'left': 0.1, 'top': 0.2, 'right': 0.5, 'bottom': 0.9}}],
+        'faces': [{'confidence': 0.95, 'joy': 5, 'sorrow': 1, 'anger': 1, 'surprise': 2,
+                   'bounding_box': {'left': 1, 'top': 2, 'right': 3, 'bottom': 4}}],
+        'landmarks': [],
+        'text': {'full_text': '바다 "SEA"', 'texts': [
+            {'text': '바다', 'confidence': 0.5, 'bounding_box': {'left': 5, 'top': 6, 'right': 7, 'bottom': 8}},
+            {'text': '"SEA"', 'confidence': 0.0, 'bounding_box': {'left': 9, 'top': 10, 'right': 11, 'bottom': 12}}
+        ]},
+        'safe_search': {'adult': 1},
+        'colors': {'dominant_colors': []}
+    }
+
+
+def test_dict_view_matches_legacy_structure():
+    """기존 딕셔너리 형식과 같은 값으로 읽히고 같은 구조의 JSON으로 직렬화되는지 확인"""
+    legacy = _legacy_analysis()
+    result = AnalysisResult.from_dict(legacy)
+
+    assert result == legacy
+    assert result['text']['texts'][1]['bounding_box'] == {'left': 9, 'top': 10, 'right': 11, 'bottom': 12}
+    assert result.get('reused_analysis') is None
+    assert json.loads(result.to_json()) == legacy
+    assert result.to_dict() == legacy
+
+
+def test_non_finite_scores_are_serialized_as_null():
+    """NaN, 무한대 값이 유효하지 않은 JSON 토큰 대신 null로 직렬화되는지 확인"""
+    legacy = _legacy_analysis()
+    legacy['labels'][0]['score'] = float('nan')
+    legacy['objects'][0]['bounding_box']['right'] = float('inf')
+    legacy['faces'][0]['confidence'] = float('-inf')
+    result = AnalysisResult.from_dict(legacy)
+
+    def reject(token):
+        raise AssertionError(f"invalid JSON token: {token}")
+
+    data = json.loads(result.to_json(), parse_constant=reject)
+
+    assert data['labels'][0] == {'description': 'Beach', 'score': None, 'topicality': 0.8}
+    assert data['objects'][0]['bounding_box'] == {'left': 0.1, 'top': 0.2, 'right': None, 'bottom': 0.9}
+    assert data['objects'][0]['score'] == 0.7
+    assert data['faces'][0]['confidence'] is None
+
+
+def test_boxes_are_stored_in_flat_arrays():
+    """Vision 응답의 경계 상자가 항목별 딕셔너리 대신 하나의 배열에 저장되는지 확인"""
+    result = split_annotation(_sample_response())
+
+    assert isinstance(result, AnalysisResult)
+    assert result.faces.boxes == array('i', [1, 2, 3, 4])
+    assert result.text.texts.boxes == array('i', [0, 0, 5, 6])
+    assert result['faces'][0]['joy'] == 5
+
+
+def test_compact_form_round_trips_and_is_smaller():
+    """필드별 배열 형식이 원래 결과로 복원되고 기존 형식보다 작은지 확인"""
+    result = AnalysisResult.from_dict(_legacy_analysis()).with_extra(reused_analysis={'reused': True})
+    compact = result.to_compact_json()
+
+    assert AnalysisResult.load(json.loads(compact)) == result
+    assert result.extra == {'reused_analysis': {'reused': True}}
+    assert len(compact) < len(json.dumps(result.to_dict(), ensure_ascii=False, separators=(",", ":")))
+
+
+def test_dumps_serializes_nested_results():
+    """응답 구조 안의 AnalysisResult를 기존 형식 JSON으로 직렬화하는지 확인"""
+    legacy = _legacy_analysis()
+    data = {"results": [{"index": 0, "analysis_result": AnalysisResult.from_dict(legacy)}], "total": 1}
+
+    assert json.loads(dumps(data)) == {"results": [{"index": 0, "analysis_result": legacy}], "total": 1}
+    assert json.loads(dumps(data, compact=True))["results"][0]["analysis_result"]["format"]
+
+
+def test_disk_cache_restores_analysis_result(tmp_path):
+    """영구 캐시에 저장한 AnalysisResult가 같은 타입으로 복원되는지 확인"""
+    db_path = str(tmp_path / "analysis.sqlite3")
+    result = AnalysisResult.from_dict(_legacy_analysis())
+    AnalysisCache(10, 3600, db_path=db_path, db_max_entries=10).set("key", result)
+
+    restored = AnalysisCache(10, 3600, db_path=db_path, db_max_entries=10).get("key")
+
+    assert isinstance(restored, AnalysisResult)
+    assert restored == result
+
+
+async def test_saved_file_can_be_loaded(tmp_path, monkeypatch):
+    """저장한 분석 결과 파일을 AnalysisResult로 다시 읽을 수 있는지 확인"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "analysis_results").mkdir()
+    legacy = _legacy_analysis()
+
+    path = await save_analysis_result({"analysis_result": AnalysisResult.from_dict(legacy), "questions": []})
+
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert AnalysisResult.load(saved["analysis_result"]) == legacy
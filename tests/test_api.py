@@ -0,0 +1,239 @@
+import asyncio
+import io
+import json
+import time
+from pathlib import Path
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+from app.core.clients import ClientRegistry
+from app.core.config import settings
+from app.core.providers import FakeImageAnnotatorClient, LatencyProfile
+from app.core.upload import UploadSizeLimitMiddleware
+from app.core.vision import VisionAIClient
+from app.models.story import StoryRequest
+import app.api.v1.api as api_module
+import app.main as main_module
+
+
+def _jpeg(color=(30, 120, 200)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    """테스트마다 새 클라이언트 레지스트리와 임시 작업 디렉토리 사용"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "BACKEND_SERVER_HOST", "http://127.0.0.1:9/")
+    registry = ClientRegistry()
+    monkeypatch.setattr(main_module, "clients", registry)
+    monkeypatch.setattr(api_module, "clients", registry)
+    return registry
+
+
+def test_startup_warms_up_and_reports_ready(registry):
+    """기동 시 워밍업 후 /ready가 200을 반환하는지 확인"""
+    with TestClient(main_module.app) as client:
+        response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["clients"] == ["question_generator", "storytelling", "vision"]
+    assert set(response.json()["timings_ms"]) == {"question_generator", "storytelling", "vision"}
+
+
+def test_missing_credentials_do_not_crash_startup(registry, monkeypatch):
+    """인증 파일이 없어도 서버는 기동되고 준비 상태만 실패로 표시되는지 확인"""
+    monkeypatch.setattr(settings, "AI_PROVIDER", "google")
+
+    with TestClient(main_module.app) as client:
+        assert client.get("/health").status_code == 200
+        ready = client.get("/ready")
+
+    assert ready.status_code == 503
+    assert "vision" in ready.json()["errors"]
+
+
+def test_client_built_after_failed_warm_up_restores_readiness(registry, monkeypatch):
+    """워밍업 중 생성에 실패한 클라이언트가 이후 생성에 성공하면 다시 준비 상태가 되는지 확인"""
+    monkeypatch.setattr(settings, "AI_PROVIDER", "google")
+
+    with TestClient(main_module.app) as client:
+        assert client.get("/ready").status_code == 503
+        # 일시적인 인증/네트워크 오류가 해소된 뒤 요청에서 클라이언트 생성
+        monkeypatch.setattr(settings, "AI_PROVIDER", "fake")
+        for name in registry.status()["errors"]:
+            getattr(registry, name)
+        ready = client.get("/ready")
+
+    assert ready.status_code == 200
+    assert ready.json()["errors"] == {}
+    assert "vision" in ready.json()["warmup_errors"]
+
+
+def test_analyze_image_endpoint_returns_questions(registry):
+    """이미지 업로드 분석이 질문 목록을 반환하는지 확인"""
+    with TestClient(main_module.app) as client:
+        response = client.post(
+            "/api/v1/analyze-image",
+            files={"image": ("photo.jpg", _jpeg(), "image/jpeg")}
+        )
+
+    assert response.status_code == 200
+    assert response.json()["analysis_result"]["labels"]
+    assert len(response.json()["questions"]) >= 5
+
+
+def test_concurrent_analyze_image_calls_overlap(registry, monkeypatch):
+    """N개의 동시 /analyze-image 요청이 1개 요청 시간 수준으로 끝나는지 확인"""
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", False)
+    monkeypatch.setattr(settings, "ANALYSIS_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "NEAR_DUPLICATE_ENABLED", False)
+    delay = 0.3
+    stub = FakeImageAnnotatorClient(profile=LatencyProfile(latency_ms=delay * 1000))
+    registry._instances["vision"] = VisionAIClient(client=stub)
+
+    async def run(count: int) -> float:
+        transport = httpx.ASGITransport(app=main_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post("/api/v1/analyze-image",
+                            files={"image": (f"{i}.jpg", _jpeg((i, i, i)), "image/jpeg")})
+                for i in range(count)
+            ))
+            assert all(r.status_code == 200 for r in responses)
+            return time.perf_counter() - start
+
+    count = settings.VISION_MAX_WORKERS
+    with TestClient(main_module.app):
+        elapsed = asyncio.run(run(count))
+
+    # 순차 실행이면 delay * count(2.4초)가 걸린다
+    assert elapsed < delay * 3
+
+
+def test_batch_upload_is_analyzed_in_vision_batch_chunks(registry, monkeypatch):
+    """일괄 업로드를 Vision 배치 크기 단위로 분석하고, 요청 본문 크기 제한이 적용되는지 확인"""
+    monkeypatch.setattr(settings, "VISION_BATCH_SIZE", 2)
+    vision_client = VisionAIClient(client=FakeImageAnnotatorClient())
+    registry._instances["vision"] = vision_client
+    chunk_sizes = []
+    analyze_images = vision_client.analyze_images
+
+    async def recording_analyze_images(contents, features=None):
+        chunk_sizes.append(len(contents))
+        return await analyze_images(contents, features)
+
+    monkeypatch.setattr(vision_client, "analyze_images", recording_analyze_images)
+    files = [("images", (f"{i}.jpg", _jpeg((i * 40, i, i)), "image/jpeg")) for i in range(5)]
+
+    with TestClient(main_module.app) as client:
+        response = client.post("/api/v1/analyze-images", files=files)
+
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 5
+    assert chunk_sizes == [2, 2, 1]
+    limits = {tuple(m.kwargs["paths"]): m.kwargs["max_body_size"]
+              for m in main_module.app.user_middleware if m.cls is UploadSizeLimitMiddleware}
+    assert limits[("/api/v1/analyze-images",)] == settings.analyze_batch_max_body_size
+
+
+def test_oversized_upload_gets_413_with_cors_headers(registry):
+    """크기 제한 미들웨어의 거부 응답도 413이며 CORS 헤더가 붙는지 확인"""
+    oversized = b"\xff\xd8\xff" + b"\x00" * (settings.max_image_size_int + settings.UPLOAD_MULTIPART_OVERHEAD)
+
+    with TestClient(main_module.app) as client:
+        response = client.post("/api/v1/analyze-image", files={"image": ("big.jpg", oversized, "image/jpeg")},
+                               headers={"Origin": "http://localhost:3000"})
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["error_code"] == "FILE_TOO_LARGE"
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+
+def test_image_url_download_is_capped(registry, monkeypatch):
+    """URL 이미지가 크기 제한을 넘으면 전체를 버퍼링하지 않고 FILE_TOO_LARGE로 거부하는지 확인"""
+    monkeypatch.setattr(settings, "MAX_IMAGE_SIZE", "1024")
+    served = []
+
+    async def body():
+        for _ in range(100):
+            served.append(1)
+            yield b"\xff\xd8\xff" + b"\x00" * 509
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(api_module.httpx, "AsyncClient", lambda **kwargs: async_client(transport=transport, **kwargs))
+
+    with TestClient(main_module.app) as client:
+        response = client.post("/api/v1/analyze-image-url", json={"image_url": "http://images.test/big.jpg"})
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["error_code"] == "FILE_TOO_LARGE"
+    assert len(served) < 100
+
+
+def test_story_stream_sends_events_and_saves_result(registry, monkeypatch):
+    """스트리밍 엔드포인트가 조각과 완료 이벤트를 보내고, 끝나면 결과를 저장하고 백엔드로 전송하는지 확인"""
+    sent = []
+
+    async def fake_send(data, endpoint, auth_token=None):
+        sent.append((endpoint, data))
+        return {}
+
+    monkeypatch.setattr(api_module, "send_to_backend", fake_send)
+    story = {"media_id": 7, "questions": [{"id": 1, "category": "temporal", "content": "언제인가요?"}],
+             "answers": [{"id": 1, "content": "여름 휴가"}]}
+
+    with TestClient(main_module.app) as client:
+        with client.stream("POST", "/api/v1/generate-story/stream", json=story) as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = response.read().decode("utf-8")
+
+    events = []
+    for event in filter(None, body.split("\n\n")):
+        name, data = event.split("\n")
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+
+    chunks = [data["text"] for name, data in events if name == "chunk"]
+    name, done = events[-1]
+    assert name == "done" and len(chunks) > 1
+    assert done["status"] == "success" and done["story_content"] == "".join(chunks)
+    saved = list(Path("analysis_results").glob("story_7_*.json"))
+    assert json.loads(saved[0].read_text(encoding="utf-8")) == done
+    assert sent == [("/api/v1/stories/save", done)]
+
+
+def test_story_stream_persists_result_after_disconnect(registry, monkeypatch):
+    """첫 조각을 받은 뒤 연결이 끊겨도 생성을 끝까지 마치고 결과를 저장하는지 확인"""
+    monkeypatch.setattr(settings, "FAKE_PROVIDER_LATENCY_MS", 200.0)
+    sent = []
+
+    async def fake_send(data, endpoint, auth_token=None):
+        sent.append(data)
+        return {}
+
+    monkeypatch.setattr(api_module, "send_to_backend", fake_send)
+    story = StoryRequest(media_id=8, questions=[{"id": 1, "category": "temporal", "content": "언제인가요?"}],
+                         answers=[{"id": 1, "content": "여름 휴가"}])
+
+    async def run():
+        Path("analysis_results").mkdir()
+        response = await api_module.generate_story_stream(story)
+        first = await response.body_iterator.__anext__()
+        # 클라이언트 연결 종료
+        await response.body_iterator.aclose()
+        assert sent == []
+        await api_module.drain_story_tasks()
+        return first
+
+    first = asyncio.run(run())
+
+    assert first.startswith("event: chunk")
+    assert [data["status"] for data in sent] == ["success"]
+    assert sent[0]["story_content"].startswith(json.loads(first.split("data: ")[1])["text"])
+    saved = list(Path("analysis_results").glob("story_8_*.json"))
+    assert json.loads(saved[0].read_text(encoding="utf-8")) == sent[0]
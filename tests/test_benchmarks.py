@@ -0,0 +1,41 @@
+import random
+from benchmarks import prompt_pipeline, story_pipeline
+from benchmarks.question_pipeline import PROFILES, compare, run, synthetic_analysis
+
+
+def test_synthetic_analysis_has_requested_sizes():
+    """합성 분석 결과가 요청한 크기와 analyze_image 결과 구조를 갖는지 확인"""
+    analysis = synthetic_analysis(random.Random(0), labels=50, faces=20, texts=300)
+
+    assert len(analysis["labels"]) == 50
+    assert len(analysis["faces"]) == 20
+    assert len(analysis["text"]["texts"]) == 300
+    assert set(analysis["faces"][0]["bounding_box"]) == {"left", "top", "right", "bottom"}
+
+
+def test_benchmark_report_is_machine_readable(tmp_path):
+    """작은 반복 횟수로 실행한 결과에 모든 구간의 지표가 들어 있는지 확인"""
+    report = run(iterations=5, profiles=["small"])
+
+    stages = report["results"]["small"]
+    assert set(stages) == {"extract_context", "generate_questions", "serialize_response", "save_analysis"}
+    assert all(stats["iterations"] == 5 and stats["p99_us"] >= stats["p50_us"] for stats in stages.values())
+    assert report["profiles"]["small"]["labels"] == PROFILES["small"][0]
+    assert compare(report, report, max_regression=0) == []
+
+
+def test_story_benchmark_uses_stubbed_transport():
+    """스텁 전송 계층으로 모든 방식을 측정하고 풀 모드가 모델 객체를 한 번만 만드는지 확인"""
+    report = story_pipeline.run(iterations=3)
+
+    assert set(report["results"]) == {"per_request", "pooled", "generate_story", "cached_story"}
+    assert report["pool"]["created"] == 1
+
+
+def test_prompt_benchmark_reports_payload_savings():
+    """프롬프트 벤치마크가 생성 비용과 컨텍스트 캐시 사용 시 요청 크기를 측정하는지 확인"""
+    report = prompt_pipeline.run(iterations=3, profiles=["typical"])
+
+    stages = report["results"]["typical"]
+    assert {"legacy_build", "template_build", "request_full", "request_cached"} <= set(stages)
+    assert stages["payload"]["request_bytes_cached"] < stages["payload"]["request_bytes_full"]
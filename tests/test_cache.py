@@ -0,0 +1,147 @@
+import asyncio
+import time
+from app.core.cache import AnalysisCache, LRUCache
+from app.core.config import settings
+from app.core.image_hash import NearDuplicateIndex
+from app.core.vision import VisionAIClient
+from tests.test_image_hash import _photo
+from tests.test_vision_batch import StubAnnotatorClient, _sample_response
+
+
+def test_lru_evicts_least_recently_used():
+    """용량을 넘으면 가장 오래 사용되지 않은 항목이 제거되는지 확인"""
+    cache = LRUCache(max_entries=2, ttl_seconds=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_expires_entries_after_ttl():
+    """TTL이 지난 항목은 조회되지 않는지 확인"""
+    cache = LRUCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("a", 1)
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_disk_tier_survives_new_cache_instance(tmp_path):
+    """영구 계층에 저장된 결과가 새 캐시 인스턴스에서도 조회되는지 확인"""
+    db_path = str(tmp_path / "analysis.sqlite3")
+    AnalysisCache(10, 3600, db_path=db_path, db_max_entries=10).set("key", {"labels": []})
+
+    cache = AnalysisCache(10, 3600, db_path=db_path, db_max_entries=10)
+
+    assert cache.get("key") == {"labels": []}
+    assert cache.stats()["disk"]["hits"] == 1
+    # 디스크 적중 후에는 메모리 계층에서 바로 응답
+    assert cache.get("key") == {"labels": []}
+    assert cache.stats()["memory"]["hits"] == 1
+
+
+def test_async_access_reads_and_writes_disk_tier(tmp_path):
+    """비동기 조회/저장이 동기 API와 같은 영구 계층을 사용하는지 확인"""
+    db_path = str(tmp_path / "analysis.sqlite3")
+
+    async def run():
+        await AnalysisCache(10, 3600, db_path=db_path, db_max_entries=10).set_many_async(
+            [("a", {"i": 1}), ("b", {"i": 2})])
+        cache = AnalysisCache(10, 3600, db_path=db_path, db_max_entries=10)
+        return cache, await cache.get_async("b"), await cache.get_async("missing")
+
+    cache, hit, missing = asyncio.run(run())
+
+    assert (hit, missing) == ({"i": 2}, None)
+    assert cache.get("a") == {"i": 1}
+    assert cache.stats()["disk"]["hits"] == 2
+
+
+def test_disk_tier_respects_size_limit(tmp_path):
+    """영구 계층이 최대 항목 수를 넘지 않는지 확인"""
+    cache = AnalysisCache(10, 3600, db_path=str(tmp_path / "c.sqlite3"), db_max_entries=3)
+    for i in range(5):
+        cache.set(f"key{i}", {"i": i})
+
+    assert len(cache.disk) == 3
+
+
+def test_disk_tier_evicts_only_when_over_limit(tmp_path):
+    """제거 쿼리가 쓰기마다가 아니라 최대 항목 수를 넘었을 때만 실행되는지 확인"""
+    cache = AnalysisCache(10, 3600, db_path=str(tmp_path / "c.sqlite3"), db_max_entries=100)
+    statements = []
+    cache.disk._conn.set_trace_callback(statements.append)
+    for i in range(150):
+        cache.set(f"key{i}", {"i": i})
+
+    deletes = [sql for sql in statements if sql.startswith("DELETE")]
+    # 101번째 쓰기에서 90개로 줄인 뒤 11번 쓰기마다 한 번씩 제거
+    assert len(deletes) == 5
+    assert len(cache.disk) <= 100
+    assert cache.disk.get("key149") == {"i": 149}
+    assert cache.disk.get("key0") is None
+
+
+def test_repeated_image_skips_vision_request():
+    """같은 이미지 바이트로 다시 요청하면 RPC 없이 캐시 결과를 반환하는지 확인"""
+    stub = StubAnnotatorClient(_sample_response())
+    client = VisionAIClient(client=stub, cache=AnalysisCache(10, 3600))
+
+    first = asyncio.run(client.analyze_image(b"same-image"))
+    second = asyncio.run(client.analyze_image(b"same-image"))
+
+    assert len(stub.calls) == 1
+    assert second is first
+    assert client.cache.stats()["memory"]["hits"] == 1
+
+
+def test_cache_entries_are_separated_by_feature_set():
+    """기능 목록이 다르면 별도의 분석으로 취급하는지 확인"""
+    stub = StubAnnotatorClient(_sample_response())
+    client = VisionAIClient(client=stub, cache=AnalysisCache(10, 3600))
+
+    asyncio.run(client.analyze_image(b"same-image", features="labels"))
+    asyncio.run(client.analyze_image(b"same-image", features="full"))
+
+    assert len(stub.calls) == 2
+
+
+def test_failed_analysis_is_not_cached():
+    """요청이 실패해 기본값으로 대체된 결과는 캐시하지 않는지 확인"""
+    stub = StubAnnotatorClient(error=RuntimeError("boom"))
+    client = VisionAIClient(client=stub, cache=AnalysisCache(10, 3600))
+
+    asyncio.run(client.analyze_image(b"image"))
+    asyncio.run(client.analyze_image(b"image"))
+
+    assert len(stub.calls) == 2
+
+
+class FailingFaceStubClient(StubAnnotatorClient):
+    """얼굴 감지 요청만 실패하는 테스트용 Vision 클라이언트"""
+
+    def face_detection(self, image, **kwargs):
+        self.calls.append({'image': image, 'features': []})
+        raise RuntimeError("face detection unavailable")
+
+
+def test_partial_detector_failure_is_not_cached(monkeypatch):
+    """기능별 호출 모드에서 감지기 하나라도 실패하면 캐시와 유사 이미지 색인에 저장하지 않는지 확인"""
+    monkeypatch.setattr(settings, "VISION_BATCH_ANNOTATE", False)
+    stub = FailingFaceStubClient(_sample_response())
+    client = VisionAIClient(client=stub, cache=AnalysisCache(10, 3600),
+                            near_duplicates=NearDuplicateIndex(16, 4, 3600))
+
+    first = asyncio.run(client.analyze_image(_photo(1)))
+    asyncio.run(client.analyze_image(_photo(1)))
+
+    assert first['faces'] == [] and len(first['labels']) == 2
+    assert len(stub.calls) == 4
+    assert len(client.cache.memory) == 0
+    assert client.near_duplicates.matches == 0
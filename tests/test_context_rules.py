@@ -0,0 +1,44 @@
+import itertools
+import random
+from app.core.context_rules import ContextMatcher
+from app.core.question_rules import load_rules
+
+CONTEXT_RULES = load_rules().context_rules
+
+
+def _reference_slots(desc):
+    """규칙 표를 키워드별로 하나씩 검사하는 기준 구현"""
+    slots = set()
+    for slot, mode, keywords in CONTEXT_RULES:
+        if mode == 'exact' and desc in keywords:
+            slots.add(slot)
+        elif mode == 'substring' and any(word in desc for word in keywords):
+            slots.add(slot)
+    return slots
+
+
+def test_matches_reference_on_generated_labels():
+    """키워드 조합과 임의 문자열 레이블에서 기준 구현과 같은 결과를 내는지 확인"""
+    keywords = [keyword for _, _, words in CONTEXT_RULES for keyword in words]
+    fillers = ["", " ", "s", "side", "light", "ball", "x"]
+    labels = {a + b + c for a, b, c in itertools.product(keywords + fillers, fillers, keywords + fillers)}
+    rng = random.Random(0)
+    labels |= {"".join(rng.choice("abcdeilmnorstuy ") for _ in range(rng.randint(1, 12))) for _ in range(2000)}
+
+    matcher = ContextMatcher(CONTEXT_RULES)
+
+    for label in labels:
+        assert matcher.match(label) == _reference_slots(label), label
+
+
+def test_overlapping_keywords_report_every_slot():
+    """같은 위치에서 시작하는 짧은 키워드의 슬롯도 함께 보고되는지 확인"""
+    matcher = ContextMatcher((
+        ('location', 'substring', ('sea',)),
+        ('activity', 'substring', ('seashore walk',)),
+        ('emotion_positive', 'exact', ('seashore walk',)),
+    ))
+
+    assert matcher.match("seashore walk") == {'location', 'activity', 'emotion_positive'}
+    assert matcher.match("the seashore") == {'location'}
+    assert matcher.match("forest") == set()
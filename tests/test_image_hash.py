@@ -0,0 +1,82 @@
+import asyncio
+import io
+import numpy as np
+from PIL import Image
+from app.core.cache import AnalysisCache
+from app.core.image_hash import NearDuplicateIndex, dhash, hamming_distance
+from app.core.vision import VisionAIClient
+from tests.test_vision_batch import StubAnnotatorClient, _sample_response
+
+
+def _photo(seed: int, noise: float = 0.0, size=(640, 480)) -> bytes:
+    """seed별로 다른 그라데이션 패턴을 가진 JPEG 이미지를 만든다"""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, (6, 8, 3)).astype(np.float64)
+    image = np.asarray(Image.fromarray(base.astype(np.uint8)).resize(size, Image.Resampling.BICUBIC),
+                       dtype=np.float64)
+    if noise:
+        image += np.random.default_rng(seed + 1000).normal(0, noise, image.shape)
+    buffer = io.BytesIO()
+    Image.fromarray(np.clip(image, 0, 255).astype(np.uint8)).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def test_dhash_is_close_for_burst_shots_and_far_for_other_photos():
+    """노이즈만 다른 이미지는 가깝고 다른 이미지는 먼지 확인"""
+    original = dhash(_photo(1))
+    burst = dhash(_photo(1, noise=3.0))
+    other = dhash(_photo(2))
+
+    assert hamming_distance(original, burst) <= 4
+    assert hamming_distance(original, other) > 10
+    assert dhash(b"not an image") is None
+
+
+def test_index_returns_closest_entry_with_required_features():
+    """필요한 기능을 포함하는 가장 가까운 항목을 반환하는지 확인"""
+    index = NearDuplicateIndex(capacity=8, max_distance=4, ttl_seconds=0)
+    index.add(0b1111, ("labels",), {"id": "labels-only"})
+    index.add(0b0111, ("labels", "faces"), {"id": "full"})
+
+    assert index.find(0b1111, ("labels",))[0]["id"] == "labels-only"
+    assert index.find(0b1111, ("labels", "faces")) == ({"id": "full"}, 1, 0b0111)
+    assert index.find(0xFFFF0000, ("labels",)) is None
+
+
+def test_index_overwrites_oldest_entries():
+    """용량을 넘으면 가장 오래된 항목부터 덮어쓰는지 확인"""
+    index = NearDuplicateIndex(capacity=2, max_distance=0, ttl_seconds=0)
+    for phash in (1, 2, 3):
+        index.add(phash, ("labels",), {"hash": phash})
+
+    assert index.find(1, ("labels",)) is None
+    assert index.find(3, ("labels",))[0] == {"hash": 3}
+
+
+def test_near_duplicate_upload_reuses_analysis():
+    """최근 분석한 이미지와 유사한 업로드는 Vision 호출 없이 재사용 표시와 함께 반환되는지 확인"""
+    stub = StubAnnotatorClient(_sample_response())
+    client = VisionAIClient(client=stub, cache=AnalysisCache(10, 3600),
+                            near_duplicates=NearDuplicateIndex(16, 4, 3600))
+
+    first = asyncio.run(client.analyze_image(_photo(1)))
+    reused = asyncio.run(client.analyze_image(_photo(1, noise=3.0)))
+    asyncio.run(client.analyze_image(_photo(2)))
+
+    assert len(stub.calls) == 2
+    assert "reused_analysis" not in first
+    assert reused["reused_analysis"]["reused"] is True
+    assert reused["labels"] == first["labels"]
+
+
+def test_batch_requests_only_one_image_per_burst():
+    """배치 안의 연사 이미지는 대표 이미지만 요청하고 나머지는 결과를 공유하는지 확인"""
+    stub = StubAnnotatorClient(_sample_response())
+    client = VisionAIClient(client=stub, cache=AnalysisCache(10, 3600),
+                            near_duplicates=NearDuplicateIndex(16, 4, 3600))
+    contents = [_photo(1), _photo(1, noise=3.0), _photo(2), _photo(1, noise=2.0)]
+
+    results = asyncio.run(client.analyze_images(contents))
+
+    assert [len(requests) for requests in stub.calls] == [2]
+    assert [("reused_analysis" in r) for r in results] == [False, True, False, True]
@@ -0,0 +1,61 @@
+import io
+from PIL import Image
+from app.core.image_processing import preprocess_image
+
+
+def _jpeg_bytes(size, orientation: int = 1) -> bytes:
+    image = Image.new("RGB", size, (200, 120, 40))
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x010F] = "TestCamera"
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=95, exif=exif)
+    return buffer.getvalue()
+
+
+def test_large_image_is_downscaled_and_stripped():
+    """긴 변이 최대값으로 축소되고 EXIF가 제거되는지 확인"""
+    content = _jpeg_bytes((4000, 3000))
+
+    processed, stats = preprocess_image(content, max_edge=1000, quality=80)
+
+    with Image.open(io.BytesIO(processed)) as image:
+        assert max(image.size) == 1000
+        assert not image.getexif()
+    assert stats["resized"] is True
+    assert stats["bytes_saved"] == len(content) - len(processed) > 0
+
+
+def test_exif_orientation_is_applied():
+    """EXIF 회전 정보가 실제 픽셀에 반영되는지 확인"""
+    content = _jpeg_bytes((300, 100), orientation=6)
+
+    processed, _ = preprocess_image(content, max_edge=1000)
+
+    with Image.open(io.BytesIO(processed)) as image:
+        assert image.size == (100, 300)
+
+
+def test_undecodable_content_is_returned_unchanged():
+    """이미지가 아닌 데이터는 그대로 반환되는지 확인"""
+    processed, stats = preprocess_image(b"not an image", max_edge=1000)
+
+    assert processed == b"not an image"
+    assert stats["bytes_saved"] == 0
+
+
+def test_gps_exif_is_stripped_even_without_savings():
+    """용량 절감이 없어도 GPS EXIF가 있는 이미지는 메타데이터 없이 재인코딩되는지 확인"""
+    image = Image.effect_noise((64, 64), 64).convert("RGB")
+    exif = Image.Exif()
+    exif[0x8825] = {1: "N", 2: (37.0, 33.0, 0.0), 3: "E", 4: (126.0, 58.0, 0.0)}
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=30, exif=exif)
+    content = buffer.getvalue()
+
+    processed, stats = preprocess_image(content, max_edge=1000, quality=95)
+
+    assert stats["bytes_saved"] <= 0
+    with Image.open(io.BytesIO(processed)) as result:
+        assert not result.getexif()
+        assert "exif" not in result.info
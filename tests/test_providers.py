@@ -0,0 +1,123 @@
+import asyncio
+import time
+import pytest
+from app.core.config import settings
+from app.core.providers import (
+    FakeGenerativeModel, FakeImageAnnotatorClient, FakeProviderError, FakeTranslateClient,
+    GenerativeModelPool, LatencyProfile
+)
+from app.core.question_generator import QuestionGenerator
+from app.core.storytelling import StorytellingGenerator
+from app.core.vision import VisionAIClient
+from tests.conftest import RECORDINGS_DIR
+
+
+@pytest.fixture
+def recordings(monkeypatch):
+    monkeypatch.setattr(settings, "FAKE_PROVIDER_RECORDINGS_DIR", RECORDINGS_DIR)
+
+
+def test_fake_vision_replays_recorded_response(recordings):
+    """기록된 Vision 응답이 analyze_image 결과로 재생되는지 확인"""
+    client = VisionAIClient(cache=None, near_duplicates=None)
+
+    result = asyncio.run(client.analyze_image(b"any-image", features="full"))
+
+    assert isinstance(client.client, FakeImageAnnotatorClient)
+    assert [label['description'] for label in result['labels']][:2] == ['Beach', 'Sea']
+    assert len(result['faces']) == 2
+
+
+def test_latency_profile_injects_delay_and_errors():
+    """지연과 오류율이 주입되는지 확인"""
+    client = FakeImageAnnotatorClient(profile=LatencyProfile(latency_ms=50))
+    start = time.perf_counter()
+    client.annotate_image({'image': {'content': b"x"}})
+    assert time.perf_counter() - start >= 0.05
+
+    failing = FakeTranslateClient(profile=LatencyProfile(error_rate=1.0))
+    with pytest.raises(FakeProviderError):
+        failing.translate("Sky", target_language='ko')
+
+
+def test_latency_profile_is_reproducible_with_seed():
+    """같은 시드는 같은 지연/오류 순서를 만드는지 확인"""
+    first = LatencyProfile(jitter_ms=100, error_rate=0.5, seed=7)
+    second = LatencyProfile(jitter_ms=100, error_rate=0.5, seed=7)
+
+    assert [first._draw() for _ in range(20)] == [second._draw() for _ in range(20)]
+
+
+def test_fake_translate_supports_single_and_bulk_calls(recordings):
+    """translate_v2.Client와 같은 형태로 단건/다건 결과를 반환하는지 확인"""
+    client = FakeTranslateClient.from_settings()
+
+    assert client.translate("Sky", target_language='ko')['translatedText'] == "하늘"
+    assert [r['translatedText'] for r in client.translate(["Tree", "Unknown"])] == ["나무", "Unknown"]
+
+
+def test_question_generator_uses_fake_translation(recordings):
+    """질문 생성기가 대체 번역 클라이언트를 사용하는지 확인"""
+    generator = QuestionGenerator()
+
+    assert isinstance(generator.translate_client, FakeTranslateClient)
+    assert generator._translate_context("Sky") == "하늘"
+
+
+def test_storytelling_uses_fake_gemini(recordings):
+    """API 키 없이 대체 Gemini 모델로 스토리를 생성하는지 확인"""
+    generator = StorytellingGenerator()
+    questions = [{"id": 1, "category": "temporal", "content": "언제인가요?"}]
+    answers = [{"id": 1, "content": "여름 휴가"}]
+
+    result = asyncio.run(generator.generate_story(1, questions, answers))
+
+    assert result["status"] == "success"
+    assert "해변" in result["story_content"]
+
+
+def test_storytelling_reuses_pooled_model(recordings):
+    """요청마다 모델 객체를 새로 만들지 않고 모델 이름과 생성 설정별로 재사용하는지 확인"""
+    generator = StorytellingGenerator()
+    questions = [{"id": 1, "category": "temporal", "content": "언제인가요?"}]
+    answers = [{"id": 1, "content": "여름 휴가"}]
+
+    async def run():
+        # 스토리 결과 캐시를 거치지 않고 매번 모델을 호출
+        for _ in range(3):
+            await generator.generate_story(1, questions, answers, options={"regenerate": True})
+        await generator.generate_story(1, questions, answers,
+                                       options={"regenerate": True, "generation_config": {"temperature": 0.2}})
+
+    asyncio.run(run())
+
+    stats = generator.models.stats()
+    assert (stats["models"], stats["max_models"]) == (2, settings.GEMINI_MODEL_POOL_SIZE)
+    assert (stats["created"], stats["hits"]) == (2, 2)
+
+
+def test_model_pool_evicts_least_recently_used():
+    """최대 개수를 넘으면 가장 오래 사용되지 않은 모델 객체가 제거되는지 확인"""
+    pool = GenerativeModelPool(max_models=2)
+    flash = pool.get("gemini-1.5-flash")
+    pool.get("gemini-1.5-pro")
+    assert pool.get("gemini-1.5-flash") is flash
+    pool.get("gemini-1.5-flash", {"temperature": 0.5})
+
+    assert pool.get("gemini-1.5-flash") is flash
+    assert pool.get("gemini-1.5-flash", {"temperature": 0.5}) is pool.get("gemini-1.5-flash", {"temperature": 0.5})
+    assert pool.stats()["created"] == 3
+    pool.get("gemini-1.5-pro")
+    assert pool.stats()["created"] == 4
+
+
+def test_fake_gemini_async_latency():
+    """대체 Gemini 호출이 이벤트 루프를 막지 않고 지연되는지 확인"""
+    model = FakeGenerativeModel(profile=LatencyProfile(latency_ms=100))
+
+    async def run():
+        start = time.perf_counter()
+        await asyncio.gather(*(model.generate_content_async("prompt") for _ in range(5)))
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) < 0.3
@@ -0,0 +1,65 @@
+import numpy as np
+from app.core.question_dedup import QuestionDeduplicator
+from app.core.question_generator import QuestionGenerator
+from app.core.question_ranking import QuestionRanker
+
+EMOTION = "이 순간의 감정이 이후의 삶에 어떤 영향을 주었나요?"
+MEETING = "이 만남이 이후의 관계에 어떤 영향을 주었나요?"
+PEOPLE = "사진 속 사람들은 누구인가요?"
+
+
+def _candidates():
+    return [
+        {"category": "temporal", "level": 3, "question": EMOTION},
+        {"category": "relational", "level": 3, "question": MEETING},
+        {"category": "relational", "level": 1, "question": PEOPLE},
+    ]
+
+
+def test_similar_questions_are_dropped():
+    """의미가 겹치는 질문 중 점수가 높은 것만 남는지 확인"""
+    deduplicator = QuestionDeduplicator([EMOTION, MEETING, PEOPLE])
+    ranker = QuestionRanker([], min_count=0, max_count=10, min_score=0.0, deduplicator=deduplicator)
+
+    selected = ranker.select(_candidates(), np.array([0.9, 0.8, 0.7]))
+
+    assert [q["question"] for q in selected] == [PEOPLE, EMOTION]
+
+
+def test_without_deduplicator_keeps_both():
+    """중복 제거를 끄면 두 질문이 모두 선택되는지 확인"""
+    ranker = QuestionRanker([], min_count=0, max_count=10, min_score=0.0)
+
+    selected = ranker.select(_candidates(), np.array([0.9, 0.8, 0.7]))
+
+    assert len(selected) == 3
+
+
+def test_unseen_sentences_are_vectorized_once():
+    """템플릿은 미리 계산하고 처음 보는 문장은 캐시되는지 확인"""
+    deduplicator = QuestionDeduplicator([EMOTION, PEOPLE])
+    sentence = "이 해변에서의 특별한 소리나 냄새가 기억나시나요?"
+
+    first = deduplicator.vector(sentence)
+    second = deduplicator.vector(sentence)
+
+    assert deduplicator.vector(EMOTION) is deduplicator._precomputed[EMOTION]
+    assert first is second
+    assert abs(float(np.linalg.norm(first)) - 1.0) < 1e-5
+
+
+def test_generated_questions_have_no_near_duplicates():
+    """생성된 질문끼리의 유사도가 기준보다 낮은지 확인"""
+    generator = QuestionGenerator()
+    analysis = {
+        "labels": [{"description": "Smile", "score": 0.95}, {"description": "Wedding", "score": 0.9}],
+        "faces": [{"confidence": 0.9}, {"confidence": 0.8}]
+    }
+
+    questions = [q["question"] for q in generator.generate_questions(analysis)]
+    deduplicator = generator.ranker.deduplicator
+    vectors = deduplicator.vectors(questions)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+
+    assert similarity.max() < deduplicator.threshold
@@ -0,0 +1,66 @@
+import time
+from app.core.question_generator import QuestionGenerator
+
+
+def _analysis(labels, faces=0):
+    return {
+        "labels": [{"description": d, "score": s} for d, s in labels],
+        "faces": [{"confidence": 0.9} for _ in range(faces)]
+    }
+
+
+def test_selection_respects_count_category_and_level_order():
+    """질문 수, 카테고리별 상한, 쉬운 레벨부터의 정렬을 지키는지 확인"""
+    generator = QuestionGenerator()
+    analysis = _analysis([("Beach", 0.93), ("Smile", 0.9), ("Party", 0.7),
+                          ("Sunny", 0.6), ("Evening", 0.8), ("Graduation", 0.85)], faces=3)
+
+    questions = generator.generate_questions(analysis)
+
+    assert 5 <= len(questions) <= 10
+    levels = [q["level"] for q in questions]
+    assert levels == sorted(levels)
+    for category in {q["category"] for q in questions}:
+        assert sum(q["category"] == category for q in questions) <= 3
+    assert len({q["question"] for q in questions}) == len(questions)
+    assert "이 해변에서의 특별한 소리나 냄새가 기억나시나요?" in [q["question"] for q in questions]
+
+
+def test_sparse_analysis_fills_minimum_without_people_questions():
+    """신호가 적으면 템플릿으로 최소 개수를 채우되 사람이 없으면 관계 질문을 넣지 않는지 확인"""
+    generator = QuestionGenerator()
+
+    questions = generator.generate_questions(_analysis([("Sky", 0.9)]))
+
+    assert len(questions) == 5
+    assert all(q["category"] != "relational" for q in questions)
+
+
+def test_stronger_signal_wins_level_slot():
+    """같은 레벨의 후보 중 신호 점수가 높은 질문이 선택되는지 확인"""
+    generator = QuestionGenerator()
+    generator.ranker.min_count = generator.ranker.max_count = 3
+    party = "이 파티을(를) 계획하게 된 계기가 있었나요?"
+    weather = "저녁의 맑은 날씨는 어떤 느낌이었나요?"
+
+    strong_party = generator.generate_questions(
+        _analysis([("Party", 0.99), ("Sunny", 0.55), ("Evening", 0.55)]))
+    strong_weather = generator.generate_questions(
+        _analysis([("Party", 0.55), ("Sunny", 0.99), ("Evening", 0.99)]))
+
+    assert [q["level"] for q in strong_party] == [1, 2, 3]
+    assert strong_party[1]["question"] == party
+    assert strong_weather[1]["question"] == weather
+
+
+def test_ranking_is_fast():
+    """한 번의 순위 계산이 1ms 미만인지 확인"""
+    generator = QuestionGenerator()
+    analysis = _analysis([(f"label{i}", 0.5) for i in range(40)] + [("Party", 0.9)], faces=5)
+    generator.generate_questions(analysis)
+
+    count = 200
+    start = time.perf_counter()
+    for _ in range(count):
+        generator.generate_questions(analysis)
+    assert (time.perf_counter() - start) / count < 0.001
@@ -0,0 +1,73 @@
+import json
+import pytest
+from app.core.question_regeneration import RegenerationError, regenerate
+from app.models.analysis import AnalysisResult, dumps
+from tests.test_analysis import _legacy_analysis
+
+
+def _write_inputs(directory):
+    """단일 분석 파일 5개(기존/필드별 배열 형식), 일괄 분석 파일, 스토리 파일, 손상된 파일을 만든다"""
+    directory.mkdir()
+    analysis = _legacy_analysis()
+    for i in range(5):
+        result = analysis if i % 2 else AnalysisResult.from_dict(analysis)
+        (directory / f"analysis_{i}.json").write_text(
+            dumps({"analysis_result": result, "questions": []}, compact=True), encoding="utf-8"
+        )
+    (directory / "analysis_batch_0.json").write_text(json.dumps({"results": [
+        {"index": 0, "status": "success", "analysis_result": analysis},
+        {"index": 1, "status": "error", "error": {"error_code": "ANALYSIS_FAILED"}},
+        {"index": 2, "status": "success", "analysis_result": analysis}
+    ]}), encoding="utf-8")
+    (directory / "story_1.json").write_text(json.dumps({"status": "success"}), encoding="utf-8")
+    (directory / "z_broken.json").write_text("{", encoding="utf-8")
+
+
+def _read_output(directory):
+    return [json.loads(line) for path in sorted(directory.glob("part-*.jsonl")) for line in path.read_text().splitlines()]
+
+
+def test_resumes_from_checkpoint(tmp_path):
+    """중단 후 다시 실행하면 남은 청크만 처리하고 모든 분석 결과의 질문을 출력하는지 확인"""
+    _write_inputs(tmp_path / "in")
+    output = tmp_path / "out"
+
+    first = regenerate(str(tmp_path / "in"), str(output), workers=1, chunk_size=3, max_chunks=2)
+    second = regenerate(str(tmp_path / "in"), str(output), workers=1, chunk_size=3)
+    third = regenerate(str(tmp_path / "in"), str(output), workers=1, chunk_size=3)
+
+    assert (first["processed_chunks"], first["remaining_chunks"]) == (2, 1)
+    assert (second["processed_chunks"], second["remaining_chunks"]) == (1, 0)
+    assert third["processed_chunks"] == 0
+    assert first["analyses"] + second["analyses"] == 7
+    assert first["skipped_files"] + second["skipped_files"] == 1
+
+    records = _read_output(output)
+    assert len(records) == 8
+    assert [r["source"] for r in records if "error" in r] == ["z_broken.json"]
+    assert sorted(r["index"] for r in records if r["source"] == "analysis_batch_0.json") == [0, 2]
+    assert all(len(r["questions"]) >= 5 for r in records if "questions" in r)
+
+
+def test_process_pool_matches_single_process(tmp_path):
+    """프로세스 풀로 처리한 결과가 단일 프로세스 처리 결과와 같은지 확인"""
+    _write_inputs(tmp_path / "in")
+
+    regenerate(str(tmp_path / "in"), str(tmp_path / "single"), workers=1, chunk_size=2)
+    summary = regenerate(str(tmp_path / "in"), str(tmp_path / "pool"), workers=2, chunk_size=2)
+
+    assert summary["processed_chunks"] == 4
+    assert _read_output(tmp_path / "pool") == _read_output(tmp_path / "single")
+
+
+def test_refuses_checkpoint_with_different_chunk_size(tmp_path):
+    """청크 크기가 다른 체크포인트로는 이어서 실행하지 않는지 확인"""
+    _write_inputs(tmp_path / "in")
+    regenerate(str(tmp_path / "in"), str(tmp_path / "out"), workers=1, chunk_size=3, max_chunks=1)
+
+    with pytest.raises(RegenerationError):
+        regenerate(str(tmp_path / "in"), str(tmp_path / "out"), workers=1, chunk_size=4)
+
+    summary = regenerate(str(tmp_path / "in"), str(tmp_path / "out"), workers=1, chunk_size=4, restart=True)
+    assert summary["remaining_chunks"] == 0
+    assert len(_read_output(tmp_path / "out")) == 8
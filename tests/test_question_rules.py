@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+import pytest
+from app.core.question_generator import QuestionGenerator
+from app.core.question_rules import (
+    DEFAULT_RULES_PATH, QuestionCategory, QuestionLevel, QuestionRuleStore, QuestionRulesError, load_rules
+)
+
+
+@pytest.fixture
+def rules_path(tmp_path):
+    path = tmp_path / "question_rules.json"
+    with open(DEFAULT_RULES_PATH, encoding="utf-8") as f:
+        path.write_text(f.read(), encoding="utf-8")
+    return path
+
+
+def _edit(path, change):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    change(data)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    # 같은 타임스탬프 단위 안의 수정도 감지되도록 mtime을 앞당김
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_bundled_rules_compile():
+    """기본 규칙 파일이 모든 카테고리/레벨 템플릿을 포함해 컴파일되는지 확인"""
+    rules = load_rules()
+
+    assert rules.version == 1
+    assert rules.word_mapping["beach"] == "해변"
+    assert "graduation" in rules.achievement_labels
+    for category in QuestionCategory:
+        for level in QuestionLevel:
+            assert rules.question_templates[category][level]
+
+
+def test_reload_swaps_snapshot_and_keeps_old_one_intact(rules_path):
+    """다시 읽으면 새 스냅샷으로 교체되고 이전 스냅샷은 그대로 유지되는지 확인"""
+    store = QuestionRuleStore(str(rules_path))
+    generator = QuestionGenerator(rules_store=store)
+    before = store.current
+
+    _edit(rules_path, lambda data: data["word_mapping"].update({"sky": "창공"}))
+    store.reload()
+
+    assert store.current is not before
+    assert "sky" not in before.word_mapping
+    assert generator.word_mapping["sky"] == "창공"
+    assert generator.translation_memo.get("sky") == "창공"
+
+
+def test_invalid_rules_keep_previous_snapshot(rules_path):
+    """잘못된 규칙 파일은 거부하고 기존 규칙을 유지하는지 확인"""
+    store = QuestionRuleStore(str(rules_path))
+    before = store.current
+
+    _edit(rules_path, lambda data: data["question_templates"]["temporal"].update({"BASIC": []}))
+    with pytest.raises(QuestionRulesError):
+        store.reload()
+
+    assert store.current is before
+    assert store.stats()["failures"] == 1
+
+
+def test_changed_file_is_picked_up_after_interval(rules_path):
+    """확인 주기가 지나면 변경된 파일을 자동으로 다시 읽는지 확인"""
+    store = QuestionRuleStore(str(rules_path), check_interval=0.01)
+    _edit(rules_path, lambda data: data.update({"revision": "tuned"}))
+
+    deadline = time.monotonic() + 2.0
+    while store.get().revision != "tuned" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.close()
+
+    assert store.get().revision == "tuned"
+    assert store.reloads == 1
+
+
+def test_get_does_not_touch_rules_file(rules_path, monkeypatch):
+    """요청 경로의 get()은 파일 확인이나 다시 읽기 없이 현재 참조만 반환하는지 확인"""
+    store = QuestionRuleStore(str(rules_path), check_interval=60.0)
+    before = store.current
+    _edit(rules_path, lambda data: data.update({"revision": "tuned"}))
+    monkeypatch.setattr(os, "stat", lambda *args, **kwargs: pytest.fail("get()에서 파일을 확인함"))
+
+    assert all(store.get() is before for _ in range(100))
+    monkeypatch.undo()
+    store.close()
+
+
+def test_readers_are_not_blocked_during_reload(rules_path):
+    """다시 읽는 동안에도 다른 스레드가 기존 규칙으로 질문을 생성하는지 확인"""
+    store = QuestionRuleStore(str(rules_path))
+    generator = QuestionGenerator(rules_store=store)
+    analysis = {"labels": [{"description": "Beach", "score": 0.9}], "faces": [{"confidence": 0.9}]}
+    errors = []
+
+    def generate():
+        try:
+            for _ in range(50):
+                assert len(generator.generate_questions(analysis)) >= 5
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=generate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for _ in range(5):
+        store.reload()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert store.reloads == 5
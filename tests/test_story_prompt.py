@@ -0,0 +1,144 @@
+import asyncio
+import random
+import threading
+import time
+import app.core.providers as providers
+from app.core.config import settings
+from app.core.story_prompt import StoryPromptTemplate
+from app.core.storytelling import StorytellingGenerator
+from benchmarks.prompt_pipeline import legacy_prompt, synthetic_story_request
+
+QUESTIONS = [{"id": 1, "category": "temporal", "content": "언제인가요?"}]
+ANSWERS = [{"id": 1, "content": "여름 휴가"}]
+
+
+def test_template_matches_legacy_prompt():
+    """지시문 재사용과 답변 id 색인을 사용해도 변경 전과 같은 프롬프트를 만드는지 확인"""
+    template = StoryPromptTemplate()
+    rng = random.Random(3)
+    edge_cases = {
+        "questions": [
+            {"id": 1, "content": "카테고리 없음"},
+            {"id": 2, "category": "sensory", "theme": "", "level": 3, "content": "빈 테마"},
+            {"id": 9, "category": "sensory", "theme": None, "content": "답변 없음"},
+            {"category": "identity", "content": "id 없음"}
+        ],
+        "answers": [{"id": 2}, {"id": 1, "content": "첫 답변"}, {"id": 1, "content": "중복 답변"}],
+        "options": {"style": None, "length": "unknown"}
+    }
+    requests = [synthetic_story_request(rng, count) for count in (0, 1, 5, 40)] + [edge_cases]
+    for options in (None, {}, {"length": "long"}, {"style": "playful", "length": "short"}):
+        requests.append({**requests[2], "options": options})
+
+    for request in requests:
+        expected = legacy_prompt(request["questions"], request["answers"], request["options"])
+        prefix, body = template.split(request["questions"], request["answers"], request["options"])
+        assert prefix + body == expected
+        assert template.render(request["questions"], request["answers"], request["options"]) == expected
+
+
+def test_prefix_is_built_once_per_style_and_length():
+    """지시문은 (style, length) 조합별로 한 번만 만들고 보관 수가 제한되는지 확인"""
+    template = StoryPromptTemplate(max_prefixes=2)
+    first = template.prefix({"length": "short"})
+
+    assert template.prefix({"length": "short"}) is first
+    assert template.prefix({"style": "warmly reflective", "length": "short"}) is first
+    template.prefix({"length": "long"})
+    template.prefix({"style": "playful"})
+    assert template.stats() == {"prefixes": 2, "hits": 2, "misses": 3}
+
+
+def test_context_cache_sends_only_variable_part(monkeypatch):
+    """컨텍스트 캐시를 사용하면 질문-답변 부분만 보내고 지시문 토큰이 캐시로 집계되는지 확인"""
+    generator = StorytellingGenerator()
+    expected = asyncio.run(generator.generate_story(1, QUESTIONS, ANSWERS, options={"regenerate": True}))
+    monkeypatch.setattr(settings, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    prefix, body = generator.prompts.split(QUESTIONS, ANSWERS)
+
+    async def run():
+        return [await generator.generate_story(1, QUESTIONS, ANSWERS, options={"regenerate": True})
+                for _ in range(2)]
+
+    results = asyncio.run(run())
+
+    cached_model = next(entry[0] for entry in generator.models._cached_models.values())
+    assert cached_model.cached_prefix == prefix
+    assert [r["story_content"] for r in results] == [expected["story_content"]] * 2
+    stats = generator.models.stats()
+    assert (stats["context_created"], stats["context_hits"]) == (1, 1)
+    usage = generator.usage_stats()
+    assert usage["requests"] == 3
+    assert usage["cached_tokens"] == 2 * providers.estimate_tokens(prefix)
+    assert usage["prompt_tokens"] == 3 * providers.estimate_tokens(prefix + body)
+
+
+def test_context_cache_failure_falls_back_to_full_prompt(monkeypatch):
+    """컨텍스트 캐시를 만들 수 없으면 전체 프롬프트로 요청하고 유효 시간 동안 다시 시도하지 않는지 확인"""
+    monkeypatch.setattr(settings, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    attempts = []
+
+    def failing(*args, **kwargs):
+        attempts.append(args)
+        raise RuntimeError("Cached content is too small")
+
+    monkeypatch.setattr(providers, "create_cached_model", failing)
+    generator = StorytellingGenerator()
+
+    async def run():
+        return [await generator.generate_story(1, QUESTIONS, ANSWERS, options={"regenerate": True})
+                for _ in range(3)]
+
+    results = asyncio.run(run())
+
+    assert all(r["status"] == "success" for r in results)
+    assert len(attempts) == 1
+    assert generator.models.stats()["context_failed"] == 1
+    assert generator.usage_stats()["cached_tokens"] == 0
+
+
+def test_streaming_uses_context_cache(monkeypatch):
+    """스트리밍 생성도 컨텍스트 캐시 모델을 사용하고 마지막 조각의 사용량을 집계하는지 확인"""
+    monkeypatch.setattr(settings, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    generator = StorytellingGenerator()
+
+    async def run():
+        return "".join([text async for text in generator.stream_story(
+            1, QUESTIONS, ANSWERS, options={"length": "long", "regenerate": True}
+        )])
+
+    story = asyncio.run(run())
+
+    assert story
+    assert generator.models.stats()["context_created"] == 1
+    assert generator.usage_stats()["cached_tokens"] == providers.estimate_tokens(
+        generator.prompts.prefix({"length": "long"})
+    )
+
+
+def test_slow_context_cache_creation_does_not_block_pool(monkeypatch):
+    """컨텍스트 캐시 생성이 오래 걸려도 get()과 같은 키의 다른 요청이 기다리지 않는지 확인"""
+    started, release = threading.Event(), threading.Event()
+    original = providers.create_cached_model
+
+    def slow(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(providers, "create_cached_model", slow)
+    pool = providers.GenerativeModelPool()
+    creator = threading.Thread(target=pool.get_cached, args=(settings.GEMINI_MODEL, "지시문"))
+    creator.start()
+    try:
+        assert started.wait(5)
+        start = time.perf_counter()
+        assert pool.get(settings.GEMINI_MODEL) is not None
+        assert pool.get_cached(settings.GEMINI_MODEL, "지시문") is None
+        assert time.perf_counter() - start < 0.5
+    finally:
+        release.set()
+        creator.join()
+
+    assert pool.get_cached(settings.GEMINI_MODEL, "지시문") is not None
+    assert pool.stats()["context_created"] == 1
@@ -0,0 +1,276 @@
+import asyncio
+import io
+import time
+import httpx
+from PIL import Image
+from app.core.config import settings
+from app.core.storytelling import StorytellingGenerator
+
+QUESTIONS = [{"id": 1, "category": "temporal", "content": "언제인가요?"}]
+ANSWERS = [{"id": 1, "content": "여름 휴가"}]
+
+
+def _jpeg_bytes(size=(2400, 1200)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 120, 40)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _recording_generator(transport: httpx.AsyncBaseTransport):
+    """모델에 전달된 contents를 기록하는 스토리 생성기를 만든다"""
+    generator = StorytellingGenerator(transport=transport)
+    model = generator.models.get(settings.GEMINI_MODEL)
+    calls = []
+    original = model.generate_content_async
+
+    async def generate_content_async(contents, **kwargs):
+        calls.append(contents)
+        return await original(contents, **kwargs)
+
+    model.generate_content_async = generate_content_async
+    return generator, calls
+
+
+def test_image_is_sent_as_preprocessed_blob():
+    """내려받은 이미지가 전처리된 JPEG inline 데이터로 프롬프트와 함께 전달되는지 확인"""
+    content = _jpeg_bytes()
+    generator, calls = _recording_generator(httpx.MockTransport(lambda request: httpx.Response(200, content=content)))
+
+    result = asyncio.run(generator.generate_story(1, QUESTIONS, ANSWERS, image_url="http://images.test/a.jpg"))
+
+    assert result["status"] == "success"
+    prompt, image = calls[0]
+    assert isinstance(prompt, str)
+    assert image["mime_type"] == "image/jpeg"
+    assert max(Image.open(io.BytesIO(image["data"])).size) == settings.IMAGE_MAX_EDGE
+
+
+def test_small_png_kept_as_is_is_sent_as_png():
+    """전처리로 줄어들지 않아 원본을 유지한 PNG는 PNG 타입으로 전달되는지 확인"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (200, 120, 40)).save(buffer, "PNG")
+    content = buffer.getvalue()
+    generator, calls = _recording_generator(httpx.MockTransport(lambda request: httpx.Response(200, content=content)))
+
+    result = asyncio.run(generator.generate_story(1, QUESTIONS, ANSWERS, image_url="http://images.test/a.png"))
+
+    assert result["status"] == "success"
+    _, image = calls[0]
+    assert image == {"mime_type": "image/png", "data": content}
+
+
+def test_oversized_or_missing_image_falls_back_to_text(monkeypatch):
+    """크기 제한을 넘거나 내려받을 수 없는 이미지는 건너뛰고 텍스트만으로 생성하는지 확인"""
+    monkeypatch.setattr(settings, "MAX_IMAGE_SIZE", "1024")
+
+    async def body():
+        yield b"\xff\xd8\xff" + b"\x00" * 1000
+        yield b"\x00" * 1000
+
+    def handler(request):
+        if request.url.path == "/missing.jpg":
+            return httpx.Response(404)
+        # Content-Length 없이 전송되는 큰 본문도 읽는 도중 중단
+        return httpx.Response(200, content=body())
+
+    generator, calls = _recording_generator(httpx.MockTransport(handler))
+
+    async def run():
+        return [await generator.generate_story(1, QUESTIONS, ANSWERS, image_url=f"http://images.test/{name}")
+                for name in ("large.jpg", "missing.jpg")]
+
+    results = asyncio.run(run())
+
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert all(isinstance(contents, str) for contents in calls)
+
+
+def test_concurrent_requests_overlap_image_downloads():
+    """동시 스토리 요청의 이미지 다운로드가 하나의 클라이언트에서 겹쳐 실행되는지 확인"""
+    content = _jpeg_bytes((64, 64))
+
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, content=content)
+
+    generator, calls = _recording_generator(httpx.MockTransport(handler))
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            generator.generate_story(i, QUESTIONS, ANSWERS, image_url=f"http://images.test/{i}.jpg")
+            for i in range(5)
+        ))
+        client = generator._get_http_client()
+        await generator.aclose()
+        return results, time.perf_counter() - start, client
+
+    results, elapsed, client = asyncio.run(run())
+
+    assert all(r["status"] == "success" for r in results)
+    assert all(isinstance(contents, list) for contents in calls)
+    assert elapsed < 0.6
+    assert client.is_closed
+
+
+def test_stream_story_yields_first_chunk_early(monkeypatch):
+    """스트리밍 생성의 첫 조각이 전체 생성 시간보다 훨씬 먼저 도착하는지 확인"""
+    monkeypatch.setattr(settings, "FAKE_PROVIDER_LATENCY_MS", 400.0)
+    generator = StorytellingGenerator()
+
+    async def run():
+        start = time.perf_counter()
+        arrivals = []
+        async for text in generator.stream_story(1, QUESTIONS, ANSWERS):
+            arrivals.append((text, time.perf_counter() - start))
+        return arrivals
+
+    arrivals = asyncio.run(run())
+
+    assert len(arrivals) > 2
+    assert arrivals[0][1] < arrivals[-1][1] / 2
+    story = asyncio.run(generator.generate_story(1, QUESTIONS, ANSWERS, options={"regenerate": True}))
+    assert "".join(text for text, _ in arrivals) == story["story_content"]
+
+
+def test_repeated_request_is_served_from_cache():
+    """같은 요청의 반복은 모델을 다시 호출하지 않고, regenerate 옵션은 캐시를 무시하는지 확인"""
+    generator, calls = _recording_generator(None)
+
+    async def run():
+        first = await generator.generate_story(1, QUESTIONS, ANSWERS)
+        start = time.perf_counter()
+        repeated = await generator.generate_story(2, QUESTIONS, ANSWERS)
+        elapsed = time.perf_counter() - start
+        regenerated = await generator.generate_story(1, QUESTIONS, ANSWERS, options={"regenerate": True})
+        other_style = await generator.generate_story(1, QUESTIONS, ANSWERS, options={"style": "playful"})
+        return first, repeated, elapsed, regenerated, other_style
+
+    first, repeated, elapsed, regenerated, other_style = asyncio.run(run())
+
+    assert len(calls) == 3
+    assert repeated["story_content"] == first["story_content"]
+    assert (repeated["media_id"], first["media_id"]) == (2, 1)
+    assert elapsed < 0.01
+    assert regenerated["status"] == other_style["status"] == "success"
+    stats = generator.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["bypassed"]) == (1, 2, 1)
+
+
+def test_cache_key_uses_image_content():
+    """이미 내려받은 URL은 다시 내려받지 않고, 다른 URL이라도 내용이 같으면 캐시를 사용하는지 확인"""
+    contents = {"/a.jpg": _jpeg_bytes((64, 64)), "/copy.jpg": _jpeg_bytes((64, 64)), "/b.jpg": _jpeg_bytes((32, 32))}
+    downloads = []
+
+    def handler(request):
+        downloads.append(request.url.path)
+        return httpx.Response(200, content=contents[request.url.path])
+
+    generator, calls = _recording_generator(httpx.MockTransport(handler))
+
+    async def run():
+        for name in ("a.jpg", "a.jpg", "copy.jpg", "b.jpg"):
+            result = await generator.generate_story(1, QUESTIONS, ANSWERS, image_url=f"http://images.test/{name}")
+            assert result["status"] == "success"
+
+    asyncio.run(run())
+
+    assert downloads == ["/a.jpg", "/copy.jpg", "/b.jpg"]
+    assert len(calls) == 2
+    assert generator.cache_stats()["hits"] == 2
+
+
+def test_concurrent_duplicate_requests_share_one_generation(monkeypatch):
+    """생성 중에 들어온 같은 요청(재시도)은 모델을 다시 호출하지 않고 결과를 기다리는지 확인"""
+    monkeypatch.setattr(settings, "FAKE_PROVIDER_LATENCY_MS", 100.0)
+    generator, calls = _recording_generator(None)
+
+    async def run():
+        return await asyncio.gather(*(generator.generate_story(i, QUESTIONS, ANSWERS) for i in range(4)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [r["media_id"] for r in results] == [0, 1, 2, 3]
+    assert len({r["story_content"] for r in results}) == 1
+    assert generator.cache_stats()["coalesced"] == 3
+    assert not generator._inflight
+
+
+def test_failed_image_request_retries_with_text_in_both_paths():
+    """이미지 포함 요청이 실패하면 일반 생성과 스트리밍 모두 텍스트만으로 다시 생성하고 캐시하지 않는지 확인"""
+    content = _jpeg_bytes((64, 64))
+    generator, calls = _recording_generator(httpx.MockTransport(lambda request: httpx.Response(200, content=content)))
+    model = generator.models.get(settings.GEMINI_MODEL)
+    recording = model.generate_content_async
+
+    async def generate_content_async(contents, **kwargs):
+        response = await recording(contents, **kwargs)
+        if isinstance(contents, list):
+            raise RuntimeError("image rejected")
+        return response
+
+    model.generate_content_async = generate_content_async
+
+    async def run():
+        result = await generator.generate_story(1, QUESTIONS, ANSWERS, image_url="http://images.test/a.jpg")
+        chunks = [text async for text in generator.stream_story(1, QUESTIONS, ANSWERS,
+                                                                 image_url="http://images.test/a.jpg")]
+        return result, chunks
+
+    result, chunks = asyncio.run(run())
+
+    assert result["status"] == "success"
+    assert "".join(chunks) == result["story_content"]
+    assert [type(contents) for contents in calls] == [list, str, list, str]
+    assert generator.cache_stats()["hits"] == 0
+
+
+def test_replaced_image_at_same_url_is_detected_without_url_memo(monkeypatch):
+    """URL 해시 기억을 끄면 같은 URL의 이미지가 바뀌었을 때 이전 스토리를 반환하지 않는지 확인"""
+    monkeypatch.setattr(settings, "STORY_IMAGE_HASH_TTL", 0)
+    current = {"content": _jpeg_bytes((64, 64))}
+    downloads = []
+
+    def handler(request):
+        downloads.append(request.url.path)
+        return httpx.Response(200, content=current["content"])
+
+    generator, calls = _recording_generator(httpx.MockTransport(handler))
+
+    async def run():
+        await generator.generate_story(1, QUESTIONS, ANSWERS, image_url="http://images.test/a.jpg")
+        await generator.generate_story(1, QUESTIONS, ANSWERS, image_url="http://images.test/a.jpg")
+        current["content"] = _jpeg_bytes((32, 32))
+        await generator.generate_story(1, QUESTIONS, ANSWERS, image_url="http://images.test/a.jpg")
+
+    asyncio.run(run())
+
+    assert len(downloads) == 3
+    assert len(calls) == 2
+    assert generator.cache_stats()["hits"] == 1
+
+
+def test_redownloaded_image_is_cached_under_its_new_hash():
+    """URL 해시 기억이 있어도 다시 내려받은 이미지가 바뀌었으면 새 내용 해시로 캐시하는지 확인"""
+    current = {"content": _jpeg_bytes((64, 64))}
+
+    def handler(request):
+        return httpx.Response(200, content=current["content"])
+
+    generator, calls = _recording_generator(httpx.MockTransport(handler))
+    url = "http://images.test/a.jpg"
+
+    async def run():
+        await generator.generate_story(1, QUESTIONS, ANSWERS, image_url=url)
+        # 기억된 해시로는 캐시를 찾지 못하도록 결과 캐시만 비우고 이미지를 교체
+        generator.cache.clear()
+        current["content"] = _jpeg_bytes((32, 32))
+        await generator.generate_story(1, QUESTIONS, ANSWERS, image_url=url)
+        # 새 URL(같은 새 이미지)은 교체된 내용의 스토리를 찾아야 함
+        await generator.generate_story(1, QUESTIONS, ANSWERS, image_url="http://images.test/copy.jpg")
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+    assert generator.cache_stats()["hits"] == 1
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+import time
+from app.core.providers import FakeTranslateClient
+from app.core.question_generator import QuestionGenerator
+from app.core.translation import TranslationMemo
+
+
+class CountingTranslateClient(FakeTranslateClient):
+    """번역 호출 횟수를 기록하는 대체 클라이언트"""
+
+    def __init__(self, translations):
+        super().__init__(translations)
+        self.calls = 0
+
+    def translate(self, values, **kwargs):
+        self.calls += 1
+        return super().translate(values, **kwargs)
+
+
+def test_repeated_labels_call_api_once():
+    """같은 레이블은 한 번만 Translation API를 호출하고 정적 매핑은 호출하지 않는지 확인"""
+    client = CountingTranslateClient({"sky": "하늘"})
+    generator = QuestionGenerator(translate_client=client)
+
+    assert generator._translate_context("sky") == "하늘"
+    assert generator._translate_context("Sky") == "하늘"
+    assert generator._translate_context("beach") == "해변"
+    assert client.calls == 1
+
+    stats = generator.translation_memo.stats()
+    assert stats["static_hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_translations_survive_restart(tmp_path):
+    """영구 저장소의 번역이 새 인스턴스에서 API 호출 없이 사용되는지 확인"""
+    db_path = str(tmp_path / "translations.db")
+    first = QuestionGenerator(translate_client=CountingTranslateClient({"sky": "하늘"}),
+                              translation_memo=TranslationMemo(db_path=db_path))
+    first._translate_context("sky")
+
+    client = CountingTranslateClient({})
+    second = QuestionGenerator(translate_client=client,
+                               translation_memo=TranslationMemo(db_path=db_path))
+
+    assert second._translate_context("sky") == "하늘"
+    assert client.calls == 0
+    assert second.translation_memo.stats()["disk_hits"] == 1
+
+
+def test_failed_translation_is_not_cached():
+    """번역 실패 시 원문을 반환하고 캐시에 남기지 않는지 확인"""
+    class FailingClient:
+        def translate(self, *args, **kwargs):
+            raise RuntimeError("unavailable")
+
+    generator = QuestionGenerator(translate_client=FailingClient(),
+                                  translation_memo=TranslationMemo())
+
+    assert generator._translate_context("sky") == "sky"
+    assert generator.translation_memo.get("sky") is None
+
+
+def test_export_top_orders_by_use_and_skips_static(tmp_path):
+    """사용 빈도 순으로 내보내고 정적 매핑에 있는 항목은 제외하는지 확인"""
+    memo = TranslationMemo(seed={"beach": "해변"}, db_path=str(tmp_path / "t.db"))
+    memo.set("tree", "나무")
+    memo.set("sky", "하늘")
+    for _ in range(3):
+        memo.get("sky")
+    memo.get("beach")
+
+    assert list(memo.export_top(limit=5).items()) == [("sky", "하늘"), ("tree", "나무")]
+    assert memo.export_top(limit=1) == {"sky": "하늘"}
+
+
+def test_image_labels_are_translated_in_one_call():
+    """한 이미지의 미번역 레이블을 한 번의 API 호출로 번역하는지 확인"""
+    client = CountingTranslateClient({"sky": "하늘", "tree": "나무", "family": "가족"})
+    generator = QuestionGenerator(translate_client=client)
+    analysis = {"labels": [
+        {"description": "Sky", "score": 0.9},
+        {"description": "Tree", "score": 0.8},
+        {"description": "Beach", "score": 0.7},
+        {"description": "Sky", "score": 0.6}
+    ]}
+
+    context = generator._extract_context(analysis)
+
+    assert client.calls == 1
+    assert context["location"]["label"] == "해변"
+    assert generator.translation_memo.get("tree") == "나무"
+
+
+def test_batch_translates_labels_of_all_images_once():
+    """일괄 질문 생성 시 모든 이미지의 레이블을 한 번에 번역하는지 확인"""
+    client = CountingTranslateClient({"sky": "하늘", "tree": "나무", "family": "가족"})
+    generator = QuestionGenerator(translate_client=client)
+    analyses = [
+        {"labels": [{"description": "Sky", "score": 0.9}], "faces": []},
+        {"labels": [{"description": "Tree", "score": 0.8}, {"description": "Family", "score": 0.7}], "faces": [{}]}
+    ]
+
+    batch = generator.generate_questions_batch(analyses)
+
+    assert client.calls == 1
+    assert batch == [generator.generate_questions(analysis) for analysis in analyses]
+    assert client.calls == 1
+
+
+class SlowTranslateClient(CountingTranslateClient):
+    """응답이 늦는 번역 클라이언트"""
+
+    def __init__(self, translations, delay):
+        super().__init__(translations)
+        self.delay = delay
+
+    def translate(self, values, **kwargs):
+        time.sleep(self.delay)
+        return super().translate(values, **kwargs)
+
+
+async def test_async_translation_does_not_block_event_loop():
+    """번역 중에도 이벤트 루프의 다른 작업이 진행되는지 확인"""
+    generator = QuestionGenerator(translate_client=SlowTranslateClient({"sky": "하늘"}, delay=0.2))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    translations = await generator.translate_labels_async(["sky", "beach"], timeout=1.0)
+    task.cancel()
+
+    assert translations == {"sky": "하늘", "beach": "해변"}
+    assert ticks >= 10
+
+
+async def test_async_translation_falls_back_to_english_on_timeout():
+    """시간 초과 시 영어 레이블로 질문을 만들고, 늦은 번역은 캐시에 남는지 확인"""
+    client = SlowTranslateClient({"sky": "하늘"}, delay=0.3)
+    generator = QuestionGenerator(translate_client=client)
+
+    start = time.perf_counter()
+    translations = await generator.translate_labels_async(["sky"], timeout=0.05)
+    elapsed = time.perf_counter() - start
+
+    assert translations == {"sky": "sky"}
+    assert elapsed < 0.25
+
+    await asyncio.sleep(0.4)
+    assert generator.translation_memo.get("sky") == "하늘"
+
+
+async def test_generate_questions_async_matches_sync():
+    """비동기 질문 생성 결과가 동기 버전과 같은지 확인"""
+    generator = QuestionGenerator(translate_client=CountingTranslateClient({"party": "파티"}))
+    analysis = {"labels": [{"description": "Party", "score": 0.9}, {"description": "Smile", "score": 0.95}],
+                "faces": [{}, {}]}
+
+    assert await generator.generate_questions_async(analysis) == generator.generate_questions(analysis)
+
+
+async def test_async_translation_reads_and_flushes_disk_off_loop(tmp_path):
+    """영구 캐시 조회와 사용 빈도 저장이 이벤트 루프 스레드 밖에서 실행되는지 확인"""
+    memo = TranslationMemo(db_path=str(tmp_path / "t.db"), flush_every=1)
+    memo.disk.set("sky", "하늘")
+    generator = QuestionGenerator(translate_client=CountingTranslateClient({}), translation_memo=memo)
+    threads = []
+    for name in ("get", "add_uses"):
+        original = getattr(memo.disk, name)
+
+        def recorded(*args, _original=original, **kwargs):
+            threads.append(threading.get_ident())
+            return _original(*args, **kwargs)
+
+        setattr(memo.disk, name, recorded)
+
+    translations = await generator.translate_labels_async(["sky"], timeout=1.0)
+
+    assert translations == {"sky": "하늘"}
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import json
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from app.core.upload import (
+    UploadSizeLimitMiddleware, UnsupportedImageError, UploadTooLargeError,
+    read_image_stream, sniff_image_type
+)
+
+JPEG_HEAD = b"\xff\xd8\xff\xe0" + b"\x00" * 12
+
+
+async def _chunks(data: bytes, size: int, consumed: list):
+    for i in range(0, len(data), size):
+        consumed.append(i)
+        yield data[i:i + size]
+
+
+def test_stream_computes_hash_and_type():
+    """스트리밍 중 계산한 해시와 감지한 타입을 확인"""
+    data = JPEG_HEAD + b"x" * 1000
+
+    result = asyncio.run(read_image_stream(_chunks(data, 100, []), max_size=2000))
+
+    assert result.content == data
+    assert result.sha256 == hashlib.sha256(data).hexdigest()
+    assert result.content_type == "image/jpeg"
+
+
+def test_stream_stops_as_soon_as_limit_is_passed():
+    """제한을 넘는 순간 더 이상 읽지 않는지 확인"""
+    consumed = []
+    try:
+        asyncio.run(read_image_stream(_chunks(JPEG_HEAD + b"x" * 10000, 100, consumed), max_size=500))
+        assert False
+    except UploadTooLargeError:
+        pass
+    assert len(consumed) == 6
+
+
+def test_stream_rejects_non_image_signature_on_first_chunk():
+    """첫 청크의 시그니처가 이미지가 아니면 바로 거부하는지 확인"""
+    consumed = []
+    try:
+        asyncio.run(read_image_stream(_chunks(b"%PDF-1.7" + b"x" * 1000, 100, consumed), max_size=5000))
+        assert False
+    except UnsupportedImageError:
+        pass
+    assert len(consumed) == 1
+
+
+def test_sniff_image_type():
+    """주요 이미지 시그니처 인식 확인"""
+    assert sniff_image_type(b"\x89PNG\r\n\x1a\n" + b"\x00" * 8) == "image/png"
+    assert sniff_image_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert sniff_image_type(b"\x00\x00\x00\x18ftypheic\x00\x00") == "image/heic"
+    assert sniff_image_type(b"hello world12345") is None
+
+
+def _limited_app(limit: int) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(image: UploadFile = File(...)):
+        return {"size": len(await image.read())}
+
+    app.add_middleware(UploadSizeLimitMiddleware, paths=["/upload"], max_body_size=limit)
+    return TestClient(app)
+
+
+def test_middleware_rejects_large_body_before_parsing():
+    """Content-Length가 제한을 넘으면 413으로 거부하는지 확인"""
+    client = _limited_app(limit=1024)
+
+    small = client.post("/upload", files={"image": ("a.jpg", b"x" * 100, "image/jpeg")})
+    large = client.post("/upload", files={"image": ("a.jpg", b"x" * 5000, "image/jpeg")})
+
+    assert small.status_code == 200
+    assert large.status_code == 413
+    assert large.json()["detail"]["error_code"] == "FILE_TOO_LARGE"
+
+
+def test_middleware_limits_bodies_without_content_length():
+    """Content-Length 없이 청크로 전송된 본문도 제한하는지 확인"""
+    client = _limited_app(limit=1024)
+
+    def body():
+        for _ in range(10):
+            yield b"x" * 512
+
+    response = client.post("/upload", content=body(),
+                           headers={"content-type": "multipart/form-data; boundary=abc"})
+
+    assert response.status_code == 413
+
+
+def test_middleware_rejects_malformed_content_length():
+    """숫자가 아닌 Content-Length는 애플리케이션에 전달하지 않고 400으로 거부하는지 확인"""
+    called = []
+    sent = []
+
+    async def app(scope, receive, send):
+        called.append(scope)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = UploadSizeLimitMiddleware(app, paths=["/upload"], max_body_size=1024)
+    scope = {"type": "http", "path": "/upload", "headers": [(b"content-length", b"12abc")]}
+    asyncio.run(middleware(scope, receive, send))
+
+    assert called == []
+    assert sent[0]["status"] == 400
+    assert json.loads(sent[1]["body"])["detail"]["error_code"] == "INVALID_CONTENT_LENGTH"
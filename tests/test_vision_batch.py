@@ -0,0 +1,200 @@
+import asyncio
+import time
+from google.cloud import vision
+from app.core.config import settings
+from app.core.cache import AnalysisCache
+from app.core.vision import VisionAIClient, resolve_features, split_annotation
+
+
+class StubAnnotatorClient:
+    """annotate_image 호출 횟수를 기록하는 테스트용 Vision 클라이언트"""
+
+    def __init__(self, response=None, error=None, delay: float = 0.0):
+        self.response = response
+        self.error = error
+        self.delay = delay
+        self.calls = []
+
+    def annotate_image(self, request, **kwargs):
+        self.calls.append(request)
+        # 동기 gRPC 호출처럼 스레드를 블로킹한다
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.response
+
+    def batch_annotate_images(self, requests, **kwargs):
+        self.calls.append(requests)
+        if self.error:
+            raise self.error
+        responses = []
+        for request in requests:
+            # 내용이 b"bad"인 이미지는 이미지 단위 오류로 응답한다
+            if request['image'].content == b"bad":
+                responses.append(vision.AnnotateImageResponse(error={'code': 3, 'message': 'bad image'}))
+            else:
+                responses.append(self.response)
+        return vision.BatchAnnotateImagesResponse(responses=responses)
+
+    def label_detection(self, image, **kwargs):
+        return self.annotate_image({'image': image, 'features': []})
+
+    object_localization = face_detection = landmark_detection = label_detection
+    text_detection = safe_search_detection = image_properties = label_detection
+
+
+def _sample_response() -> vision.AnnotateImageResponse:
+    return vision.AnnotateImageResponse(
+        label_annotations=[
+            {'description': 'Beach', 'score': 0.9, 'topicality': 0.8},
+            {'description': 'Smile', 'score': 0.85, 'topicality': 0.7}
+        ],
+        face_annotations=[{
+            'detection_confidence': 0.95,
+            'joy_likelihood': vision.Likelihood.VERY_LIKELY,
+            'bounding_poly': {'vertices': [{'x': 1, 'y': 2}, {'x': 3, 'y': 2},
+                                           {'x': 3, 'y': 4}, {'x': 1, 'y': 4}]}
+        }],
+        text_annotations=[
+            {'description': 'HELLO WORLD'},
+            {'description': 'HELLO', 'bounding_poly': {'vertices': [{}, {}, {'x': 5, 'y': 6}, {}]}}
+        ]
+    )
+
+
+def test_analyze_image_uses_single_annotate_request():
+    """모든 기능이 한 번의 요청으로 실행되고 기존 결과 형태로 분리되는지 확인"""
+    stub = StubAnnotatorClient(_sample_response())
+    client = VisionAIClient(client=stub)
+
+    result = asyncio.run(client.analyze_image(b"image-bytes", features="full"))
+
+    assert len(stub.calls) == 1
+    assert len(stub.calls[0]['features']) == 7
+    assert set(result) == {'labels', 'objects', 'faces', 'landmarks', 'text', 'safe_search', 'colors'}
+    assert [label['description'] for label in result['labels']] == ['Beach', 'Smile']
+    assert result['faces'][0]['bounding_box'] == {'left': 1, 'top': 2, 'right': 3, 'bottom': 4}
+    assert result['text']['full_text'] == 'HELLO WORLD'
+    assert result['text']['texts'][0]['bounding_box']['right'] == 5
+    assert result['colors'] == {'dominant_colors': []}
+
+
+def test_failed_request_degrades_to_empty_defaults():
+    """요청 실패 시 기존과 동일한 빈 기본값을 반환하는지 확인"""
+    client = VisionAIClient(client=StubAnnotatorClient(error=RuntimeError("boom")))
+
+    result = asyncio.run(client.analyze_image(b"image-bytes", features="full"))
+
+    assert result == {
+        'labels': [], 'objects': [], 'faces': [], 'landmarks': [],
+        'text': {'full_text': "", 'texts': []},
+        'safe_search': {}, 'colors': {'dominant_colors': []}
+    }
+
+
+def test_split_annotation_isolates_feature_errors():
+    """한 기능의 파싱 오류가 다른 기능 결과에 영향을 주지 않는지 확인"""
+    response = _sample_response()
+    # 꼭짓점이 없는 얼굴 박스는 파싱 중 IndexError를 일으킨다
+    response.face_annotations.append(vision.FaceAnnotation(detection_confidence=0.5))
+
+    result = split_annotation(response)
+
+    assert result['faces'] == []
+    assert len(result['labels']) == 2
+
+
+async def _measure_concurrent(client: VisionAIClient, count: int, features: str = None):
+    """동시 분석 소요 시간과 그 동안 이벤트 루프가 처리한 tick 수를 측정"""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(client.analyze_image(b"image-bytes", features) for _ in range(count)))
+    elapsed = time.perf_counter() - start
+    ticker_task.cancel()
+    return elapsed, ticks
+
+
+def test_concurrent_analyses_do_not_block_event_loop():
+    """N개의 동시 분석이 1개 분석 시간 수준으로 끝나고 루프가 멈추지 않는지 확인"""
+    delay = 0.2
+    client = VisionAIClient(client=StubAnnotatorClient(_sample_response(), delay=delay))
+
+    elapsed, ticks = asyncio.run(_measure_concurrent(client, settings.VISION_MAX_WORKERS))
+
+    assert elapsed < delay * 2
+    assert ticks >= 5
+
+
+def test_per_feature_mode_runs_detectors_concurrently(monkeypatch):
+    """기능별 호출 모드에서도 7개 감지기가 동시에 실행되는지 확인"""
+    monkeypatch.setattr(settings, "VISION_BATCH_ANNOTATE", False)
+    delay = 0.2
+    stub = StubAnnotatorClient(_sample_response(), delay=delay)
+    client = VisionAIClient(client=stub)
+
+    elapsed, _ = asyncio.run(_measure_concurrent(client, 1, "full"))
+
+    assert len(stub.calls) == 7
+    assert elapsed < delay * 2
+
+
+def test_analyze_images_groups_requests_by_batch_size(monkeypatch):
+    """여러 이미지가 배치 크기 단위로 묶여 요청되고 입력 순서대로 반환되는지 확인"""
+    monkeypatch.setattr(settings, "VISION_BATCH_SIZE", 4)
+    stub = StubAnnotatorClient(_sample_response())
+    client = VisionAIClient(client=stub, cache=AnalysisCache(100, 3600))
+    contents = [f"image-{i}".encode() for i in range(10)]
+    contents[5] = b"bad"
+
+    results = asyncio.run(client.analyze_images(contents))
+
+    assert [len(requests) for requests in stub.calls] == [4, 4, 2]
+    assert isinstance(results[5], Exception)
+    assert all(r['labels'][0]['description'] == 'Beach' for i, r in enumerate(results) if i != 5)
+
+    # 캐시된 이미지는 다시 요청하지 않음
+    asyncio.run(client.analyze_images(contents))
+    assert [len(requests) for requests in stub.calls][3:] == [1]
+
+
+def test_analyze_images_reports_failed_chunk_per_image():
+    """배치 요청이 실패하면 해당 묶음의 이미지마다 오류를 반환하는지 확인"""
+    client = VisionAIClient(client=StubAnnotatorClient(error=RuntimeError("boom")), cache=None)
+
+    results = asyncio.run(client.analyze_images([b"a", b"b"]))
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_default_profile_requests_only_question_features():
+    """기본 프로필은 질문 생성에 필요한 기능만 요청하고 나머지는 빈 기본값으로 채우는지 확인"""
+    stub = StubAnnotatorClient(_sample_response())
+    client = VisionAIClient(client=stub, cache=None)
+
+    result = asyncio.run(client.analyze_image(b"image-bytes"))
+
+    assert [f['type_'] for f in stub.calls[0]['features']] == [
+        vision.Feature.Type.LABEL_DETECTION, vision.Feature.Type.FACE_DETECTION
+    ]
+    assert len(result['labels']) == 2 and len(result['faces']) == 1
+    assert result['text'] == {'full_text': "", 'texts': []}
+
+
+def test_resolve_features_parses_lists_and_profiles():
+    """쉼표 목록, 프로필 이름, 잘못된 이름 처리를 확인"""
+    assert resolve_features("faces, labels") == ('labels', 'faces')
+    assert resolve_features(["questions", "text"]) == ('labels', 'faces', 'text')
+    assert len(resolve_features("full")) == 7
+    try:
+        resolve_features("labels,unknown")
+        assert False
+    except ValueError:
+        pass